@@ -0,0 +1,152 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backends import DuckDBBackend, PandasBackend, get_backend
+from src.data_processing import SOpDataProcessor, process_sop_data
+from src.storage import load_cached_dataset, read_partitioned, write_partitioned
+
+try:
+    import duckdb  # noqa: F401
+    HAS_DUCKDB = True
+except ImportError:
+    HAS_DUCKDB = False
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'Data')
+FILE_PATHS = {
+    'orders': os.path.join(DATA_DIR, 'Orders.csv'),
+    'inventory': os.path.join(DATA_DIR, 'Inventory.csv'),
+    'forecasts': os.path.join(DATA_DIR, 'Forecasts.csv'),
+    'products': os.path.join(DATA_DIR, 'Products.csv'),
+}
+
+
+class TestBackendSelection(unittest.TestCase):
+
+    def test_default_is_pandas(self):
+        self.assertIsInstance(SOpDataProcessor().backend, PandasBackend)
+        self.assertIsInstance(get_backend('duckdb'), DuckDBBackend)
+        with self.assertRaises(ValueError):
+            get_backend('spark')
+
+
+@unittest.skipUnless(HAS_DUCKDB, "duckdb is not installed")
+class TestBackendParity(unittest.TestCase):
+    """
+    The DuckDB backend must give the pandas backend's frames and dtypes
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.raw_orders = pd.read_csv(FILE_PATHS['orders'])
+
+    def dirty_orders(self):
+        orders = self.raw_orders.copy()
+        orders.loc[0, 'qty'] = 0
+        orders.loc[1, 'order_value'] = np.nan
+        orders.loc[2, 'unit_price'] = -5.0
+        return orders
+
+    def test_clean_orders_parity(self):
+        expected = PandasBackend().clean_orders(self.dirty_orders())
+        self.assertEqual(len(expected), len(self.raw_orders) - 3)
+        pd.testing.assert_frame_equal(DuckDBBackend(threads=2).clean_orders(self.dirty_orders()), expected)
+
+        # Schema-typed input from the columnar cache
+        with tempfile.TemporaryDirectory() as tmp:
+            typed = load_cached_dataset('orders', FILE_PATHS['orders'], tmp)
+        pd.testing.assert_frame_equal(DuckDBBackend().clean_orders(typed), PandasBackend().clean_orders(typed))
+
+    def test_pipeline_parity(self):
+        expected = process_sop_data(FILE_PATHS)
+        actual = process_sop_data(FILE_PATHS, backend=DuckDBBackend(threads=2))
+        self.assertEqual(list(actual), list(expected))
+        for name in expected:
+            pd.testing.assert_frame_equal(actual[name], expected[name], check_exact=False)
+
+        processor = SOpDataProcessor(backend='duckdb')
+        pd.testing.assert_frame_equal(processor.create_summary_statistics(expected),
+                                      SOpDataProcessor().create_summary_statistics(expected))
+
+    def test_pipeline_from_files_parity(self):
+        backend = DuckDBBackend(threads=2, batch_rows=1000)
+        self.assertFalse(PandasBackend().can_scan(FILE_PATHS['orders']))
+        with tempfile.TemporaryDirectory() as tmp:
+            orders_path = os.path.join(tmp, 'orders.csv')
+            self.dirty_orders().to_csv(orders_path, index=False)
+            partitioned = os.path.join(tmp, 'orders')
+            write_partitioned(self.dirty_orders(), partitioned)
+            self.assertTrue(backend.can_scan(orders_path) and backend.can_scan(partitioned))
+
+            for source in [orders_path, partitioned]:
+                file_paths = dict(FILE_PATHS, orders=source)
+                expected = process_sop_data(file_paths)
+                load = SOpDataProcessor._load_dataset
+                with mock.patch.object(backend, 'order_aggregates', wraps=backend.order_aggregates) as scan, \
+                        mock.patch.object(SOpDataProcessor, '_load_dataset', autospec=True,
+                                          side_effect=load) as loaded:
+                    actual = process_sop_data(file_paths, backend=backend)
+                scan.assert_called_once_with(source)
+                # Orders never reach pandas before cleaning
+                self.assertNotIn('orders', [call.args[1] for call in loaded.call_args_list])
+                for name in expected:
+                    pd.testing.assert_frame_equal(actual[name], expected[name], check_exact=False)
+
+    def test_clean_and_batches_from_files(self):
+        raw = self.dirty_orders()
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, 'orders.csv')
+            raw.to_csv(csv_path, index=False)
+            partitioned = os.path.join(tmp, 'orders')
+            write_partitioned(raw, partitioned)
+            for source, reference in [(csv_path, pd.read_csv(csv_path)),
+                                      (partitioned, read_partitioned(partitioned))]:
+                backend = DuckDBBackend(batch_rows=1000)
+                expected = PandasBackend().clean_orders(reference).reset_index(drop=True)
+                pd.testing.assert_frame_equal(backend.clean_orders(source), expected)
+
+                batches = list(backend.read_batches(source, 'orders'))
+                self.assertEqual(max(len(batch) for batch in batches), 1000)
+                pd.testing.assert_frame_equal(pd.concat(batches, ignore_index=True), reference)
+
+    def test_aggregates_from_files(self):
+        cleaned = PandasBackend().clean_orders(self.dirty_orders())
+        expected = PandasBackend().order_aggregates(cleaned)
+        with tempfile.TemporaryDirectory() as tmp:
+            write_partitioned(cleaned, os.path.join(tmp, 'orders'))
+            csv_path = os.path.join(tmp, 'orders.csv')
+            self.dirty_orders().to_csv(csv_path, index=False)
+            for source in [os.path.join(tmp, 'orders'), csv_path]:
+                actual = DuckDBBackend().order_aggregates(source)
+                for key, state in expected.states.items():
+                    pd.testing.assert_frame_equal(actual.states[key], state, check_exact=False,
+                                                  check_index_type=False)
+
+    def test_aggregates_from_ambiguous_csv(self):
+        # Markers DuckDB would infer as text (forcing VARCHAR qty) and that
+        # pandas reads as missing or coerces to NaN
+        orders = self.raw_orders.astype({'qty': object, 'discount_pct': object})
+        orders.loc[4000, 'qty'] = 'n/a'
+        orders.loc[4100, 'qty'] = '-'
+        orders.loc[4200, 'qty'] = '1,000'
+        orders.loc[10, 'discount_pct'] = 'NULL'
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "owner's orders.csv")
+            orders.to_csv(path, index=False)
+            raw = pd.read_csv(path)
+            expected = PandasBackend().order_aggregates(PandasBackend().clean_orders(raw))
+            actual = DuckDBBackend().order_aggregates(path)
+        self.assertEqual(expected.states['product_id']['qty_count'].sum(), len(raw) - 3)
+        for key, state in expected.states.items():
+            pd.testing.assert_frame_equal(actual.states[key], state, check_exact=False, check_index_type=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import unittest
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.connectors import SQLiteConnector, extract_datasets
+from src.data_processing import SOpDataProcessor
+from src.storage import read_csv_with_schema
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'Data')
+FILE_PATHS = {
+    'orders': os.path.join(DATA_DIR, 'Orders.csv'),
+    'inventory': os.path.join(DATA_DIR, 'Inventory.csv'),
+    'forecasts': os.path.join(DATA_DIR, 'Forecasts.csv'),
+    'products': os.path.join(DATA_DIR, 'Products.csv'),
+}
+
+
+class SlowSQLiteConnector(SQLiteConnector):
+    """
+    Adds a fixed query latency and optional transient failures
+    """
+
+    def __init__(self, database, latency=0.0, failures=0, error="database is locked", **kwargs):
+        super().__init__(database, **kwargs)
+        self.latency = latency
+        self.failures = failures
+        self.error = error
+        self.attempts = 0
+
+    def _execute(self, connection, table, columns, batch_size):
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            raise sqlite3.OperationalError(self.error)
+        time.sleep(self.latency)
+        return super()._execute(connection, table, columns, batch_size)
+
+
+class TestSQLiteConnector(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.database = os.path.join(cls.tmp.name, 'sop.db')
+        SQLiteConnector.from_csv(FILE_PATHS, cls.database)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_extract_matches_schema_typed_csv(self):
+        connector = SQLiteConnector(self.database, batch_size=1000)
+        datasets = SOpDataProcessor().load_from_source(connector)
+        self.assertEqual(list(datasets), ['orders', 'inventory', 'forecasts', 'products'])
+        for name, file_path in FILE_PATHS.items():
+            pd.testing.assert_frame_equal(datasets[name], read_csv_with_schema(name, file_path))
+
+    def test_column_selection(self):
+        datasets = extract_datasets(SQLiteConnector(self.database), tables={'orders': 'orders'},
+                                    columns={'orders': ['order_id', 'order_date', 'qty']})
+        self.assertEqual(list(datasets['orders'].columns), ['order_id', 'order_date', 'qty'])
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(datasets['orders']['order_date']))
+
+    def test_tables_extract_concurrently(self):
+        connector = SlowSQLiteConnector(self.database, latency=0.3, pool_size=4)
+        extract_datasets(connector)
+        timings = connector.last_timings
+        queries = sum(seconds for name, seconds in timings.items() if name != 'total')
+        self.assertGreaterEqual(queries, 1.2)
+        self.assertLess(timings['total'], 0.9)
+
+        serial = SlowSQLiteConnector(self.database, latency=0.3, pool_size=1)
+        extract_datasets(serial)
+        self.assertGreaterEqual(serial.last_timings['total'], 1.2)
+
+    def test_transient_errors_are_retried(self):
+        connector = SlowSQLiteConnector(self.database, failures=2, backoff=0.01)
+        with self.assertLogs('src.connectors', level='WARNING'):
+            datasets = extract_datasets(connector, tables={'products': 'products'})
+        self.assertEqual(len(datasets['products']), 30)
+        self.assertEqual(connector.attempts, 3)
+
+        failing = SlowSQLiteConnector(self.database, failures=10, retries=1, backoff=0.01)
+        with self.assertRaises(sqlite3.OperationalError):
+            extract_datasets(failing, tables={'products': 'products'})
+        with self.assertRaises(KeyError):
+            extract_datasets(SQLiteConnector(self.database), tables={'orders': 'missing_table'})
+
+    def test_permanent_errors_are_not_retried(self):
+        connector = SlowSQLiteConnector(self.database, failures=1, error="no such column: qty", backoff=0.01)
+        with self.assertRaises(sqlite3.OperationalError), self.assertNoLogs('src.connectors', level='WARNING'):
+            extract_datasets(connector, tables={'products': 'products'})
+        self.assertEqual(connector.attempts, 1)
+
+        busy = SlowSQLiteConnector(self.database, failures=1, error="database is busy", backoff=0.01)
+        with self.assertLogs('src.connectors', level='WARNING'):
+            extract_datasets(busy, tables={'products': 'products'})
+        self.assertEqual(busy.attempts, 2)
+
+    def test_runs_inside_event_loop(self):
+        async def notebook_cell():
+            return extract_datasets(SQLiteConnector(self.database), tables={'inventory': 'inventory'})
+
+        self.assertEqual(len(asyncio.run(notebook_cell())['inventory']), 30)
+
+
+if __name__ == '__main__':
+    unittest.main()
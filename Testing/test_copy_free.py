@@ -0,0 +1,105 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import tracemalloc
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data_processing import SOpDataProcessor, process_sop_data
+from src.synthetic_data import generate_sop_datasets, write_sop_datasets
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'Data')
+FILE_PATHS = {
+    'orders': os.path.join(DATA_DIR, 'Orders.csv'),
+    'inventory': os.path.join(DATA_DIR, 'Inventory.csv'),
+    'forecasts': os.path.join(DATA_DIR, 'Forecasts.csv'),
+    'products': os.path.join(DATA_DIR, 'Products.csv'),
+}
+
+# Whole-pipeline peak allowed, as a multiple of the loaded raw frames
+PEAK_MEMORY_MULTIPLE = 3.0
+
+
+def clean_and_engineer(processor, raw):
+    cleaned = {name: getattr(processor, f"clean_{name}_data")(df) for name, df in raw.items()}
+    return processor.engineer_features(cleaned)
+
+
+class TestCopyFreeParity(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.raw = {name: pd.read_csv(path) for name, path in FILE_PATHS.items()}
+        # Invalid rows so the combined masks actually drop something
+        orders = cls.raw['orders']
+        orders['qty'] = orders['qty'].astype(float)
+        orders.loc[orders.index[:3], 'qty'] = [0, -1, np.nan]
+        orders.loc[orders.index[5], 'unit_price'] = 0
+        cls.raw['inventory'].loc[cls.raw['inventory'].index[:2], 'available_qty'] = -5
+
+    def test_matches_default_mode(self):
+        default = clean_and_engineer(SOpDataProcessor(), self.raw)
+        copy_free = clean_and_engineer(SOpDataProcessor(copy_free=True), self.raw)
+        self.assertEqual(len(copy_free['orders']), len(self.raw['orders']) - 4)
+        for name in default:
+            pd.testing.assert_frame_equal(copy_free[name], default[name])
+
+    def test_inputs_are_not_modified(self):
+        before = {name: df.copy() for name, df in self.raw.items()}
+        clean_and_engineer(SOpDataProcessor(copy_free=True), self.raw)
+        for name, df in self.raw.items():
+            pd.testing.assert_frame_equal(df, before[name])
+
+    def test_all_valid_orders_share_columns(self):
+        orders = pd.read_csv(FILE_PATHS['orders'])
+        cleaned = SOpDataProcessor(copy_free=True).clean_orders_data(orders)
+        pd.testing.assert_frame_equal(cleaned, SOpDataProcessor().clean_orders_data(orders))
+        cleaned.loc[cleaned.index[0], 'region'] = 'Changed'
+        self.assertNotEqual(orders.loc[orders.index[0], 'region'], 'Changed')
+
+
+class TestCopyFreePeakMemory(unittest.TestCase):
+    """
+    Whole-pipeline peak memory (tracemalloc) against the raw input size
+
+    Text is read as object columns here: tracemalloc does not see the
+    Arrow buffers behind pandas' str dtype, so the test keeps every
+    allocation on the Python/NumPy side where it is counted.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.paths = write_sop_datasets(generate_sop_datasets(scale=5, seed=3), cls.tmp.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def traced(self, func):
+        tracemalloc.start()
+        try:
+            with pd.option_context('future.infer_string', False), contextlib.redirect_stdout(io.StringIO()):
+                result = func()
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return result, current, peak
+
+    def test_peak_within_multiple_of_raw_input(self):
+        _, raw_bytes, _ = self.traced(lambda: {name: pd.read_csv(path) for name, path in self.paths.items()})
+        _, _, default_peak = self.traced(lambda: process_sop_data(self.paths))
+        _, _, copy_free_peak = self.traced(lambda: process_sop_data(self.paths, copy_free=True))
+
+        self.assertLessEqual(copy_free_peak, PEAK_MEMORY_MULTIPLE * raw_bytes)
+        self.assertLess(copy_free_peak, 0.8 * default_peak)
+
+
+if __name__ == '__main__':
+    unittest.main()
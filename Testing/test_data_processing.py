@@ -0,0 +1,212 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import tracemalloc
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data_processing import (OrderAggregates, SOpDataProcessor, detect_outliers, detect_outliers_batch,
+                                 process_sop_data)
+from src.storage import read_partitioned
+from src.synthetic_data import generate_sop_datasets, write_sop_datasets
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'Data')
+FILE_PATHS = {
+    'orders': os.path.join(DATA_DIR, 'Orders.csv'),
+    'inventory': os.path.join(DATA_DIR, 'Inventory.csv'),
+    'forecasts': os.path.join(DATA_DIR, 'Forecasts.csv'),
+    'products': os.path.join(DATA_DIR, 'Products.csv'),
+}
+
+
+class TestStreamingPipeline(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.reference = process_sop_data(FILE_PATHS)
+
+    def test_chunked_matches_in_memory(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            streamed = process_sop_data(FILE_PATHS, chunksize=700, stream_dir=tmp)
+            orders = read_partitioned(os.path.join(tmp, 'orders_processed'))
+            self.assertEqual(os.listdir(os.path.join(tmp, 'orders_clean')), [])
+        self.assertEqual(list(streamed), [name for name in self.reference if name != 'orders'])
+        for name, df in streamed.items():
+            pd.testing.assert_frame_equal(df, self.reference[name], check_exact=False, obj=name)
+        pd.testing.assert_frame_equal(orders, self.reference['orders'], check_exact=False, obj='orders')
+
+    def test_merged_aggregates_match_single_pass(self):
+        processor = SOpDataProcessor()
+        chunks = list(processor.stream_orders_data(FILE_PATHS['orders'], chunksize=1000))
+        merged = OrderAggregates()
+        for chunk in chunks:
+            merged.merge(OrderAggregates.from_orders(chunk))
+        single = OrderAggregates.from_orders(pd.concat(chunks))
+
+        pd.testing.assert_frame_equal(merged.customer_stats(), single.customer_stats())
+        pd.testing.assert_frame_equal(merged.product_stats(), single.product_stats())
+        self.assertEqual(processor.validation_results['orders']['total_records'], 4798)
+
+
+class TestStreamingMemory(unittest.TestCase):
+    """
+    Streaming peak memory (tracemalloc) must not grow with the orders file
+
+    Text is read as object columns so tracemalloc sees it (see
+    test_copy_free.TestCopyFreePeakMemory).
+    """
+
+    def traced_peak(self, n_orders, chunksize):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = write_sop_datasets(generate_sop_datasets(n_orders=n_orders, seed=1), tmp)
+            tracemalloc.start()
+            try:
+                with pd.option_context('future.infer_string', False), contextlib.redirect_stdout(io.StringIO()):
+                    process_sop_data(paths, chunksize=chunksize)
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+    def test_peak_bounded_as_file_grows(self):
+        small = self.traced_peak(20_000, chunksize=2000)
+        large = self.traced_peak(80_000, chunksize=2000)
+        self.assertLess(large, 1.5 * small)
+        self.assertLess(large, 0.5 * self.traced_peak(80_000, chunksize=None))
+
+
+class TestFusedFeatureEngineering(unittest.TestCase):
+
+    def test_matches_groupby_merge_reference(self):
+        processor = SOpDataProcessor()
+        raw = processor.load_datasets(FILE_PATHS)
+        orders = processor.clean_orders_data(raw['orders'])
+        # Inventory row without orders exercises the unmatched-key path
+        inventory = processor.clean_inventory_data(raw['inventory'])
+        inventory = pd.concat([inventory, inventory.head(1).assign(product_id='SKU9999')])
+
+        customer_stats = orders.groupby('customer_type').agg(
+            {'order_value': ['mean', 'std', 'count'], 'discount_pct': 'mean'}).round(2)
+        customer_stats.columns = ['avg_order_value', 'order_value_std', 'order_frequency', 'avg_discount']
+        product_stats = orders.groupby('product_id').agg({'order_value': ['sum', 'count'], 'qty': 'sum'}).round(2)
+        product_stats.columns = ['total_product_revenue', 'total_orders', 'total_qty_sold']
+        demand = orders.groupby('product_id').agg({'qty': 'sum', 'order_value': 'sum'}).rename(
+            columns={'qty': 'historical_demand', 'order_value': 'historical_revenue'})
+        expected_orders = (orders.merge(customer_stats.reset_index(), on='customer_type', how='left')
+                           .merge(product_stats.reset_index(), on='product_id', how='left'))
+        expected_inventory = inventory.merge(demand, on='product_id', how='left')
+        expected_inventory['demand_coverage_ratio'] = (
+            expected_inventory['available_qty'] / expected_inventory['historical_demand'].fillna(1))
+
+        enhanced = processor.engineer_features({'orders': orders, 'inventory': inventory})
+        pd.testing.assert_frame_equal(enhanced['orders'], expected_orders, check_exact=False, rtol=1e-9)
+        pd.testing.assert_frame_equal(enhanced['inventory'], expected_inventory, check_exact=False, rtol=1e-9)
+        self.assertNotIn('avg_order_value', orders.columns)
+
+
+class TestMemoryOptimizedMode(unittest.TestCase):
+
+    def test_compact_dtypes_preserve_values(self):
+        reference = process_sop_data(FILE_PATHS)
+        compact = process_sop_data(FILE_PATHS, memory_optimized=True)
+        for name, df in reference.items():
+            pd.testing.assert_frame_equal(compact[name], df, check_exact=False, check_dtype=False,
+                                          check_categorical=False, obj=name)
+        self.assertIsInstance(compact['inventory']['stock_status'].dtype, pd.CategoricalDtype)
+        self.assertEqual(list(compact['forecasts']['forecast_type'].cat.categories),
+                         ['Manual', 'Statistical', 'ML_Model', 'Unknown'])
+
+    def test_memory_report_per_dataset(self):
+        processor = SOpDataProcessor(memory_optimized=True)
+        raw = processor.load_datasets(FILE_PATHS)
+        processor.clean_orders_data(raw['orders'])
+        processor.clean_products_data(raw['products'])
+        self.assertEqual(sorted(processor.memory_report), ['orders', 'products'])
+        report = processor.memory_report['orders']
+        self.assertLess(report['after_mb'], report['before_mb'])
+
+
+
+class TestIncrementalOrders(unittest.TestCase):
+
+    def test_increments_match_full_rebuild(self):
+        raw = pd.read_csv(FILE_PATHS['orders'])
+        processor = SOpDataProcessor()
+        full = processor.engineer_features({'orders': processor.clean_orders_data(raw)})['orders']
+        expected_products = (full.drop_duplicates('product_id')
+                             .set_index('product_id')[['total_product_revenue', 'total_orders', 'total_qty_sold']]
+                             .sort_index())
+
+        with tempfile.TemporaryDirectory() as state_dir:
+            days = sorted(raw['order_date'].unique())
+            history = raw[raw['order_date'] < days[-2]]
+            processor.process_order_increment(history, state_dir, batch_id='history')
+            for day in days[-2:]:
+                result = processor.process_order_increment(raw[raw['order_date'] == day], state_dir, batch_id=day)
+                self.assertEqual(set(result['product_stats']['product_id']),
+                                 set(raw.loc[raw['order_date'] == day, 'product_id']))
+
+            self.assertEqual(processor.process_order_increment(raw.head(5), state_dir, batch_id=days[-1]), {})
+            table = pd.read_parquet(os.path.join(state_dir, 'product_stats.parquet')).set_index('product_id')
+
+        pd.testing.assert_frame_equal(table.sort_index(), expected_products, check_exact=False)
+
+
+
+class TestParallelPipeline(unittest.TestCase):
+
+    def test_executors_match_serial(self):
+        serial = process_sop_data(FILE_PATHS, memory_optimized=True)
+        for executor in ['thread', 'process']:
+            parallel = process_sop_data(FILE_PATHS, memory_optimized=True, executor=executor, max_workers=2)
+            self.assertEqual(list(parallel), list(serial))
+            for name, df in serial.items():
+                pd.testing.assert_frame_equal(parallel[name], df, obj=f"{executor}:{name}")
+
+    def test_unknown_executor_rejected(self):
+        with self.assertRaises(ValueError):
+            process_sop_data(FILE_PATHS, executor='gpu')
+
+
+
+class TestOutlierDetection(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.orders = pd.read_csv(FILE_PATHS['orders'])
+        cls.columns = ['qty', 'order_value', 'unit_price', 'discount_pct']
+
+    def test_grouped_iqr_matches_per_group_loop(self):
+        mask = detect_outliers_batch(self.orders, self.columns, by='product_id')
+        for _, group in self.orders.groupby('product_id'):
+            for col in self.columns:
+                # Textbook IQR rule on the group alone
+                q1, q3 = group[col].quantile(0.25), group[col].quantile(0.75)
+                iqr = q3 - q1
+                expected = (group[col] < q1 - 1.5 * iqr) | (group[col] > q3 + 1.5 * iqr)
+                pd.testing.assert_series_equal(mask.loc[group.index, col], expected, check_names=False)
+        self.assertTrue(mask.to_numpy().any())
+
+    def test_zscore_aligned_with_missing_values(self):
+        orders = self.orders.assign(order_value=self.orders['order_value'].where(self.orders.index % 5 != 0))
+        flags = detect_outliers(orders, 'order_value', method='zscore')
+        self.assertTrue(flags.index.equals(orders.index))
+        self.assertFalse(flags[orders['order_value'].isna()].any())
+
+        values = orders['order_value'].dropna()
+        expected = np.abs(values - values.mean()) / values.std(ddof=0) > 3
+        pd.testing.assert_series_equal(flags[values.index], expected, check_names=False)
+
+    def test_small_groups_use_global_bounds(self):
+        grouped = detect_outliers_batch(self.orders, self.columns, by=['product_id', 'region'],
+                                        min_group_size=10 ** 6)
+        pd.testing.assert_frame_equal(grouped, detect_outliers_batch(self.orders, self.columns))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.forecast_evaluation import evaluate_forecasts, forecast_error_sums, forecast_metrics_from_sums, tracking_signal
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'Data')
+FILE_PATHS = {
+    'forecasts': os.path.join(DATA_DIR, 'Forecasts.csv'),
+}
+
+
+class TestForecastEvaluation(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.forecasts = pd.read_csv(FILE_PATHS['forecasts'])
+        errors = cls.forecasts.assign(error=cls.forecasts['actual_demand'] - cls.forecasts['forecast_qty'])
+        errors['abs_error'] = errors['error'].abs()
+        errors['ape'] = errors['abs_error'] / errors['actual_demand']
+        cls.errors = errors
+
+    def test_metrics_match_groupby(self):
+        metrics = evaluate_forecasts(self.forecasts, by=['product_id', 'forecast_type'])
+        grouped = self.errors.groupby(['product_id', 'forecast_type'])
+        actual = grouped['actual_demand'].sum()
+        expected = pd.DataFrame({
+            'wape_pct': grouped['abs_error'].sum() / actual * 100,
+            'mape_pct': grouped['ape'].mean() * 100,
+            'bias_pct': grouped['error'].sum() / actual * 100,
+            'mad': grouped['abs_error'].mean(),
+        }).reset_index()
+        pd.testing.assert_frame_equal(metrics[expected.columns], expected)
+
+    def test_sums_merge_across_batches(self):
+        half = len(self.forecasts) // 2
+        parts = [forecast_error_sums(self.forecasts.iloc[:half], 'forecast_type'),
+                 forecast_error_sums(self.forecasts.iloc[half:], 'forecast_type')]
+        merged = forecast_metrics_from_sums(pd.concat(parts).groupby(level=0).sum())
+        direct = evaluate_forecasts(self.forecasts, by='forecast_type').set_index('forecast_type')
+        pd.testing.assert_frame_equal(merged, direct, check_exact=False)
+
+    def test_zero_actuals_excluded_from_mape(self):
+        forecasts = self.forecasts.head(4).assign(product_id='SKU0001', forecast_type='Manual',
+                                                  actual_demand=[0, 10, 10, 10], forecast_qty=[5, 5, 10, 15])
+        metrics = evaluate_forecasts(forecasts, by='product_id').iloc[0]
+        self.assertEqual(metrics['n_mape'], 3)
+        self.assertAlmostEqual(metrics['mape_pct'], 100 / 3)
+        self.assertAlmostEqual(metrics['wape_pct'], 15 / 30 * 100)
+
+    def test_rolling_tracking_signal_matches_pandas(self):
+        keys = ['product_id', 'forecast_type']
+        result = tracking_signal(self.forecasts, window=3)
+
+        per_period = self.errors.groupby(keys + ['forecast_month'])['error'].sum().reset_index()
+        rolling = per_period.groupby(keys)['error'].rolling(3, min_periods=1)
+        rsfe = rolling.sum().reset_index(level=[0, 1], drop=True).sort_index()
+        mad = (per_period['error'].abs().groupby([per_period[k] for k in keys]).rolling(3, min_periods=1).mean()
+               .reset_index(level=[0, 1], drop=True).sort_index())
+
+        np.testing.assert_allclose(result['rsfe'], rsfe)
+        np.testing.assert_allclose(result['mad'], mad)
+        expected_ts = np.where(mad > 0, rsfe / mad.where(mad > 0), np.nan)
+        np.testing.assert_allclose(result['tracking_signal'], expected_ts)
+        self.assertTrue((result['out_of_control'] == (result['tracking_signal'].abs() > 4)).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data_processing import SOpDataProcessor
+from src.forecast_evaluation import evaluate_forecasts
+from src.forecasting import build_demand_matrix, croston, exponential_smoothing, forecast_demand, seasonal_naive
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'Data')
+FILE_PATHS = {
+    'orders': os.path.join(DATA_DIR, 'Orders.csv'),
+    'forecasts': os.path.join(DATA_DIR, 'Forecasts.csv'),
+}
+
+
+def croston_loop(series, alpha):
+    # Textbook per-series Croston (SBA) used as the reference
+    size = interval = None
+    since_last = 1
+    fitted = []
+    for value in series:
+        fitted.append(np.nan if size is None else (1 - alpha / 2) * size / interval)
+        if value > 0:
+            if size is None:
+                size, interval = value, since_last
+            else:
+                size += alpha * (value - size)
+                interval += alpha * (since_last - interval)
+            since_last = 1
+        else:
+            since_last += 1
+    return np.array(fitted)
+
+
+class TestForecasting(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.orders = SOpDataProcessor().clean_orders_data(pd.read_csv(FILE_PATHS['orders']))
+
+    def test_demand_matrix_matches_groupby(self):
+        demand, skus, periods = build_demand_matrix(self.orders)
+        expected = (self.orders.groupby(['product_id', self.orders['order_date'].dt.to_period('M')])['qty'].sum()
+                    .unstack(fill_value=0))
+        np.testing.assert_array_equal(demand, expected.to_numpy())
+        self.assertEqual(list(skus), list(expected.index))
+        self.assertEqual(list(periods), list(expected.columns))
+
+    def test_models_match_per_sku_loops(self):
+        rng = np.random.default_rng(0)
+        demand = rng.poisson(0.6, size=(50, 24)) * rng.integers(1, 20, size=(50, 24))
+
+        fitted, future = croston(demand, horizon=2, alpha=0.2)
+        for row in range(len(demand)):
+            np.testing.assert_allclose(fitted[row], croston_loop(demand[row], 0.2))
+
+        fitted, future, chosen = exponential_smoothing(demand, horizon=2, alphas=[0.3])
+        level = demand[:, 0].astype(float)
+        for t in range(1, demand.shape[1]):
+            np.testing.assert_allclose(fitted[:, t], level)
+            level = level + 0.3 * (demand[:, t] - level)
+        np.testing.assert_allclose(future[:, 1], level)
+
+        fitted, future = seasonal_naive(demand, horizon=14, season_length=12)
+        np.testing.assert_array_equal(fitted[:, 12:], demand[:, :12])
+        np.testing.assert_array_equal(future[:, 13], demand[:, 13])
+
+    def test_output_plugs_into_forecasts_pipeline(self):
+        forecasts = forecast_demand(self.orders, horizon=2)
+        reference = pd.read_csv(FILE_PATHS['forecasts'])
+        self.assertEqual(list(forecasts.columns[:len(reference.columns)]), list(reference.columns))
+
+        future = forecasts[forecasts['actual_demand'].isna()]
+        self.assertEqual(sorted(future['forecast_month'].unique()), ['2025-09-01', '2025-10-01'])
+        self.assertEqual(len(future), 2 * self.orders['product_id'].nunique())
+
+        cleaned = SOpDataProcessor().clean_forecasts_data(forecasts)
+        self.assertTrue((cleaned['forecast_type'] == 'Statistical').all())
+        self.assertFalse((cleaned['confidence_level'] == 'Unknown').any())
+        metrics = evaluate_forecasts(forecasts.dropna(subset=['actual_demand']), by='model')
+        self.assertTrue((metrics['wape_pct'] < 100).all())
+
+    def test_no_dated_orders(self):
+        undated = self.orders.head(5).assign(order_date=pd.NaT)
+        for orders in [self.orders.head(0), undated]:
+            demand, skus, periods = build_demand_matrix(orders)
+            self.assertEqual(demand.shape, (0, 0))
+            self.assertEqual((len(skus), len(periods)), (0, 0))
+            forecasts = forecast_demand(orders)
+            self.assertTrue(forecasts.empty)
+            self.assertEqual(forecasts.columns[-1], 'model')
+
+
+if __name__ == '__main__':
+    unittest.main()
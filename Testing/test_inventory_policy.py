@@ -0,0 +1,77 @@
+import os
+import sys
+import unittest
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.inventory_policy import REGION_WAREHOUSES, compute_inventory_policy, daily_demand_stats
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'Data')
+FILE_PATHS = {
+    'orders': os.path.join(DATA_DIR, 'Orders.csv'),
+    'inventory': os.path.join(DATA_DIR, 'Inventory.csv'),
+    'forecasts': os.path.join(DATA_DIR, 'Forecasts.csv'),
+}
+
+
+class TestInventoryPolicy(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.datasets = {name: pd.read_csv(path) for name, path in FILE_PATHS.items()}
+
+    def test_daily_stats_include_zero_demand_days(self):
+        orders = self.datasets['orders']
+        dates = pd.to_datetime(orders['order_date'])
+        dense = (orders.groupby(['product_id', dates])['qty'].sum().unstack(fill_value=0)
+                 .reindex(columns=pd.date_range(dates.min(), dates.max()), fill_value=0))
+        stats = daily_demand_stats(orders)
+        np.testing.assert_allclose(stats['daily_demand_mean'], dense.mean(axis=1))
+        np.testing.assert_allclose(stats['daily_demand_std'], dense.std(axis=1))
+
+    def test_policy_formulas(self):
+        policy = compute_inventory_policy(self.datasets['inventory'], self.datasets['orders'], service_level=0.9,
+                                          lead_time_days=10, lead_time_std_days=2)
+        z = NormalDist().inv_cdf(0.9)
+        mean, std = policy['daily_demand_mean'], policy['daily_demand_std']
+        expected_ss = z * np.sqrt(10 * std ** 2 + mean ** 2 * 4)
+        np.testing.assert_allclose(policy['safety_stock'], expected_ss)
+        np.testing.assert_allclose(policy['reorder_point'], mean * 10 + expected_ss)
+        np.testing.assert_allclose(policy['days_of_supply'], policy['available_qty'] / mean)
+
+        as_of = pd.Timestamp(self.datasets['orders']['order_date'].max())
+        stockout = as_of + pd.to_timedelta(np.floor(policy['available_qty'] / mean), unit='D')
+        pd.testing.assert_series_equal(policy['stockout_date'], stockout, check_names=False, check_dtype=False)
+        reorder = policy['policy_status'] == 'Reorder'
+        self.assertTrue((policy.loc[reorder, 'available_qty'] <= policy.loc[reorder, 'reorder_point']).all())
+        self.assertTrue((policy.loc[reorder, 'reorder_date'] == as_of).all())
+
+    def test_forecast_error_and_warehouse_demand(self):
+        inventory = self.datasets['inventory']
+        # Second location per SKU and a SKU without any orders
+        inventory = pd.concat([inventory, inventory.assign(warehouse='CPT_Main'),
+                               inventory.head(1).assign(product_id='SKU9999')], ignore_index=True)
+        split = compute_inventory_policy(inventory, self.datasets['orders'], self.datasets['forecasts'])
+        national = daily_demand_stats(self.datasets['orders'])['daily_demand_mean']
+        per_sku = split[split['product_id'] != 'SKU9999'].groupby('product_id')['daily_demand_mean'].sum()
+        np.testing.assert_allclose(per_sku, national.loc[per_sku.index])
+        self.assertFalse(np.allclose(split['demand_uncertainty_std'], split['daily_demand_std']))
+
+        unknown = split[split['product_id'] == 'SKU9999'].iloc[0]
+        self.assertEqual(unknown['policy_status'], 'Excess')
+        self.assertTrue(pd.isna(unknown['stockout_date']))
+
+        regional = compute_inventory_policy(inventory, self.datasets['orders'], region_warehouses=REGION_WAREHOUSES)
+        orders = self.datasets['orders']
+        cape = orders[orders['region'] == 'Western Cape']
+        expected = daily_demand_stats(cape, end=orders['order_date'].max(), start=orders['order_date'].min())
+        actual = regional[regional['warehouse'] == 'CPT_Main'].set_index('product_id')['daily_demand_mean']
+        np.testing.assert_allclose(actual.loc[expected.index], expected['daily_demand_mean'])
+
+
+if __name__ == '__main__':
+    unittest.main()
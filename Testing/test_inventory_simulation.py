@@ -0,0 +1,128 @@
+import os
+import pickle
+import sys
+import unittest
+from concurrent.futures import Executor
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.inventory_simulation import forecast_error_samples, simulate_inventory
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'Data')
+FILE_PATHS = {
+    'orders': os.path.join(DATA_DIR, 'Orders.csv'),
+    'inventory': os.path.join(DATA_DIR, 'Inventory.csv'),
+    'forecasts': os.path.join(DATA_DIR, 'Forecasts.csv'),
+}
+
+
+def forecast_history(sku, forecast, errors):
+    months = pd.date_range('2025-01-01', periods=len(errors), freq='MS')
+    return pd.DataFrame({
+        'product_id': sku, 'forecast_month': months, 'forecast_qty': forecast,
+        'actual_demand': forecast * (1 + np.asarray(errors)), 'forecast_type': 'Statistical',
+    })
+
+
+class TestForecastErrorSamples(unittest.TestCase):
+
+    def test_errors_grouped_by_sku(self):
+        forecasts = pd.concat([forecast_history('B', 10.0, [0.1, -0.1]),
+                               forecast_history('A', 20.0, [0.5, 0.0, -0.5])], ignore_index=True)
+        errors, summary = forecast_error_samples(forecasts)
+        self.assertEqual(list(summary.index), ['A', 'B'])
+        a = summary.loc['A']
+        np.testing.assert_allclose(errors[int(a['offset']):int(a['offset'] + a['count'])], [0.5, 0.0, -0.5])
+        self.assertAlmostEqual(summary.loc['B', 'error_std'], 0.1)
+        self.assertEqual(summary.loc['A', 'latest_forecast'], 20.0)
+
+
+class TestSimulateInventory(unittest.TestCase):
+
+    def test_normal_model_matches_analytic_probability(self):
+        # Ending stock ~ N(available - 3 * 100, 100^2 * 3 * sigma^2) without receipts
+        rng = np.random.default_rng(0)
+        errors = rng.normal(0, 1, 5000)
+        errors = (errors - errors.mean()) / errors.std() * 0.2
+        forecasts = forecast_history('SKU1', 100.0, errors)
+        inventory = pd.DataFrame({'product_id': ['SKU1'], 'warehouse': ['JHB_Main'], 'available_qty': [320]})
+
+        result = simulate_inventory(inventory, forecasts, n_scenarios=40_000, error_model='normal', seed=1)
+        expected = NormalDist(320 - 300, 100 * 0.2 * np.sqrt(3)).cdf(0)
+        self.assertAlmostEqual(result.loc[0, 'stockout_probability'], expected, delta=0.01)
+        self.assertAlmostEqual(result.loc[0, 'expected_ending_stock'], 20.0, delta=0.5)
+
+    def test_exact_forecasts_are_deterministic(self):
+        forecasts = pd.concat([forecast_history('SKU1', 30.0, [0.0] * 4),
+                               forecast_history('SKU2', 30.0, [0.0] * 4)], ignore_index=True)
+        inventory = pd.DataFrame({'product_id': ['SKU1', 'SKU1', 'SKU2'], 'warehouse': ['A', 'B', 'A'],
+                                  'available_qty': [50, 200, 80], 'inbound': [0, 0, 10]})
+        result = simulate_inventory(inventory, forecasts, n_scenarios=50, receipts='inbound')
+
+        # SKU1 demand is split over two warehouses: 15 / month
+        np.testing.assert_allclose(result['monthly_demand_forecast'], [15, 15, 30])
+        np.testing.assert_allclose(result['expected_ending_stock'], [5, 155, 20])
+        np.testing.assert_allclose(result['stockout_probability'], [0, 0, 0])
+        # Excess above 90 days (about 3 months) of demand
+        np.testing.assert_allclose(result['excess_probability'], [0, 1, 0])
+        self.assertAlmostEqual(result.loc[1, 'expected_excess'], 155 - 15 * 90 / (365.25 / 12))
+
+    def test_reproducible_across_executors(self):
+        inventory = pd.read_csv(FILE_PATHS['inventory'])
+        forecasts = pd.read_csv(FILE_PATHS['forecasts'])
+        kwargs = dict(n_scenarios=3000, seed=7, chunk_rows=8, chunk_scenarios=500)
+        serial = simulate_inventory(inventory, forecasts, **kwargs)
+        threaded = simulate_inventory(inventory, forecasts, executor='thread', max_workers=3, **kwargs)
+        processes = simulate_inventory(inventory, forecasts, executor='process', max_workers=2, **kwargs)
+        pd.testing.assert_frame_equal(serial, threaded)
+        pd.testing.assert_frame_equal(serial, processes)
+
+        reseeded = simulate_inventory(inventory, forecasts, **dict(kwargs, seed=8))
+        self.assertFalse(np.allclose(serial['expected_ending_stock'], reseeded['expected_ending_stock']))
+        with self.assertRaises(ValueError):
+            simulate_inventory(inventory, forecasts, executor='cluster')
+
+    def test_tasks_carry_one_row_block(self):
+        class RecordingExecutor(Executor):
+            def map(self, fn, *iterables, **kwargs):
+                self.payloads = [len(pickle.dumps((fn, *args))) for args in zip(*iterables)]
+                return map(fn, *iterables)
+
+        inventory = pd.read_csv(FILE_PATHS['inventory'])
+        forecasts = pd.read_csv(FILE_PATHS['forecasts'])
+        kwargs = dict(n_scenarios=200, chunk_rows=8)
+        payloads = []
+        for copies in [1, 50]:
+            positions = pd.concat([inventory.assign(warehouse=inventory['warehouse'] + f'_{i}')
+                                   for i in range(copies)], ignore_index=True)
+            executor = RecordingExecutor()
+            result = simulate_inventory(positions, forecasts, executor=executor, **kwargs)
+            pd.testing.assert_frame_equal(result, simulate_inventory(positions, forecasts, **kwargs))
+            payloads.append(max(executor.payloads))
+        # A task's size depends on chunk_rows, not on the number of positions
+        self.assertLess(payloads[1], 1.5 * payloads[0])
+
+    def test_skus_without_forecasts_use_order_rate(self):
+        inventory = pd.read_csv(FILE_PATHS['inventory'])
+        orders = pd.read_csv(FILE_PATHS['orders'])
+        forecasts = pd.read_csv(FILE_PATHS['forecasts'])
+        forecasts = forecasts[forecasts['product_id'] != inventory.loc[0, 'product_id']]
+
+        result = simulate_inventory(inventory, forecasts, orders, n_scenarios=1000)
+        self.assertGreater(result.loc[0, 'monthly_demand_forecast'], 0)
+        self.assertTrue(result['stockout_probability'].between(0, 1).all())
+        self.assertTrue((result['expected_shortage'] >= 0).all())
+
+        without_orders = simulate_inventory(inventory, forecasts, n_scenarios=1000)
+        self.assertEqual(without_orders.loc[0, 'monthly_demand_forecast'], 0)
+        self.assertEqual(without_orders.loc[0, 'stockout_probability'], 0)
+        with self.assertRaises(ValueError):
+            simulate_inventory(inventory, forecasts, error_model='bootstrap')
+
+
+if __name__ == '__main__':
+    unittest.main()
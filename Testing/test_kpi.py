@@ -0,0 +1,59 @@
+import os
+import sys
+import unittest
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.kpi import KPICache, KPIStore
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'Data')
+
+
+def load_datasets():
+    return {name: pd.read_csv(os.path.join(DATA_DIR, f"{name.capitalize()}.csv"))
+            for name in ['orders', 'inventory', 'forecasts']}
+
+
+class TestKPIStore(unittest.TestCase):
+
+    def test_memoised_per_dataset_version(self):
+        datasets = load_datasets()
+        cache = KPICache()
+        KPIStore(datasets, cache=cache).all()
+        computed = cache.misses
+
+        KPIStore(datasets, cache=cache).all()
+        self.assertEqual(cache.misses, computed)
+        self.assertEqual(cache.hits, computed)
+
+        # Changing orders invalidates only order KPIs
+        datasets['orders'] = datasets['orders'].assign(order_value=datasets['orders']['order_value'] * 2)
+        store = KPIStore(datasets, cache=cache)
+        store.get('forecast_accuracy')
+        self.assertEqual(cache.misses, computed)
+        totals = store.get('order_totals')
+        self.assertEqual(cache.misses, computed + 1)
+        self.assertAlmostEqual(totals['total_revenue'], datasets['orders']['order_value'].sum())
+
+    def test_matches_direct_aggregates_without_mutating_inputs(self):
+        datasets = load_datasets()
+        before = {name: df.copy() for name, df in datasets.items()}
+        store = KPIStore(datasets, cache=KPICache())
+
+        segments = store.get('segment_summary')
+        orders = datasets['orders']
+        pd.testing.assert_series_equal(segments['revenue'], orders.groupby('customer_type')['order_value'].sum(),
+                                       check_names=False)
+        accuracy = store.get('forecast_accuracy')
+        self.assertAlmostEqual(accuracy['overall'], 100 - datasets['forecasts']['variance_pct'].abs().mean())
+
+        segments.loc[:, 'revenue'] = 0
+        self.assertGreater(store.get('segment_summary')['revenue'].sum(), 0)
+        for name, df in datasets.items():
+            pd.testing.assert_frame_equal(df, before[name])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data_processing import process_sop_data
+from src.profiling import StageProfiler
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'Data')
+FILE_PATHS = {
+    'orders': os.path.join(DATA_DIR, 'Orders.csv'),
+    'inventory': os.path.join(DATA_DIR, 'Inventory.csv'),
+    'forecasts': os.path.join(DATA_DIR, 'Forecasts.csv'),
+    'products': os.path.join(DATA_DIR, 'Products.csv'),
+}
+
+
+class TestStageProfiler(unittest.TestCase):
+
+    def test_pipeline_stages_recorded(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            profiler = StageProfiler(cprofile_dir=tmp)
+            process_sop_data(FILE_PATHS, profiler=profiler)
+            dumps = [f for f in os.listdir(tmp) if f.endswith('.prof')]
+
+        report = profiler.report()
+        for stage in ['validate_data_quality', 'clean_orders_data', 'engineer_features',
+                      'create_summary_statistics']:
+            self.assertIn(stage, set(report['stage']))
+        orders = report[report['stage'] == 'clean_orders_data'].iloc[0]
+        self.assertEqual(orders['rows_in'], 4798)
+        self.assertGreater(orders['mem_peak_mb'], 0)
+        self.assertEqual(len(dumps), len(report[report['depth'] == 0]))
+        self.assertEqual(len(json.loads(profiler.to_json())), len(report))
+
+    def test_load_stage_recorded(self):
+        expected = sum(len(pd.read_csv(path)) for path in FILE_PATHS.values())
+        for chunksize in [None, 1000]:
+            profiler = StageProfiler(trace_memory=False)
+            process_sop_data(FILE_PATHS, chunksize=chunksize, profiler=profiler)
+            loads = profiler.report().query("stage == 'load_datasets'")
+            self.assertGreaterEqual(len(loads), len(FILE_PATHS))
+            self.assertEqual(loads['rows_out'].sum(), expected)
+
+    def test_process_pool_records_collected(self):
+        profiler = StageProfiler(trace_memory=False)
+        process_sop_data(FILE_PATHS, executor='process', profiler=profiler)
+        cleaned = profiler.report()['stage'].str.startswith('clean_').sum()
+        self.assertEqual(cleaned, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.kpi import KPICache
+from src.promotions import batched_least_squares, event_lift, price_elasticity, promotion_panel
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'Data')
+FILE_PATHS = {
+    'orders': os.path.join(DATA_DIR, 'Orders.csv'),
+    'products': os.path.join(DATA_DIR, 'Products.csv'),
+}
+
+
+def synthetic_orders(elasticities, lift=0.0, weeks=30, seed=0):
+    """
+    One order per SKU and week with qty = scale * price^elasticity, times
+    (1 + lift) in weeks under the 'Flash Sale' event
+    """
+    rng = np.random.default_rng(seed)
+    frames = []
+    for sku, (category, elasticity) in elasticities.items():
+        dates = pd.date_range('2025-01-06', periods=weeks, freq='W-MON')
+        price = 100 * rng.uniform(0.6, 1.0, weeks)
+        on_sale = rng.random(weeks) < 0.3
+        qty = np.round(1e5 * (price / 100) ** elasticity * np.where(on_sale, 1 + lift, 1.0))
+        frames.append(pd.DataFrame({
+            'product_id': sku, 'order_date': dates, 'qty': qty, 'unit_price': price,
+            'sale_event': np.where(on_sale, 'Flash Sale', None), 'category': category,
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+class TestBatchedLeastSquares(unittest.TestCase):
+
+    def test_matches_per_group_fits(self):
+        rng = np.random.default_rng(1)
+        groups = rng.integers(0, 5, 400)
+        X = rng.normal(size=(400, 2))
+        y = 1.5 + X @ np.array([0.5, -2.0]) + groups * X[:, 0] + rng.normal(scale=0.1, size=400)
+        X[groups == 3, 1] = 7.0  # constant regressor in one group
+        fit = batched_least_squares(X, y, groups, n_groups=6)
+
+        for g in range(5):
+            rows = groups == g
+            design = np.column_stack([np.ones(rows.sum()), X[rows]])
+            if g == 3:
+                expected = np.linalg.lstsq(design[:, :2], y[rows], rcond=None)[0]
+                np.testing.assert_allclose(fit['coef'][g, 1], expected[1], rtol=1e-8)
+                self.assertTrue(np.isnan(fit['coef'][g, 2]))
+                continue
+            expected, residuals = np.linalg.lstsq(design, y[rows], rcond=None)[:2]
+            np.testing.assert_allclose(fit['coef'][g], expected, rtol=1e-8)
+            sigma2 = residuals[0] / (rows.sum() - 3)
+            std_error = np.sqrt(sigma2 * np.diag(np.linalg.inv(design.T @ design)))
+            np.testing.assert_allclose(fit['std_error'][g], std_error, rtol=1e-6)
+
+        # Group without rows
+        self.assertEqual(fit['n_obs'][5], 0)
+        self.assertTrue(np.isnan(fit['coef'][5]).all())
+
+
+class TestPromotionEffects(unittest.TestCase):
+
+    def setUp(self):
+        self.orders = synthetic_orders({'SKU1': ('Phones', -2.0), 'SKU2': ('Phones', -2.0),
+                                        'SKU3': ('Laptops', -0.5)})
+
+    def test_recovers_sku_and_category_elasticity(self):
+        sku = price_elasticity(self.orders, cache=KPICache())
+        np.testing.assert_allclose(sku['elasticity'], [-2.0, -2.0, -0.5], atol=0.01)
+        self.assertEqual(list(sku['category']), ['Phones', 'Phones', 'Laptops'])
+
+        category = price_elasticity(self.orders, by='category', cache=KPICache())
+        np.testing.assert_allclose(category.loc[['Laptops', 'Phones'], 'elasticity'], [-0.5, -2.0], atol=0.01)
+        self.assertEqual(category.loc['Phones', 'n_skus'], 2)
+        with self.assertRaises(ValueError):
+            price_elasticity(self.orders, by='promotional_tier', cache=KPICache())
+
+    def test_event_lift(self):
+        orders = synthetic_orders({'SKU1': ('Phones', 0.0), 'SKU2': ('Phones', 0.0)}, lift=1.0)
+        lift = event_lift(orders, cache=KPICache())
+        np.testing.assert_allclose(lift['lift'], [1.0, 1.0], atol=0.01)
+        pooled = event_lift(orders, by='category', cache=KPICache())
+        self.assertAlmostEqual(pooled.loc[('Phones', 'Flash Sale'), 'lift'], 1.0, delta=0.01)
+
+    def test_results_cached_by_dataset_version(self):
+        cache = KPICache()
+        first = price_elasticity(self.orders, cache=cache)
+        first['elasticity'] = 0.0
+        second = price_elasticity(self.orders, cache=cache)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertAlmostEqual(second.loc['SKU1', 'elasticity'], -2.0, delta=0.01)
+
+        changed = self.orders.copy()
+        changed.loc[0, 'qty'] *= 3
+        price_elasticity(changed, cache=cache)
+        self.assertEqual(cache.misses, 2)
+
+    def test_shipped_data(self):
+        orders = pd.read_csv(FILE_PATHS['orders'])
+        products = pd.read_csv(FILE_PATHS['products'])
+        panel = promotion_panel(orders)
+        self.assertEqual(panel['units'].sum(), orders['qty'].sum())
+
+        tiers = price_elasticity(orders, products, by='promotional_tier', cache=KPICache())
+        self.assertEqual(tiers['n_skus'].sum(), orders['product_id'].nunique())
+        lift = event_lift(orders, products, cache=KPICache())
+        self.assertEqual(len(lift), orders['product_id'].nunique() * orders['sale_event'].nunique())
+
+
+if __name__ == '__main__':
+    unittest.main()
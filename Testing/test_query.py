@@ -0,0 +1,76 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.query import OrderQueryIndex
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'Data')
+FILE_PATHS = {
+    'orders': os.path.join(DATA_DIR, 'Orders.csv'),
+}
+
+
+class TestOrderQueryIndex(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.orders = pd.read_csv(FILE_PATHS['orders'])
+        cls.months = pd.to_datetime(cls.orders['order_date']).dt.to_period('M')
+        cls.index = OrderQueryIndex(cls.orders)
+
+    def scan(self, product_id=None, region=None, customer_type=None, month=None):
+        mask = pd.Series(True, index=self.orders.index)
+        for column, values in [('product_id', product_id), ('region', region), ('customer_type', customer_type)]:
+            if values is not None:
+                mask &= self.orders[column].isin(values if isinstance(values, list) else [values])
+        if isinstance(month, tuple):
+            mask &= (self.months >= pd.Period(month[0])) & (self.months <= pd.Period(month[1]))
+        elif month is not None:
+            mask &= self.months == pd.Period(month)
+        return self.orders[mask]
+
+    def test_aggregates_match_full_scan(self):
+        rng = np.random.default_rng(1)
+        skus = self.orders['product_id'].unique()
+        queries = [
+            {'product_id': 'SKU0028', 'region': 'Gauteng', 'month': '2025-03'},
+            {'region': ['Gauteng', 'Free State'], 'month': ('2025-02', '2025-04')},
+            {'customer_type': 'Business'},
+            {'product_id': list(rng.choice(skus, 5)), 'customer_type': ['Premium', 'Individual']},
+            {'product_id': 'SKU9999'},
+            {},
+        ]
+        for query in queries:
+            expected = self.scan(**query)
+            result = self.index.aggregate(**query)
+            self.assertEqual(result['orders'], len(expected), query)
+            self.assertAlmostEqual(result['revenue'], expected['order_value'].sum(), places=4)
+            self.assertEqual(result['qty'], expected['qty'].sum())
+
+    def test_rows_and_breakdown(self):
+        rows = self.index.rows(customer_type='Business', month=pd.Timestamp('2025-05-20'))
+        expected = self.scan(customer_type='Business', month='2025-05')
+        self.assertEqual(sorted(rows.index), sorted(expected.index))
+
+        breakdown = self.index.breakdown('month', product_id='SKU0028')
+        reference = self.scan(product_id='SKU0028').groupby(self.months)['order_value'].sum()
+        np.testing.assert_allclose(breakdown['revenue'], reference)
+        breakdown.loc[:, 'revenue'] = 0
+        self.assertGreater(self.index.breakdown('month', product_id='SKU0028')['revenue'].sum(), 0)
+
+    def test_repeated_queries_hit_cache(self):
+        index = OrderQueryIndex(self.orders)
+        index.aggregate(product_id='SKU0028', month='2025-03')
+        index.aggregate(product_id=['SKU0028'], month=pd.Period('2025-03', freq='M'))
+        self.assertEqual((index.cache.hits, index.cache.misses), (1, 1))
+        with self.assertRaises(KeyError):
+            index.aggregate(warehouse='JHB_Main')
+
+
+if __name__ == '__main__':
+    unittest.main()
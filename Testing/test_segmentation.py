@@ -0,0 +1,92 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.kpi import KPICache
+from src.segmentation import abc_classes, apply_segmentation, demand_matrix, segment_demand
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'Data')
+FILE_PATHS = {
+    'orders': os.path.join(DATA_DIR, 'Orders.csv'),
+    'products': os.path.join(DATA_DIR, 'Products.csv'),
+}
+
+
+def orders_from_matrix(demand):
+    """
+    One order per SKU x month with the given quantity (unit price 10)
+    """
+    rows = [{'product_id': sku, 'order_date': f'2025-{month + 1:02d}-15', 'qty': qty, 'order_value': qty * 10.0}
+            for sku, series in demand.items() for month, qty in enumerate(series) if qty > 0]
+    return pd.DataFrame(rows)
+
+
+class TestSegmentation(unittest.TestCase):
+
+    def test_patterns_on_known_series(self):
+        orders = orders_from_matrix({
+            'SMOOTH': [10, 11, 9, 10, 10, 10, 11, 9],
+            'INTERMITTENT': [5, 0, 0, 5, 0, 0, 5, 0],
+            'ERRATIC': [1, 40, 2, 30, 1, 50, 2, 1],
+            'LUMPY': [0, 90, 0, 0, 1, 0, 0, 2],
+        })
+        products = pd.DataFrame({'product_id': ['SMOOTH', 'INTERMITTENT', 'ERRATIC', 'LUMPY', 'NEW']})
+        segments = segment_demand(orders, products, cache=KPICache())
+        self.assertEqual(segments['demand_pattern'].astype(str).to_dict(), {
+            'ERRATIC': 'Erratic', 'INTERMITTENT': 'Intermittent', 'LUMPY': 'Lumpy', 'SMOOTH': 'Smooth',
+            'NEW': 'No Demand'})
+        self.assertEqual(segments.loc['SMOOTH', 'xyz_class'], 'X')
+        self.assertEqual(segments.loc['LUMPY', 'xyz_class'], 'Z')
+        self.assertAlmostEqual(segments.loc['INTERMITTENT', 'adi'], 8 / 3)
+        self.assertEqual(segments.loc['INTERMITTENT', 'cv2'], 0)
+        self.assertEqual(segments.loc['NEW', 'abc_xyz'], 'CZ')
+
+    def test_abc_thresholds(self):
+        classes, cumulative = abc_classes(np.array([5.0, 70.0, 20.0, 4.0, 1.0]))
+        np.testing.assert_array_equal(classes, ['B', 'A', 'A', 'C', 'C'])
+        self.assertAlmostEqual(cumulative[1], 0.7)
+        self.assertAlmostEqual(cumulative.max(), 1.0)
+
+    def test_matches_groupby_reference_and_writes_back(self):
+        orders = pd.read_csv(FILE_PATHS['orders'])
+        products = pd.read_csv(FILE_PATHS['products'])
+        segments = segment_demand(orders, products)
+
+        monthly = orders.pivot_table(index='product_id', columns='order_month', values='qty', aggfunc='sum',
+                                     fill_value=0)
+        cv = monthly.std(axis=1, ddof=0) / monthly.mean(axis=1)
+        np.testing.assert_allclose(segments.loc[cv.index, 'demand_cv'], cv)
+        revenue = orders.groupby('product_id')['order_value'].sum()
+        np.testing.assert_allclose(segments.loc[revenue.index, 'revenue'], revenue)
+
+        enriched = apply_segmentation(products, segments)
+        self.assertEqual(len(enriched), len(products))
+        self.assertTrue(enriched['abc_class'].isin(['A', 'B', 'C']).all())
+        self.assertTrue(enriched['derived_volatility'].isin(['Low', 'Medium', 'High']).all())
+        self.assertNotIn('abc_class', products.columns)
+        overwritten = apply_segmentation(products, segments, overwrite_volatility=True)
+        pd.testing.assert_series_equal(overwritten['demand_volatility'], enriched['derived_volatility'],
+                                       check_names=False)
+
+    def test_matrix_is_cached_and_read_only(self):
+        orders = pd.read_csv(FILE_PATHS['orders'])
+        cache = KPICache()
+        first = demand_matrix(orders, cache=cache)
+        second = demand_matrix(orders.copy(), cache=cache)
+        self.assertIs(first[0], second[0])
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertFalse(first[0].flags.writeable)
+
+        # Revenue is a bincount, not a second cached matrix
+        segment_cache = KPICache()
+        segment_demand(orders, cache=segment_cache)
+        self.assertEqual(segment_cache.misses, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data_processing import SOpDataProcessor, process_sop_data
+from src.storage import (PARTITION_COLUMNS, list_partitions, load_cached_dataset, load_processed_data,
+                         read_partitioned, write_partitioned)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'Data')
+FILE_PATHS = {
+    'orders': os.path.join(DATA_DIR, 'Orders.csv'),
+    'inventory': os.path.join(DATA_DIR, 'Inventory.csv'),
+    'forecasts': os.path.join(DATA_DIR, 'Forecasts.csv'),
+    'products': os.path.join(DATA_DIR, 'Products.csv'),
+}
+
+
+class TestColumnarCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_cached_load_is_schema_typed_and_reused(self):
+        cache_dir = os.path.join(self.tmp.name, 'cache')
+        first = load_cached_dataset('orders', FILE_PATHS['orders'], cache_dir)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(first['order_date']))
+        self.assertEqual(first['is_on_sale'].dtype, bool)
+
+        with self.assertLogs('src.storage', level='INFO') as logs:
+            second = load_cached_dataset('orders', FILE_PATHS['orders'], cache_dir)
+        self.assertIn('Cache hit', logs.output[0])
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_cache_rebuilds_when_source_changes(self):
+        source = os.path.join(self.tmp.name, 'Products.csv')
+        products = pd.read_csv(FILE_PATHS['products'])
+        products.to_csv(source, index=False)
+        cache_dir = os.path.join(self.tmp.name, 'cache')
+        self.assertEqual(len(load_cached_dataset('products', source, cache_dir)), 30)
+
+        products.head(10).to_csv(source, index=False)
+        self.assertEqual(len(load_cached_dataset('products', source, cache_dir)), 10)
+
+    def test_processed_roundtrip_keeps_dtypes(self):
+        cache_dir = os.path.join(self.tmp.name, 'cache')
+        processed = process_sop_data(FILE_PATHS, cache_dir=cache_dir)
+        output_dir = os.path.join(self.tmp.name, 'out')
+        SOpDataProcessor().export_processed_data(processed, output_dir, file_format='parquet')
+
+        reloaded = load_processed_data(output_dir)
+        self.assertEqual(sorted(reloaded), sorted(processed))
+        self.assertIsInstance(reloaded['forecasts']['accuracy_category'].dtype, pd.CategoricalDtype)
+        self.assertEqual(reloaded['orders']['is_weekend'].dtype, bool)
+        pd.testing.assert_frame_equal(reloaded['orders'], processed['orders'])
+
+
+class TestPartitionedStorage(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.processed = process_sop_data(FILE_PATHS)
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_partitioned_export_roundtrip(self):
+        output_dir = os.path.join(self.tmp.name, 'out')
+        SOpDataProcessor().export_processed_data(self.processed, output_dir, file_format='parquet',
+                                                 partition_by=PARTITION_COLUMNS)
+        self.assertTrue(os.path.isdir(os.path.join(output_dir, 'orders_processed')))
+        self.assertEqual(len(list_partitions(os.path.join(output_dir, 'orders_processed'))), 8)
+
+        reloaded = load_processed_data(output_dir)
+        self.assertEqual(sorted(reloaded), sorted(self.processed))
+        expected = self.processed['orders'].sort_values(['order_date', 'order_id'], kind='stable')
+        actual = reloaded['orders'].sort_values(['order_date', 'order_id'], kind='stable')
+        pd.testing.assert_frame_equal(actual.reset_index(drop=True), expected.reset_index(drop=True))
+
+    def test_rewrite_only_replaces_partitioned_datasets(self):
+        orders = self.processed['orders']
+        path = os.path.join(self.tmp.name, 'orders')
+        write_partitioned(orders, path)
+        write_partitioned(orders.head(10), path)
+        self.assertEqual(len(read_partitioned(path)), 10)
+
+        unrelated = os.path.join(self.tmp.name, 'unrelated')
+        os.makedirs(unrelated)
+        keep = os.path.join(unrelated, 'notes.txt')
+        open(keep, 'w').close()
+        with self.assertRaises(FileExistsError):
+            write_partitioned(orders, unrelated)
+        self.assertTrue(os.path.exists(keep))
+        write_partitioned(orders, unrelated, overwrite=True)
+        self.assertFalse(os.path.exists(keep))
+        self.assertEqual(len(read_partitioned(unrelated)), len(orders))
+
+    def test_filtered_load_prunes_partitions(self):
+        output_dir = os.path.join(self.tmp.name, 'out')
+        SOpDataProcessor().export_processed_data({'orders': self.processed['orders']}, output_dir,
+                                                 file_format='parquet', partition_by=PARTITION_COLUMNS + ['region'])
+        path = os.path.join(output_dir, 'orders_processed')
+
+        with self.assertLogs('src.storage', level='INFO') as logs:
+            subset = read_partitioned(path, start='2025-06-15', end='2025-08-31', regions=['Gauteng'],
+                                      columns=['order_id', 'order_value'])
+        self.assertIn('Read 3 of 40 partitions', logs.output[-1])
+
+        orders = self.processed['orders']
+        mask = (orders['order_date'] >= '2025-06-15') & (orders['region'] == 'Gauteng')
+        self.assertEqual(list(subset.columns), ['order_id', 'order_value'])
+        self.assertEqual(sorted(subset['order_id']), sorted(orders.loc[mask, 'order_id']))
+        self.assertAlmostEqual(subset['order_value'].sum(), orders.loc[mask, 'order_value'].sum(), places=2)
+
+    def test_load_datasets_filters_raw_and_partitioned_alike(self):
+        processor = SOpDataProcessor()
+        filters = dict(start='2025-03-01', end='2025-03-31', regions=['Western Cape', 'Free State'],
+                       columns={'orders': ['order_id', 'qty']})
+        from_csv = processor.load_datasets({'orders': FILE_PATHS['orders']}, **filters)['orders']
+
+        raw_dir = os.path.join(self.tmp.name, 'raw_orders')
+        write_partitioned(pd.read_csv(FILE_PATHS['orders']), raw_dir)
+        from_partitions = processor.load_datasets({'orders': raw_dir}, **filters)['orders']
+
+        self.assertGreater(len(from_csv), 0)
+        pd.testing.assert_frame_equal(from_partitions.sort_values('order_id').reset_index(drop=True),
+                                      from_csv.sort_values('order_id').reset_index(drop=True))
+
+        with self.assertRaises(ValueError):
+            processor.export_processed_data(self.processed, self.tmp.name, partition_by=PARTITION_COLUMNS)
+
+
+if __name__ == '__main__':
+    unittest.main()
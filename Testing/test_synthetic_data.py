@@ -0,0 +1,71 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.benchmark import compare_to_baseline, main, measure_import_time, run_benchmark, save_baseline
+from src.synthetic_data import generate_sop_datasets, write_sop_datasets
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'Data')
+
+
+class TestSyntheticData(unittest.TestCase):
+
+    def test_schema_matches_shipped_csvs(self):
+        datasets = generate_sop_datasets(scale=2, n_warehouses=2, seed=7)
+        self.assertEqual(len(datasets['orders']), 9596)
+        self.assertEqual(datasets['products']['product_id'].nunique(), 60)
+        self.assertEqual(len(datasets['inventory']), 120)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            file_paths = write_sop_datasets(datasets, tmp)
+            for name, path in file_paths.items():
+                generated = pd.read_csv(path)
+                shipped = pd.read_csv(os.path.join(DATA_DIR, f"{name.capitalize()}.csv"))
+                self.assertEqual(list(generated.columns), list(shipped.columns), name)
+                self.assertEqual(generated.dtypes.to_dict(), shipped.dtypes.to_dict(), name)
+
+    def test_seed_is_reproducible(self):
+        first = generate_sop_datasets(n_orders=500, n_products=20, seed=3)
+        second = generate_sop_datasets(n_orders=500, n_products=20, seed=3)
+        for name in first:
+            pd.testing.assert_frame_equal(first[name], second[name])
+
+
+class TestBenchmarkHarness(unittest.TestCase):
+
+    def test_baseline_roundtrip(self):
+        results = run_benchmark(scales=[0.5], stages=['engineer_features', 'detect_outliers'], trace_memory=False)
+        self.assertEqual(list(results['stage']), ['engineer_features', 'detect_outliers'])
+        self.assertTrue((results['rows_per_s'] > 0).all())
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'baseline.json')
+            save_baseline(results, path)
+            comparison = compare_to_baseline(results, path)
+        self.assertFalse(comparison['regression'].any())
+        self.assertTrue((comparison['time_ratio'] == 1).all())
+
+    def test_missing_baseline_fails(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'missing.json')
+            with self.assertLogs('src.benchmark', level='ERROR'):
+                self.assertEqual(main(['--scales', '0.1', '--baseline', path]), 2)
+            self.assertFalse(os.path.exists(path))
+
+    def test_data_entry_points_skip_plotting_imports(self):
+        imports = measure_import_time(['src', 'src.data_processing', 'src.kpi', 'src.visualization'],
+                                      repeats=1).set_index('module')
+        self.assertEqual(imports.loc['src', 'plotting_loaded'], '')
+        self.assertEqual(imports.loc['src.data_processing', 'plotting_loaded'], '')
+        self.assertEqual(imports.loc['src.kpi', 'plotting_loaded'], '')
+        # Plotting libraries load on first render, not on import
+        self.assertEqual(imports.loc['src.visualization', 'plotting_loaded'], '')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data_processing import SOpDataProcessor
+from src.validation import evaluate_rules, memory_usage_mb, violations_frame
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'Data')
+FILE_PATHS = {
+    'orders': os.path.join(DATA_DIR, 'Orders.csv'),
+    'inventory': os.path.join(DATA_DIR, 'Inventory.csv'),
+    'forecasts': os.path.join(DATA_DIR, 'Forecasts.csv'),
+    'products': os.path.join(DATA_DIR, 'Products.csv'),
+}
+
+
+def violation_counts(result):
+    return {(v['rule'], v['column']): v['violations'] for v in result['rule_violations']}
+
+
+class TestValidationRules(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.datasets = {name: pd.read_csv(path) for name, path in FILE_PATHS.items()}
+
+    def test_clean_orders_pass_every_rule(self):
+        result = evaluate_rules(self.datasets['orders'], 'orders', references=self.datasets)
+        self.assertEqual(sum(violation_counts(result).values()), 0)
+        self.assertIn(('references', 'product_id->products.product_id'), violation_counts(result))
+        self.assertEqual(result['missing_by_column'], {'sale_event': 4343})
+
+    def test_injected_errors_detected(self):
+        orders = self.datasets['orders'].copy()
+        orders.loc[0:2, 'qty'] = 0
+        orders.loc[3, 'customer_type'] = 'Reseller'
+        orders.loc[4, 'product_id'] = 'SKU9999'
+        orders.loc[5, 'order_value'] += 10
+        orders.loc[6, 'region'] = None
+        orders = pd.concat([orders, orders.tail(2)], ignore_index=True)
+
+        result = evaluate_rules(orders, 'orders', references=self.datasets)
+        counts = violation_counts(result)
+        self.assertEqual(counts[('range', 'qty')], 3)
+        self.assertEqual(counts[('allowed', 'customer_type')], 1)
+        self.assertEqual(counts[('references', 'product_id->products.product_id')], 1)
+        self.assertEqual(counts[('not_null', 'region')], 1)
+        self.assertEqual(counts[('unique', 'order_id')], 2)
+        self.assertEqual(result['duplicate_records'], 2)
+        # Rows 0-2: qty changed, so calc_order_value no longer equals qty * unit_price
+        self.assertEqual(counts[('matches', 'order_value=calc_order_value')], 1)
+        self.assertEqual(counts[('matches', 'calc_order_value=qty*unit_price')], 3)
+
+    def test_sampled_counts_are_scaled(self):
+        orders = self.datasets['orders'].copy()
+        orders.loc[orders.index % 4 == 0, 'discount_pct'] = 150
+        result = evaluate_rules(orders, 'orders', sample=0.5)
+        self.assertEqual(result['sampled_rows'], len(orders) // 2)
+        estimate = violation_counts(result)[('range', 'discount_pct')]
+        self.assertLess(abs(estimate - len(orders) / 4), len(orders) * 0.05)
+        self.assertAlmostEqual(result['missing_values'], 4343, delta=4343 * 0.05)
+
+    def test_duplicates_whole_rows_and_keys(self):
+        forecasts = self.datasets['forecasts']
+        processor = SOpDataProcessor()
+        validation = processor.validate_data_quality(forecasts, 'forecasts')
+        self.assertEqual(validation['duplicate_records'], forecasts.duplicated().sum())
+        self.assertEqual(validation['duplicate_keys'],
+                         forecasts.duplicated(subset=['product_id', 'forecast_month', 'forecast_type']).sum())
+        self.assertEqual((validation['duplicate_records'], validation['duplicate_keys']), (1, 5))
+
+        summary = processor.create_summary_statistics({'forecasts': forecasts}).iloc[0]
+        self.assertEqual((summary['duplicate_rows'], summary['duplicate_keys']), (1, 5))
+
+    def test_memory_usage_sizes_text_columns(self):
+        names = [f'customer-{i:06d}' for i in range(2000)]
+        for dtype in ['str', 'string[python]', 'category', object]:
+            df = pd.DataFrame({'name': pd.Series(names, dtype=dtype), 'qty': np.arange(2000)})
+            expected = df.memory_usage(deep=True).sum() / (1024 * 1024)
+            self.assertAlmostEqual(memory_usage_mb(df), expected, msg=str(dtype))
+            # Extrapolated from a sample of equally long values
+            self.assertAlmostEqual(memory_usage_mb(df, sample=df.head(500)), expected, places=2, msg=str(dtype))
+
+    def test_pipeline_reports_rules(self):
+        processor = SOpDataProcessor()
+        validation = processor.validate_data_quality(self.datasets['inventory'], 'inventory')
+        self.assertEqual(validation['total_records'], 30)
+        self.assertEqual(violation_counts(validation)[('allowed', 'stock_status')],
+                         (~self.datasets['inventory']['stock_status'].isin(['Excess', 'Adequate', 'Low'])).sum())
+
+        streamed = SOpDataProcessor()
+        list(streamed.stream_orders_data(FILE_PATHS['orders'], chunksize=1000))
+        single = processor.validate_data_quality(self.datasets['orders'], 'orders')
+        self.assertEqual(violation_counts(streamed.validation_results['orders']), violation_counts(single))
+
+        report = violations_frame({'orders': single, 'inventory': validation})
+        self.assertEqual(set(report['dataset']), {'orders', 'inventory'})
+        np.testing.assert_array_equal(report['rate'] >= 0, True)
+
+
+if __name__ == '__main__':
+    unittest.main()
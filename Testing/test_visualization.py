@@ -0,0 +1,102 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.visualization import (create_interactive_dashboard, create_order_scatter, render_dashboards, slice_datasets,
+                               write_interactive_dashboard)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'Data')
+FILE_PATHS = {
+    'orders': os.path.join(DATA_DIR, 'Orders.csv'),
+    'inventory': os.path.join(DATA_DIR, 'Inventory.csv'),
+    'forecasts': os.path.join(DATA_DIR, 'Forecasts.csv'),
+    'products': os.path.join(DATA_DIR, 'Products.csv'),
+}
+
+
+class TestBatchRendering(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.datasets = {name: pd.read_csv(path) for name, path in FILE_PATHS.items()}
+
+    def test_category_slice_restricts_product_datasets(self):
+        sliced = slice_datasets(self.datasets, {'category': 'Gaming & Entertainment'})
+        skus = set(self.datasets['products'].loc[self.datasets['products']['category'] == 'Gaming & Entertainment',
+                                                  'product_id'])
+        for name in ['orders', 'inventory', 'forecasts', 'products']:
+            self.assertEqual(set(sliced[name]['product_id']), skus, name)
+
+        # Region is an order attribute; inventory stays company-wide
+        sliced = slice_datasets(self.datasets, {'region': 'Gauteng'})
+        self.assertTrue((sliced['orders']['region'] == 'Gauteng').all())
+        self.assertIs(sliced['inventory'], self.datasets['inventory'])
+
+    def test_renders_files_without_pyplot_figures(self):
+        slices = [{'region': 'Gauteng'}, {'category': ['Gaming & Entertainment', 'Software & Licensing']},
+                  {'region': 'Atlantis'}]
+        open_figures = plt.get_fignums()
+        with tempfile.TemporaryDirectory() as tmp:
+            written = render_dashboards(self.datasets, slices, tmp, formats=('png', 'pdf'), dpi=30, executor=None)
+            self.assertEqual(list(written), ['region-gauteng',
+                                             'category-gaming_entertainment_+_software_licensing'])
+            for paths in written.values():
+                with open(paths[0], 'rb') as png, open(paths[1], 'rb') as pdf:
+                    self.assertEqual(png.read(4), b'\x89PNG')
+                    self.assertEqual(pdf.read(4), b'%PDF')
+        self.assertEqual(plt.get_fignums(), open_figures)
+
+    def test_process_pool(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            written = render_dashboards(self.datasets, [{'region': 'Gauteng'}, {'region': 'Free State'}], tmp,
+                                        dpi=30, executor='process', max_workers=2)
+            self.assertEqual(sorted(os.listdir(tmp)), ['region-free_state.png', 'region-gauteng.png'])
+        self.assertEqual(len(written), 2)
+
+
+def trace_lengths(fig):
+    return [[len(getattr(trace, axis)) for axis in ('x', 'y', 'values') if getattr(trace, axis, None) is not None]
+            for trace in fig.data]
+
+
+class TestInteractiveDashboard(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.datasets = {name: pd.read_csv(path) for name, path in FILE_PATHS.items()}
+
+    def test_figure_size_independent_of_order_count(self):
+        fig = create_interactive_dashboard(self.datasets)
+        self.assertEqual(len(fig.data), 9)
+        many_orders = dict(self.datasets, orders=pd.concat([self.datasets['orders']] * 20, ignore_index=True))
+        # Same number of values per trace, however many orders there are
+        shipped = trace_lengths(create_interactive_dashboard(many_orders))
+        self.assertEqual(shipped, trace_lengths(fig))
+        self.assertLessEqual(max(max(lengths, default=0) for lengths in shipped), 20)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_interactive_dashboard(fig, os.path.join(tmp, 'dashboard.html'))
+            self.assertLess(os.path.getsize(path), 100_000)
+
+    def test_point_view_uses_webgl_and_caps_points(self):
+        orders = self.datasets['orders']
+        small = create_order_scatter(orders)
+        self.assertEqual([trace.type for trace in small.data], ['scattergl'])
+        self.assertEqual(len(small.data[0].x), len(orders))
+
+        large = create_order_scatter(orders, max_points=500, bins=20)
+        self.assertEqual([trace.type for trace in large.data], ['heatmap', 'scattergl'])
+        self.assertEqual(len(large.data[1].x), 500)
+        self.assertEqual(pd.Series(large.data[0].z.ravel()).sum(), len(orders))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,13 +4,35 @@ S&OP Demand & Inventory Performance Tracker
 
 Package initialization module.
 
+Public names are resolved lazily on first access, so ``import src`` or
+``from src import data_processing`` does not load matplotlib, seaborn or
+plotly. Only touching a plotting name imports the visualization stack.
+
 Author: Aviwe Dlepu
 """
 
+import importlib
+
 __version__ = "1.0.0"
 __author__ = "Aviwe Dlepu"
 __email__ = "aviwe.dlepu@example.com"
 
-from .visualization import create_sop_dashboard
+# Public name -> submodule that defines it
+_LAZY_EXPORTS = {
+    'create_sop_dashboard': '.visualization',
+    'create_interactive_dashboard': '.visualization',
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-__all__ = ['create_sop_dashboard']
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,550 @@
+"""
+S&OP Compute Backends Module
+============================
+
+Interchangeable engines for the row-heavy stages of SOpDataProcessor.
+
+The pandas backend is the reference implementation and the default. The
+DuckDB backend runs the same stages in an embedded, multi-threaded
+columnar engine. It reads DataFrames in place, or reads CSV/Parquet files
+and partitioned directories without loading them first. Both backends
+return the same pandas frames, columns and dtypes, so everything
+downstream is unchanged.
+
+Stages:
+- clean_orders: date features, numeric coercion, invalid-order filter,
+  derived price columns (SOpDataProcessor.clean_orders_data)
+- order_aggregates: per-key moments behind engineer_features
+- dataset_totals: counts and totals for create_summary_statistics
+- read_batches (DuckDB): raw rows of a file in bounded frames, for validation
+
+Functions:
+- get_backend: resolve None / 'pandas' / 'duckdb' / an instance
+- PandasBackend, DuckDBBackend
+"""
+
+import logging
+import os
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .data_processing import DATASET_SCHEMAS, ORDER_AGGREGATE_SPEC, OrderAggregates
+
+logger = logging.getLogger(__name__)
+
+COMPUTE_BACKENDS = ('pandas', 'duckdb')
+
+ORDER_NUMERIC_COLUMNS = ['qty', 'base_price', 'unit_price', 'discount_pct', 'order_value']
+# Orders failing any of these (or with a missing value) are dropped by cleaning
+ORDER_POSITIVE_COLUMNS = ['qty', 'order_value', 'unit_price']
+
+
+class PandasBackend:
+    """
+    Eager single-threaded pandas implementation (reference behaviour)
+
+    Args:
+        copy_free: Clean orders without the defensive copy and the chained
+            filters: one combined validity mask, one row selection, and
+            derived columns assigned straight onto the result. Requires
+            copy-on-write (see data_processing.copy_on_write_enabled).
+    """
+
+    name = 'pandas'
+
+    @staticmethod
+    def can_scan(path: str) -> bool:
+        # order_aggregates only takes in-memory frames
+        return False
+
+    def __init__(self, copy_free: bool = False):
+        self.copy_free = copy_free
+
+    def clean_orders(self, orders_df: pd.DataFrame) -> pd.DataFrame:
+        if self.copy_free:
+            return self._clean_orders_copy_free(orders_df)
+
+        df = orders_df.copy()
+
+        # Convert date columns
+        df['order_date'] = pd.to_datetime(df['order_date'])
+
+        # Create additional date features
+        df['order_year'] = df['order_date'].dt.year
+        df['order_month_num'] = df['order_date'].dt.month
+        df['order_quarter'] = df['order_date'].dt.quarter
+        df['order_week'] = df['order_date'].dt.isocalendar().week
+        df['is_weekend'] = df['order_date'].dt.dayofweek.isin([5, 6])
+
+        # Clean price and value columns
+        for col in ORDER_NUMERIC_COLUMNS:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors='coerce')
+
+        # Remove invalid orders
+        for col in ORDER_POSITIVE_COLUMNS:
+            df = df[df[col] > 0]
+
+        # Calculate discount amount
+        if 'discount_pct' in df.columns and 'base_price' in df.columns:
+            df['discount_amount'] = df['base_price'] * (df['discount_pct'] / 100)
+
+        # Revenue per unit
+        df['revenue_per_unit'] = df['order_value'] / df['qty']
+        return df
+
+    def _clean_orders_copy_free(self, orders_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        clean_orders with a single row selection (same columns and dtypes)
+        """
+        numeric = {col: pd.to_numeric(orders_df[col], errors='coerce')
+                   for col in ORDER_NUMERIC_COLUMNS if col in orders_df.columns}
+        # NaN compares False, so missing values are dropped as in the chained filter
+        valid = np.logical_and.reduce([(numeric[col] > 0).to_numpy() for col in ORDER_POSITIVE_COLUMNS])
+
+        if valid.all():
+            # Shares every column with the caller's frame until one is replaced
+            df = orders_df.copy(deep=False)
+            rows = None
+        else:
+            rows = np.flatnonzero(valid)
+            df = orders_df.take(rows)
+
+        dates = pd.to_datetime(df['order_date'])
+        df['order_date'] = dates
+        df['order_year'] = dates.dt.year
+        df['order_month_num'] = dates.dt.month
+        df['order_quarter'] = dates.dt.quarter
+        df['order_week'] = dates.dt.isocalendar().week
+        df['is_weekend'] = dates.dt.dayofweek.isin([5, 6])
+
+        for col, values in numeric.items():
+            df[col] = values if rows is None else values.array[rows]
+
+        if 'discount_pct' in df.columns and 'base_price' in df.columns:
+            df['discount_amount'] = df['base_price'] * (df['discount_pct'] / 100)
+        df['revenue_per_unit'] = df['order_value'] / df['qty']
+        return df
+
+    def order_aggregates(self, orders: pd.DataFrame,
+                         factorized: Optional[Dict[str, Tuple[np.ndarray, pd.Index]]] = None) -> OrderAggregates:
+        return OrderAggregates.from_orders(orders, factorized)
+
+    def dataset_totals(self, df: pd.DataFrame, dataset_name: str) -> Dict[str, Any]:
+        from .validation import duplicate_count, duplicate_key_count
+
+        totals = {
+            'missing_values': df.isnull().sum().sum(),
+            'duplicate_rows': duplicate_count(df, dataset_name),
+            'duplicate_keys': duplicate_key_count(df, dataset_name),
+        }
+        if 'order_value' in df.columns:
+            totals['order_value_sum'] = df['order_value'].sum()
+        if 'order_date' in df.columns:
+            totals['order_date_range'] = (df['order_date'].min(), df['order_date'].max())
+        if 'inventory_value' in df.columns:
+            totals['inventory_value_sum'] = df['inventory_value'].sum()
+        if 'absolute_error' in df.columns:
+            totals['absolute_error_mean'] = df['absolute_error'].mean()
+        return totals
+
+
+# pandas.read_csv's default na_values; CSV scans read these as missing too
+CSV_NULL_STRINGS = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+                    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null']
+
+
+def _literal(value: str) -> str:
+    """
+    Single-quoted SQL string literal (quotes doubled)
+    """
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _csv_number_sql(name: str) -> str:
+    """
+    Text CSV field as DOUBLE like pd.to_numeric(errors='coerce'): unparsable
+    values and NaN become NULL
+    """
+    value = f"TRY_CAST(trim({_quote(name)}) AS DOUBLE)"
+    return f"CASE WHEN isnan({value}) THEN NULL ELSE {value} END"
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _valid_orders_sql() -> str:
+    """
+    SQL predicate for the cleaning filter (positive, non-missing, not NaN)
+    """
+    checks = []
+    for col in ORDER_POSITIVE_COLUMNS:
+        value = f"TRY_CAST({_quote(col)} AS DOUBLE)"
+        checks.append(f"{value} > 0 AND NOT isnan({value})")
+    return ' AND '.join(checks)
+
+
+# Columns clean_orders adds, in order
+ORDER_FEATURE_COLUMNS = ['order_year', 'order_month_num', 'order_quarter', 'order_week', 'is_weekend',
+                         'discount_amount', 'revenue_per_unit']
+
+
+def _order_features_sql(columns: List[str]) -> str:
+    """
+    SELECT list for the clean_orders date parts and derived price columns
+    """
+    numeric = {col: f"TRY_CAST({_quote(col)} AS DOUBLE)" for col in columns}
+    date = "CAST(order_date AS TIMESTAMP)"
+    features = [f"year({date}) AS order_year", f"month({date}) AS order_month_num",
+                f"quarter({date}) AS order_quarter", f"weekofyear({date}) AS order_week",
+                f"isodow({date}) >= 6 AS is_weekend"]
+    if 'discount_pct' in columns and 'base_price' in columns:
+        features.append(f"{numeric['base_price']} * ({numeric['discount_pct']} / 100) AS discount_amount")
+    features.append(f"{numeric['order_value']} / {numeric['qty']} AS revenue_per_unit")
+    return ', '.join(features)
+
+
+def _set_feature_dtypes(df: pd.DataFrame, kept: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Write the clean_orders feature columns with the pandas backend's dtypes
+    """
+    df['order_year'] = np.asarray(kept['order_year'], dtype=np.int32)
+    df['order_month_num'] = np.asarray(kept['order_month_num'], dtype=np.int32)
+    df['order_quarter'] = np.asarray(kept['order_quarter'], dtype=np.int32)
+    df['order_week'] = pd.array(np.asarray(kept['order_week'], dtype=np.uint32), dtype='UInt32')
+    df['is_weekend'] = np.asarray(kept['is_weekend'], dtype=bool)
+    if 'discount_amount' in kept:
+        df['discount_amount'] = np.asarray(kept['discount_amount'], dtype=np.float64)
+    df['revenue_per_unit'] = np.asarray(kept['revenue_per_unit'], dtype=np.float64)
+    return df
+
+
+class DuckDBBackend:
+    """
+    Embedded DuckDB engine (optional dependency: pip install duckdb)
+
+    Filters, date parts and grouped moments run inside DuckDB on every
+    thread. Results are gathered back into pandas with the reference
+    dtypes. clean_orders and order_aggregates also accept a file or
+    partitioned directory, and read_batches hands raw rows to pandas a
+    batch at a time, so a full order history is never loaded into pandas
+    before cleaning.
+
+    Args:
+        threads: Worker threads (default: DuckDB's choice, all cores)
+        memory_limit: e.g. '8GB'; DuckDB spills to disk beyond it
+        batch_rows: Rows per frame yielded by read_batches
+    """
+
+    name = 'duckdb'
+
+    def __init__(self, threads: Optional[int] = None, memory_limit: Optional[str] = None,
+                 batch_rows: int = 1_000_000):
+        self.threads = threads
+        self.memory_limit = memory_limit
+        self.batch_rows = batch_rows
+        self._connection = None
+
+    def __getstate__(self):
+        # Connections cannot be pickled; process-pool workers open their own
+        state = self.__dict__.copy()
+        state['_connection'] = None
+        return state
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            try:
+                import duckdb
+            except ImportError as e:
+                raise ImportError("The 'duckdb' backend requires the duckdb package (pip install duckdb)") from e
+            self._connection = duckdb.connect()
+            if self.threads is not None:
+                self._connection.execute(f"SET threads = {int(self.threads)}")
+            if self.memory_limit is not None:
+                self._connection.execute(f"SET memory_limit = '{self.memory_limit}'")
+        return self._connection
+
+    @staticmethod
+    def can_scan(path: str) -> bool:
+        """
+        Whether clean_orders, order_aggregates and read_batches can read
+        path directly: a CSV or Parquet file, or a directory of Parquet
+        partitions
+        """
+        if os.path.isdir(path):
+            from .storage import list_partitions
+            return bool(list_partitions(path, 'parquet'))
+        return path.endswith(('.csv', '.parquet'))
+
+    def _relation(self, source: Union[pd.DataFrame, str], name: str, columns: Optional[List[str]] = None,
+                  kinds: Optional[Dict[str, str]] = None):
+        """
+        Register a DataFrame, or build a scan over a file/directory, as a view
+
+        Only the listed columns (those present) are exposed. Handing DuckDB a
+        whole frame makes it scan every column, text columns included, even
+        when the query reads a few.
+
+        CSV files are not type-inferred: every field is read as text (with
+        pandas' missing-value strings as NULL) and the 'int'/'float' columns
+        of kinds (a DATASET_SCHEMAS entry) are converted like
+        pd.to_numeric(errors='coerce'). Like pandas, a numeric column is
+        read as integers only if every value is a whole number. 'bool'
+        columns are read as booleans; the rest stay text.
+        """
+        if isinstance(source, pd.DataFrame):
+            if columns is not None:
+                source = source[[col for col in columns if col in source.columns]]
+            self.connection.register(name, source)
+            return name
+        csv = False
+        if os.path.isdir(source):
+            # Partition columns are stored in the files (storage.write_partitioned)
+            scan = (f"read_parquet({_literal(os.path.join(source, '**', '*.parquet'))}, "
+                    f"union_by_name = true, hive_partitioning = false)")
+        elif source.endswith('.parquet'):
+            scan = f"read_parquet({_literal(source)})"
+        else:
+            csv = True
+            nulls = ', '.join(_literal(value) for value in CSV_NULL_STRINGS)
+            scan = (f"read_csv({_literal(source)}, header = true, delim = ',', quote = '\"', "
+                    f"all_varchar = true, nullstr = [{nulls}])")
+        available = list(self.connection.execute(f"DESCRIBE SELECT * FROM {scan}").fetchnumpy()['column_name'])
+        wanted = [col for col in (columns if columns is not None else available) if col in available]
+
+        expressions = {col: _quote(col) for col in wanted}
+        if csv and kinds:
+            numeric = [col for col in wanted if kinds.get(col) in ('int', 'float')]
+            for col in numeric:
+                expressions[col] = _csv_number_sql(col)
+            # pandas reads a column of whole numbers as integers whatever its kind
+            integers = numeric
+            if integers:
+                checks = ', '.join(f"coalesce(bool_and(coalesce(regexp_full_match(trim({_quote(col)}), "
+                                   f"'[+-]?[0-9]+'), false)), false)" for col in integers)
+                whole = self.connection.execute(f"SELECT {checks} FROM {scan}").fetchone()
+                for col, is_whole in zip(integers, whole):
+                    if is_whole:
+                        expressions[col] = f"CAST({expressions[col]} AS BIGINT)"
+            for col in wanted:
+                if kinds.get(col) == 'bool':
+                    expressions[col] = f"TRY_CAST(trim({_quote(col)}) AS BOOLEAN)"
+        projection = ', '.join(f"{expression} AS {_quote(col)}" for col, expression in expressions.items())
+        self.connection.execute(f"CREATE OR REPLACE TEMP VIEW {name} AS SELECT {projection} FROM {scan}")
+        return name
+
+    def _release(self, name: str, source: Union[pd.DataFrame, str]) -> None:
+        if isinstance(source, pd.DataFrame):
+            self.connection.unregister(name)
+        else:
+            self.connection.execute(f"DROP VIEW IF EXISTS {name}")
+
+    def clean_orders(self, orders_df: Union[pd.DataFrame, str]) -> pd.DataFrame:
+        """
+        Cleaning filter, date parts and derived price columns in SQL
+
+        A frame keeps its index labels, like the pandas backend. A path (see
+        can_scan) is read, typed and filtered inside DuckDB and only the
+        kept rows come back, in file order with a fresh RangeIndex.
+        """
+        if isinstance(orders_df, str):
+            return self._clean_orders_file(orders_df)
+
+        columns = [col for col in ORDER_NUMERIC_COLUMNS if col in orders_df.columns]
+        # Only the columns the stage reads are handed to DuckDB
+        source = orders_df[['order_date'] + columns].assign(_row=np.arange(len(orders_df)))
+        name = self._relation(source, 'orders_clean_source')
+        try:
+            kept = self.connection.execute(f"""
+                SELECT _row,
+                       CAST(order_date AS TIMESTAMP) AS order_date,
+                       {_order_features_sql(columns)}
+                FROM {name}
+                WHERE {_valid_orders_sql()}
+            """).fetchnumpy()
+        finally:
+            self._release(name, source)
+
+        # A plain filter keeps DuckDB's insertion order; sort only if it did not
+        rows = np.asarray(kept['_row'])
+        if len(rows) > 1 and (np.diff(rows) < 0).any():
+            order = np.argsort(rows, kind='stable')
+            kept = {col: np.asarray(values)[order] for col, values in kept.items()}
+
+        # Gather the kept rows and give the new columns the pandas dtypes
+        df = orders_df.take(kept['_row'])
+        dates = orders_df['order_date']
+        date_dtype = dates.dtype if pd.api.types.is_datetime64_any_dtype(dates.dtype) else np.dtype('datetime64[us]')
+        df['order_date'] = pd.Series(np.asarray(kept['order_date']), index=df.index).astype(date_dtype)
+        for col in columns:
+            if not pd.api.types.is_numeric_dtype(df[col].dtype):
+                df[col] = pd.to_numeric(df[col], errors='coerce')
+        return _set_feature_dtypes(df, kept)
+
+    def _clean_orders_file(self, path: str) -> pd.DataFrame:
+        name = self._relation(path, 'orders_clean_file', kinds=DATASET_SCHEMAS['orders'])
+        try:
+            described = self.connection.execute(f"DESCRIBE {name}").fetchnumpy()
+            columns = [col for col in ORDER_NUMERIC_COLUMNS if col in set(described['column_name'])]
+            # No ORDER BY needed: a filtered scan keeps the file order
+            df = self.connection.execute(f"""
+                SELECT * REPLACE (CAST(order_date AS TIMESTAMP) AS order_date),
+                       {_order_features_sql(columns)}
+                FROM {name}
+                WHERE {_valid_orders_sql()}
+            """).fetchdf()
+        finally:
+            self._release(name, path)
+        return _set_feature_dtypes(df, {col: df[col].to_numpy() for col in ORDER_FEATURE_COLUMNS if col in df})
+
+    def read_batches(self, path: str, dataset_name: str) -> Iterator[pd.DataFrame]:
+        """
+        Raw rows of a file or partitioned directory, batch_rows at a time
+
+        Columns are typed from DATASET_SCHEMAS[dataset_name] as _relation
+        reads them, so only one batch is ever held in pandas.
+        """
+        name = self._relation(path, f'{dataset_name}_batch_source', kinds=DATASET_SCHEMAS.get(dataset_name))
+        try:
+            reader = self.connection.execute(f"SELECT * FROM {name}").to_arrow_reader(self.batch_rows)
+            for batch in reader:
+                yield batch.to_pandas()
+        finally:
+            self._release(name, path)
+
+    def order_aggregates(self, orders: Union[pd.DataFrame, str],
+                         factorized: Optional[Dict[str, Tuple[np.ndarray, pd.Index]]] = None) -> OrderAggregates:
+        """
+        OrderAggregates state from grouped SQL moments
+
+        Args:
+            orders: Cleaned orders frame, or a path (CSV, Parquet or a
+                partitioned directory). Invalid orders are excluded with
+                the cleaning rules, so raw files give the same state as
+                their cleaned frame.
+            factorized: Sorted key codes and uniques per key; states are
+                aligned to them when given. For a frame, DuckDB then groups
+                the integer codes instead of the key strings.
+        """
+        columns = list(dict.fromkeys(list(ORDER_AGGREGATE_SPEC) + ORDER_POSITIVE_COLUMNS
+                                     + [col for spec in ORDER_AGGREGATE_SPEC.values() for col in spec]))
+        source, codes = orders, {}
+        if isinstance(orders, pd.DataFrame) and factorized:
+            # Missing keys (code -1) become NULL, which _moments drops
+            codes = {key: pd.array(np.where(factorized[key][0] >= 0, factorized[key][0], 0), dtype='Int32')
+                     for key in ORDER_AGGREGATE_SPEC if key in factorized}
+            for key, values in codes.items():
+                values[factorized[key][0] < 0] = pd.NA
+            source = orders[[col for col in columns if col in orders.columns and col not in codes]].assign(**codes)
+        name = self._relation(source, 'orders_aggregate_source', columns, DATASET_SCHEMAS['orders'])
+        try:
+            described = self.connection.execute(f"DESCRIBE {name}").fetchnumpy()
+            types = dict(zip(described['column_name'], described['column_type']))
+            aggregates = OrderAggregates()
+            for key, columns in ORDER_AGGREGATE_SPEC.items():
+                aggregates.states[key] = self._moments(name, key, columns, types,
+                                                       factorized.get(key) if factorized else None,
+                                                       coded=key in codes)
+        finally:
+            self._release(name, source)
+        return aggregates
+
+    def _moments(self, name: str, key: str, columns: Dict[str, bool], types: Dict[str, str],
+                 factorized: Optional[Tuple[np.ndarray, pd.Index]], coded: bool = False) -> pd.DataFrame:
+        """
+        Count, sum and squared deviations per key, like _partial_moments
+
+        Squared deviations are taken around each group's mean in a second
+        pass (not from a one-pass variance) to match the pandas backend.
+        """
+        k = _quote(key)
+        selects, m2 = [], []
+        for col, track_m2 in columns.items():
+            c = _quote(col)
+            selects += [f"COUNT({c}) AS {_quote(col + '_count')}", f"SUM({c}) AS {_quote(col + '_sum')}"]
+            if track_m2:
+                selects.append(f"AVG({c}) AS {_quote(col + '_mean')}")
+                m2.append(f"SUM((s.{c} - g.{_quote(col + '_mean')}) ^ 2) AS {_quote(col + '_m2')}")
+        query = f"""
+            WITH s AS (SELECT * FROM {name} WHERE {_valid_orders_sql()} AND {k} IS NOT NULL),
+                 g AS (SELECT {k}, {', '.join(selects)} FROM s GROUP BY {k})
+        """
+        if m2:
+            query += f"""
+                , d AS (SELECT {k}, {', '.join(m2)} FROM s JOIN g USING ({k}) GROUP BY {k})
+                SELECT g.*, d.* EXCLUDE ({k}) FROM g JOIN d USING ({k})
+            """
+        else:
+            query += "SELECT * FROM g"
+        state = self.connection.execute(query).fetchdf().set_index(key)
+
+        ordered = []
+        for col, track_m2 in columns.items():
+            state[f'{col}_count'] = state[f'{col}_count'].astype(np.int64)
+            integer = types.get(col, '').upper() in ('TINYINT', 'SMALLINT', 'INTEGER', 'BIGINT', 'HUGEINT',
+                                                     'UTINYINT', 'USMALLINT', 'UINTEGER', 'UBIGINT')
+            state[f'{col}_sum'] = state[f'{col}_sum'].astype(np.int64 if integer else np.float64)
+            ordered += [f'{col}_count', f'{col}_sum'] + ([f'{col}_m2'] if track_m2 else [])
+        state = state[ordered]
+
+        if factorized is not None:
+            uniques = factorized[1]
+            # A coded key column holds positions into uniques
+            state = state.reindex(np.arange(len(uniques)) if coded else uniques)
+            state.index = uniques
+        else:
+            state = state.sort_index()
+        return state
+
+    def dataset_totals(self, df: pd.DataFrame, dataset_name: str) -> Dict[str, Any]:
+        from .validation import duplicate_count, duplicate_key_count
+
+        # Null counts and duplicates come from pandas (null masks and a key
+        # hash); DuckDB only reduces the few measure columns
+        totals = {'missing_values': int(df.isnull().sum().sum()), 'duplicate_rows': duplicate_count(df, dataset_name),
+                  'duplicate_keys': duplicate_key_count(df, dataset_name)}
+        measures = [col for col in ('order_value', 'order_date', 'inventory_value', 'absolute_error')
+                    if col in df.columns]
+        if not measures:
+            return totals
+
+        name = self._relation(df, 'dataset_totals_source', measures)
+        try:
+            selects = []
+            if 'order_value' in df.columns:
+                selects.append('SUM(order_value) AS order_value_sum')
+            if 'order_date' in df.columns:
+                selects += ['MIN(order_date) AS order_date_min', 'MAX(order_date) AS order_date_max']
+            if 'inventory_value' in df.columns:
+                selects.append('SUM(inventory_value) AS inventory_value_sum')
+            if 'absolute_error' in df.columns:
+                selects.append('AVG(absolute_error) AS absolute_error_mean')
+            row = self.connection.execute(f"SELECT {', '.join(selects)} FROM {name}").fetchdf().iloc[0]
+        finally:
+            self._release(name, df)
+
+        for col in ('order_value_sum', 'inventory_value_sum', 'absolute_error_mean'):
+            if col in row.index:
+                totals[col] = row[col]
+        if 'order_date_min' in row.index:
+            totals['order_date_range'] = (pd.Timestamp(row['order_date_min']), pd.Timestamp(row['order_date_max']))
+        return totals
+
+
+def get_backend(backend: Union[None, str, PandasBackend, DuckDBBackend] = None, copy_free: bool = False):
+    """
+    Backend instance for None / 'pandas' (default) / 'duckdb' or an instance
+
+    copy_free only affects a pandas backend created here.
+    """
+    if backend is None or backend == 'pandas':
+        return PandasBackend(copy_free=copy_free)
+    if backend == 'duckdb':
+        return DuckDBBackend()
+    if hasattr(backend, 'clean_orders') and hasattr(backend, 'order_aggregates'):
+        return backend
+    raise ValueError(f"backend must be one of {COMPUTE_BACKENDS} or a backend instance")
@@ -0,0 +1,247 @@
+"""
+S&OP Benchmark Module
+=====================
+
+Throughput and memory benchmarks for the S&OP pipeline on synthetic data.
+
+Functions:
+- run_benchmark: time process_sop_data, engineer_features, detect_outliers
+  and create_sop_dashboard at several data scales
+- measure_import_time: cold-start import cost of package entry points
+- Baseline storage and regression comparison
+
+Usage:
+    python -m src.benchmark --scales 10 100 --baseline benchmark_baseline.json
+    python -m src.benchmark --imports
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from .data_processing import SOpDataProcessor, detect_outliers, process_sop_data
+from .profiling import StageProfiler
+from .synthetic_data import generate_sop_datasets, write_sop_datasets
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_STAGES = ['process_sop_data', 'engineer_features', 'detect_outliers', 'create_sop_dashboard']
+
+# Entry points timed by measure_import_time; data-only ones must not pull in plotting
+IMPORT_TARGETS = ['src', 'src.data_processing', 'src.storage', 'src.kpi', 'src.visualization']
+PLOTTING_MODULES = ['matplotlib', 'seaborn', 'plotly']
+
+_IMPORT_PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'import_s': elapsed, 'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+'''
+
+
+def _benchmark_scale(scale: float, stages: List[str], seed: int, work_dir: str,
+                     trace_memory: bool) -> List[Dict[str, float]]:
+    datasets = generate_sop_datasets(scale=scale, seed=seed)
+    file_paths = write_sop_datasets(datasets, os.path.join(work_dir, f"scale_{scale:g}"))
+    n_orders = len(datasets['orders'])
+    profiler = StageProfiler(trace_memory=trace_memory)
+    processor = SOpDataProcessor()
+    cleaned = None
+    enhanced = None
+
+    def clean_all() -> Dict[str, pd.DataFrame]:
+        return {
+            'orders': processor.clean_orders_data(datasets['orders']),
+            'inventory': processor.clean_inventory_data(datasets['inventory']),
+            'forecasts': processor.clean_forecasts_data(datasets['forecasts']),
+            'products': processor.clean_products_data(datasets['products']),
+        }
+
+    if 'process_sop_data' in stages:
+        with profiler.stage('process_sop_data', rows_in=n_orders) as frame, \
+                contextlib.redirect_stdout(io.StringIO()):
+            enhanced = process_sop_data(file_paths)
+            frame['rows_out'] = len(enhanced['orders'])
+
+    if 'engineer_features' in stages:
+        cleaned = clean_all()
+        with profiler.stage('engineer_features', rows_in=n_orders) as frame:
+            enhanced = processor.engineer_features(cleaned)
+            frame['rows_out'] = len(enhanced['orders'])
+
+    if enhanced is None and ({'detect_outliers', 'create_sop_dashboard'} & set(stages)):
+        enhanced = processor.engineer_features(cleaned or clean_all())
+
+    if 'detect_outliers' in stages:
+        with profiler.stage('detect_outliers', rows_in=n_orders) as frame:
+            frame['rows_out'] = int(detect_outliers(enhanced['orders'], 'order_value').sum())
+
+    if 'create_sop_dashboard' in stages:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        from .visualization import create_sop_dashboard
+
+        with profiler.stage('create_sop_dashboard', rows_in=n_orders):
+            fig = create_sop_dashboard(enhanced)
+            fig.canvas.draw()
+        plt.close(fig)
+
+    records = []
+    for record in profiler.records:
+        records.append({
+            'scale': scale,
+            'stage': record['stage'],
+            'rows': record['rows_in'],
+            'wall_s': record['wall_s'],
+            'cpu_s': record['cpu_s'],
+            'rows_per_s': record['rows_in'] / record['wall_s'] if record['wall_s'] > 0 else float('nan'),
+            'mem_peak_mb': record['mem_peak_mb'],
+            'peak_rss_mb': record['peak_rss_mb'],
+        })
+    return records
+
+
+def run_benchmark(scales: Iterable[float] = (1, 10), stages: Optional[List[str]] = None, seed: int = 42,
+                  work_dir: Optional[str] = None, trace_memory: bool = True) -> pd.DataFrame:
+    """
+    Benchmark pipeline stages on synthetic data at each scale
+
+    Args:
+        scales: Multiples of the shipped sample (1 = 4,798 orders, 30 SKUs)
+        stages: Subset of BENCHMARK_STAGES (default: all)
+        seed: Seed for the synthetic data
+        work_dir: Where the synthetic CSVs are written (default: a temp dir)
+        trace_memory: Measure peak allocation with tracemalloc
+
+    Returns:
+        One row per scale x stage with throughput (rows_per_s) and memory
+    """
+    stages = stages or BENCHMARK_STAGES
+    unknown = set(stages) - set(BENCHMARK_STAGES)
+    if unknown:
+        raise ValueError(f"Unknown benchmark stages: {sorted(unknown)}")
+
+    records = []
+    with contextlib.ExitStack() as stack:
+        if work_dir is None:
+            work_dir = stack.enter_context(tempfile.TemporaryDirectory())
+        for scale in scales:
+            logger.info(f"🏁 Benchmarking scale {scale:g}x")
+            records.extend(_benchmark_scale(scale, stages, seed, work_dir, trace_memory))
+
+    return pd.DataFrame(records)
+
+
+def measure_import_time(modules: Iterable[str] = IMPORT_TARGETS, repeats: int = 3) -> pd.DataFrame:
+    """
+    Time a cold import of each module in a fresh interpreter
+
+    Args:
+        modules: Dotted module names, importable from the repository root
+        repeats: Interpreters started per module; the fastest run is kept
+
+    Returns:
+        One row per module with import_s and the plotting libraries
+        (PLOTTING_MODULES) the import loaded
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    records = []
+    for module in modules:
+        runs = []
+        for _ in range(repeats):
+            probe = _IMPORT_PROBE.format(module=module, heavy=PLOTTING_MODULES)
+            output = subprocess.run([sys.executable, '-c', probe], cwd=root, capture_output=True,
+                                    text=True, check=True).stdout
+            runs.append(json.loads(output.strip().splitlines()[-1]))
+        fastest = min(runs, key=lambda run: run['import_s'])
+        records.append({'module': module, 'import_s': fastest['import_s'],
+                        'plotting_loaded': ','.join(fastest['loaded'])})
+        logger.info(f"📦 import {module}: {fastest['import_s'] * 1000:.0f} ms")
+    return pd.DataFrame(records)
+
+
+def save_baseline(results: pd.DataFrame, path: str) -> None:
+    """
+    Store benchmark results as the reference for compare_to_baseline
+    """
+    with open(path, 'w') as handle:
+        json.dump(results.to_dict(orient='records'), handle, indent=2)
+    logger.info(f"💾 Benchmark baseline saved: {path}")
+
+
+def compare_to_baseline(results: pd.DataFrame, baseline_path: str, tolerance: float = 0.25) -> pd.DataFrame:
+    """
+    Compare results with a stored baseline
+
+    Args:
+        results: Output of run_benchmark
+        baseline_path: JSON written by save_baseline
+        tolerance: Allowed relative slowdown / memory growth before a stage
+            is flagged as a regression
+
+    Returns:
+        Results joined to the baseline with time/memory ratios and a
+        'regression' flag
+    """
+    with open(baseline_path) as handle:
+        baseline = pd.DataFrame(json.load(handle))
+
+    comparison = results.merge(baseline[['scale', 'stage', 'wall_s', 'mem_peak_mb']],
+                               on=['scale', 'stage'], how='left', suffixes=('', '_baseline'))
+    comparison['time_ratio'] = comparison['wall_s'] / comparison['wall_s_baseline']
+    comparison['memory_ratio'] = comparison['mem_peak_mb'] / comparison['mem_peak_mb_baseline']
+    comparison['regression'] = ((comparison['time_ratio'] > 1 + tolerance) |
+                                (comparison['memory_ratio'] > 1 + tolerance))
+
+    regressions = comparison[comparison['regression']]
+    for _, row in regressions.iterrows():
+        logger.warning(f"⚠️ Regression in {row['stage']} at {row['scale']:g}x: "
+                       f"time x{row['time_ratio']:.2f}, memory x{row['memory_ratio']:.2f}")
+    return comparison
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the S&OP pipeline on synthetic data')
+    parser.add_argument('--scales', type=float, nargs='+', default=[1, 10])
+    parser.add_argument('--stages', nargs='+', choices=BENCHMARK_STAGES)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--baseline', help='Baseline JSON to compare against')
+    parser.add_argument('--update-baseline', action='store_true', help='Write results to --baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--no-trace-memory', action='store_true')
+    parser.add_argument('--imports', action='store_true', help='Only measure package import time')
+    args = parser.parse_args(argv)
+
+    if args.imports:
+        print(measure_import_time().round(4).to_string(index=False))
+        return 0
+
+    if args.baseline and not args.update_baseline and not os.path.exists(args.baseline):
+        logger.error(f"❌ Baseline not found: {args.baseline} (create it with --update-baseline)")
+        return 2
+
+    results = run_benchmark(args.scales, args.stages, seed=args.seed, trace_memory=not args.no_trace_memory)
+    print(results.round(4).to_string(index=False))
+
+    if args.baseline and args.update_baseline:
+        save_baseline(results, args.baseline)
+    elif args.baseline:
+        comparison = compare_to_baseline(results, args.baseline, args.tolerance)
+        print(comparison[['scale', 'stage', 'time_ratio', 'memory_ratio', 'regression']].round(3).to_string(index=False))
+        return 1 if comparison['regression'].any() else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,355 @@
+"""
+S&OP Connectors Module
+======================
+
+Async source connectors that extract the S&OP tables from a database.
+
+The tables are extracted concurrently over a bounded connection pool, so
+an extract takes about as long as its slowest query rather than the sum
+of all of them. Results are paged as Arrow record batches and assembled
+into schema-typed DataFrames (the same dtypes as the columnar CSV cache).
+Transient failures are retried with exponential backoff.
+
+Connector drivers are blocking (sqlite3, google-cloud-bigquery); each
+call runs in a worker thread so the event loop can keep the other
+queries going.
+
+Functions:
+- SourceConnector: pooling, paging, retries and concurrent extraction
+- SQLiteConnector: local/offline stand-in (from_csv builds a database)
+- BigQueryConnector: Google BigQuery tables
+- extract_datasets: blocking entry point, also usable inside a running
+  event loop (e.g. Jupyter)
+"""
+
+import asyncio
+import logging
+import random
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+
+from .storage import apply_schema, read_csv_with_schema
+
+logger = logging.getLogger(__name__)
+
+# S&OP dataset name -> source table name
+SOP_TABLES = {'orders': 'orders', 'inventory': 'inventory', 'forecasts': 'forecasts', 'products': 'products'}
+
+
+class ConnectionPool:
+    """
+    Bounded pool of driver connections for one event loop
+
+    Connections are opened on demand (up to size) and reused. A connection
+    that raised an error is closed instead of being returned to the pool.
+    """
+
+    def __init__(self, connect: Callable[[], Any], close: Callable[[Any], None], size: int):
+        self._connect = connect
+        self._close = close
+        self._semaphore = asyncio.Semaphore(size)
+        self._idle: List[Any] = []
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[Any]:
+        async with self._semaphore:
+            conn = self._idle.pop() if self._idle else await asyncio.to_thread(self._connect)
+            try:
+                yield conn
+            except BaseException:
+                await asyncio.to_thread(self._close, conn)
+                raise
+            self._idle.append(conn)
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for conn in idle:
+            await asyncio.to_thread(self._close, conn)
+
+
+class SourceConnector:
+    """
+    Base class for async table extraction
+
+    Subclasses implement the blocking driver calls:
+
+    - _connect() -> connection
+    - _close(connection)
+    - _execute(connection, table, columns, batch_size) -> (pa.Schema, cursor)
+    - _fetch_page(cursor, schema, batch_size) -> pa.RecordBatch, or None when done
+
+    and list their transient driver errors in retryable_errors. When an
+    error class mixes transient and permanent failures, also override
+    _is_transient(error) to tell them apart.
+
+    Args:
+        pool_size: Maximum concurrent connections (and queries)
+        batch_size: Rows per fetched page
+        retries: Retries per table after the first attempt
+        backoff: First retry delay in seconds; doubles on every retry
+        max_backoff: Upper bound for a single retry delay
+    """
+
+    retryable_errors: Tuple[type, ...] = (ConnectionError, TimeoutError)
+
+    def __init__(self, pool_size: int = 4, batch_size: int = 50_000, retries: int = 3,
+                 backoff: float = 0.5, max_backoff: float = 8.0):
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        self.pool_size = pool_size
+        self.batch_size = batch_size
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        # Seconds per dataset (and 'total') of the last extract
+        self.last_timings: Dict[str, float] = {}
+
+    def _connect(self) -> Any:
+        raise NotImplementedError
+
+    def _close(self, connection: Any) -> None:
+        connection.close()
+
+    def _execute(self, connection: Any, table: str, columns: Optional[List[str]],
+                 batch_size: int) -> Tuple[pa.Schema, Any]:
+        raise NotImplementedError
+
+    def _fetch_page(self, cursor: Any, schema: pa.Schema, batch_size: int) -> Optional[pa.RecordBatch]:
+        raise NotImplementedError
+
+    def _is_transient(self, error: Exception) -> bool:
+        """
+        Whether a retryable_errors instance is worth retrying
+        """
+        return True
+
+    def pool(self) -> ConnectionPool:
+        return ConnectionPool(self._connect, self._close, self.pool_size)
+
+    async def stream_batches(self, pool: ConnectionPool, table: str,
+                             columns: Optional[List[str]] = None) -> AsyncIterator[pa.RecordBatch]:
+        """
+        Record batches of a table, one page at a time (no retries)
+
+        The first item is an empty batch carrying the schema, so empty
+        tables still produce their columns.
+        """
+        async with pool.connection() as conn:
+            schema, cursor = await asyncio.to_thread(self._execute, conn, table, columns, self.batch_size)
+            yield pa.RecordBatch.from_pylist([], schema=schema)
+            while True:
+                batch = await asyncio.to_thread(self._fetch_page, cursor, schema, self.batch_size)
+                if batch is None:
+                    break
+                yield batch
+
+    async def extract_table(self, pool: ConnectionPool, table: str,
+                            columns: Optional[List[str]] = None) -> pa.Table:
+        """
+        Full table as Arrow, retrying transient errors with backoff
+
+        A retry restarts the query; batches from the failed attempt are
+        discarded. Every page is held until the table is complete, and
+        extract then converts it to pandas in one go, so the peak is about
+        the Arrow table plus its DataFrame. For tables that do not fit,
+        consume stream_batches page by page instead.
+        """
+        for attempt in range(self.retries + 1):
+            try:
+                batches = [batch async for batch in self.stream_batches(pool, table, columns)]
+                return pa.Table.from_batches(batches)
+            except self.retryable_errors as e:
+                if not self._is_transient(e):
+                    logger.error(f"❌ Extract of {table} failed: {e}")
+                    raise
+                if attempt == self.retries:
+                    logger.error(f"❌ Extract of {table} failed after {attempt + 1} attempts: {e}")
+                    raise
+                delay = min(self.backoff * 2 ** attempt, self.max_backoff) * random.uniform(0.5, 1.0)
+                logger.warning(f"⚠️ Extract of {table} failed ({e}); retry {attempt + 1}/{self.retries} "
+                               f"in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    async def extract(self, tables: Optional[Dict[str, str]] = None,
+                      columns: Optional[Dict[str, List[str]]] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Extract several tables concurrently into schema-typed DataFrames
+
+        Args:
+            tables: Dataset name -> source table (default: SOP_TABLES)
+            columns: Dataset name -> columns to select (default: all)
+
+        Returns:
+            Dataset name -> DataFrame, with DATASET_SCHEMAS dtypes applied
+        """
+        tables = dict(tables or SOP_TABLES)
+        columns = columns or {}
+        pool = self.pool()
+        timings = {}
+
+        async def extract_one(name: str, table: str) -> pd.DataFrame:
+            start = time.perf_counter()
+            arrow_table = await self.extract_table(pool, table, columns.get(name))
+            df = apply_schema(arrow_table.to_pandas(), name)
+            timings[name] = time.perf_counter() - start
+            logger.info(f"✅ Extracted {name}: {len(df):,} records in {timings[name]:.2f}s")
+            return df
+
+        start = time.perf_counter()
+        try:
+            frames = await asyncio.gather(*(extract_one(name, table) for name, table in tables.items()))
+        finally:
+            await pool.close()
+        elapsed = time.perf_counter() - start
+        logger.info(f"⏱️ Extracted {len(tables)} tables in {elapsed:.2f}s "
+                    f"(queries {sum(timings.values()):.2f}s in total, slowest {max(timings.values(), default=0):.2f}s)")
+        self.last_timings = dict(timings, total=elapsed)
+        return dict(zip(tables, frames))
+
+
+def _sqlite_arrow_type(declared: str) -> pa.DataType:
+    """
+    Arrow type for a SQLite declared column type (SQLite affinity rules)
+    """
+    declared = declared.upper()
+    if 'INT' in declared:
+        return pa.int64()
+    if any(name in declared for name in ('REAL', 'FLOA', 'DOUB')):
+        return pa.float64()
+    return pa.string()
+
+
+class SQLiteConnector(SourceConnector):
+    """
+    File-backed SQLite source, the local stand-in for the warehouse
+
+    Args:
+        database: Path of the SQLite database file
+        **kwargs: SourceConnector options (pool_size, batch_size, retries, ...)
+    """
+
+    retryable_errors = (sqlite3.OperationalError,)
+    # OperationalError also covers permanent failures (no such column,
+    # syntax errors, unreadable file); only lock contention is retried
+    transient_messages = ('locked', 'busy')
+
+    def __init__(self, database: str, **kwargs):
+        super().__init__(**kwargs)
+        self.database = database
+
+    @classmethod
+    def from_csv(cls, file_paths: Dict[str, str], database: str, **kwargs) -> 'SQLiteConnector':
+        """
+        Build (or replace) a database with one table per S&OP CSV
+
+        Args:
+            file_paths: Dataset name -> CSV path, as for load_datasets
+            database: SQLite file to write
+        """
+        with sqlite3.connect(database) as conn:
+            for name, file_path in file_paths.items():
+                read_csv_with_schema(name, file_path).to_sql(SOP_TABLES.get(name, name), conn,
+                                                             if_exists='replace', index=False)
+        conn.close()
+        logger.info(f"💾 Loaded {len(file_paths)} tables into {database}")
+        return cls(database, **kwargs)
+
+    def _is_transient(self, error: Exception) -> bool:
+        message = str(error).lower()
+        return any(text in message for text in self.transient_messages)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connections move between worker threads, but one task uses each at a time
+        return sqlite3.connect(self.database, check_same_thread=False)
+
+    def _execute(self, connection: sqlite3.Connection, table: str, columns: Optional[List[str]],
+                 batch_size: int) -> Tuple[pa.Schema, sqlite3.Cursor]:
+        declared = {row[1]: row[2] for row in connection.execute(f'PRAGMA table_info("{table}")')}
+        if not declared:
+            raise KeyError(f"Table not found: {table}")
+        names = list(columns) if columns is not None else list(declared)
+        schema = pa.schema([(name, _sqlite_arrow_type(declared[name])) for name in names])
+        select = ', '.join(f'"{name}"' for name in names)
+        return schema, connection.execute(f'SELECT {select} FROM "{table}"')
+
+    def _fetch_page(self, cursor: sqlite3.Cursor, schema: pa.Schema, batch_size: int) -> Optional[pa.RecordBatch]:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return None
+        values = list(zip(*rows))
+        return pa.RecordBatch.from_arrays([pa.array(column, type=field.type) for column, field in zip(values, schema)],
+                                          schema=schema)
+
+
+# BigQuery column type -> Arrow type
+BIGQUERY_ARROW_TYPES = {
+    'INTEGER': pa.int64(), 'INT64': pa.int64(),
+    'FLOAT': pa.float64(), 'FLOAT64': pa.float64(), 'NUMERIC': pa.float64(), 'BIGNUMERIC': pa.float64(),
+    'BOOLEAN': pa.bool_(), 'BOOL': pa.bool_(),
+    'DATE': pa.date32(), 'DATETIME': pa.timestamp('us'), 'TIMESTAMP': pa.timestamp('us', tz='UTC'),
+}
+
+
+class BigQueryConnector(SourceConnector):
+    """
+    Google BigQuery source (requires google-cloud-bigquery)
+
+    Args:
+        project: GCP project that runs the queries
+        dataset: BigQuery dataset holding the S&OP tables
+        credentials: google.auth credentials (default: application default)
+        **kwargs: SourceConnector options (pool_size, batch_size, retries, ...)
+    """
+
+    def __init__(self, project: str, dataset: str, credentials: Any = None, **kwargs):
+        super().__init__(**kwargs)
+        self.project = project
+        self.dataset = dataset
+        self.credentials = credentials
+        try:
+            from google.api_core import exceptions
+        except ImportError as e:
+            raise ImportError("BigQueryConnector requires google-cloud-bigquery") from e
+        self.retryable_errors = (exceptions.ServerError, exceptions.TooManyRequests, ConnectionError, TimeoutError)
+
+    def _connect(self) -> Any:
+        from google.cloud import bigquery
+        return bigquery.Client(project=self.project, credentials=self.credentials)
+
+    def _execute(self, connection: Any, table: str, columns: Optional[List[str]],
+                 batch_size: int) -> Tuple[pa.Schema, Any]:
+        select = ', '.join(f'`{name}`' for name in columns) if columns is not None else '*'
+        rows = connection.query(f"SELECT {select} FROM `{self.project}.{self.dataset}.{table}`").result(
+            page_size=batch_size)
+        schema = pa.schema([(field.name, BIGQUERY_ARROW_TYPES.get(field.field_type, pa.string()))
+                            for field in rows.schema])
+        return schema, iter(rows.pages)
+
+    def _fetch_page(self, cursor: Any, schema: pa.Schema, batch_size: int) -> Optional[pa.RecordBatch]:
+        page = next(cursor, None)
+        if page is None:
+            return None
+        return pa.RecordBatch.from_pylist([dict(row.items()) for row in page], schema=schema)
+
+
+def extract_datasets(connector: SourceConnector, tables: Optional[Dict[str, str]] = None,
+                     columns: Optional[Dict[str, List[str]]] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Blocking wrapper around connector.extract
+
+    Inside an already running event loop (Jupyter) the extract runs on a
+    helper thread with its own loop.
+    """
+    coroutine = connector.extract(tables, columns)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coroutine).result()
@@ -14,139 +14,712 @@ Functions:
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterator, List, Sequence, Tuple, Optional, Union
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+import hashlib
+import json
 import logging
+import os
+import tempfile
+import time
+from contextlib import nullcontext
 from datetime import datetime, timedelta
 import warnings
 
+from .profiling import StageProfiler, profile_stage
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Per-key order statistics used by engineer_features. Columns flagged True
+# also carry a sum of squared deviations so a std can be rebuilt.
+ORDER_AGGREGATE_SPEC = {
+    'customer_type': {'order_value': True, 'discount_pct': False},
+    'product_id': {'order_value': False, 'qty': False},
+}
+
+# Column types of the raw S&OP extracts (see Documentation/data_dictionary.md).
+# Kinds: 'text', 'int', 'float', 'bool', 'datetime'.
+DATASET_SCHEMAS = {
+    'orders': {
+        'order_id': 'int', 'product_id': 'text', 'order_date': 'datetime', 'qty': 'int',
+        'region': 'text', 'customer_type': 'text', 'base_price': 'float', 'unit_price': 'float',
+        'discount_pct': 'float', 'order_value': 'float', 'order_month': 'text', 'category': 'text',
+        'is_on_sale': 'bool', 'sale_event': 'text', 'day_of_week': 'text', 'calc_order_value': 'float',
+    },
+    'inventory': {
+        'product_id': 'text', 'available_qty': 'int', 'warehouse': 'text', 'stock_status': 'text',
+        'unit_cost': 'float', 'inventory_value': 'float', 'total_demand': 'int', 'turnover_ratio': 'float',
+    },
+    'forecasts': {
+        'product_id': 'text', 'forecast_month': 'datetime', 'forecast_qty': 'int', 'actual_demand': 'int',
+        'variance_pct': 'float', 'forecast_type': 'text', 'confidence_level': 'text',
+    },
+    'products': {
+        'product_id': 'text', 'product_name': 'text', 'category': 'text', 'base_price': 'float',
+        'promotional_tier': 'text', 'demand_volatility': 'text', 'sales_events_count': 'int',
+    },
+}
+
+# Valid values enforced by the clean_* methods (anything else becomes 'Unknown')
+VALID_STOCK_STATUSES = ['Excess', 'Adequate', 'Low']
+VALID_FORECAST_TYPES = ['Manual', 'Statistical', 'ML_Model']
+VALID_CONFIDENCE_LEVELS = ['Low', 'Medium', 'High']
+VALID_TIERS = ['High', 'Medium', 'Low']
+
+# Low-cardinality text columns converted to categoricals in memory-optimized
+# mode. None means the vocabulary is taken from the observed values.
+COMPACT_CATEGORIES = {
+    'orders': {'region': None, 'customer_type': None, 'category': None, 'sale_event': None,
+               'day_of_week': None, 'order_month': None},
+    'inventory': {'warehouse': None, 'stock_status': VALID_STOCK_STATUSES + ['Unknown']},
+    'forecasts': {'forecast_type': VALID_FORECAST_TYPES + ['Unknown'],
+                  'confidence_level': VALID_CONFIDENCE_LEVELS + ['Unknown']},
+    'products': {'category': None, 'promotional_tier': VALID_TIERS + ['Unknown'],
+                 'demand_volatility': VALID_TIERS + ['Unknown']},
+}
+
+# Text columns in Orders.csv. Pinned when streaming so a chunk where a column
+# is entirely empty is not inferred as float.
+ORDERS_TEXT_COLUMNS = [col for col, kind in DATASET_SCHEMAS['orders'].items() if kind == 'text']
+
+def copy_on_write_enabled() -> bool:
+    """
+    Whether pandas copy-on-write is active (always from pandas 3; opt-in
+    via pd.options.mode.copy_on_write = True on pandas 2)
+    """
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    return getattr(pd.options.mode, 'copy_on_write', False) is True
+
+def _factorize_key(values: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    """
+    Sorted integer codes for a key column (-1 for missing keys)
+    """
+    codes, uniques = pd.factorize(values, sort=True)
+    return codes, pd.Index(uniques, name=values.name)
+
+def _partial_moments(df: pd.DataFrame, key: str, columns: Dict[str, bool],
+                     factorized: Optional[Tuple[np.ndarray, pd.Index]] = None) -> pd.DataFrame:
+    """
+    Count, sum and (optionally) sum of squared deviations per key
+    
+    All columns are reduced with np.bincount over one set of factorized key
+    codes, so no groupby object or intermediate frame is built. Rows are in
+    sorted key order, like a groupby.
+    """
+    codes, uniques = factorized if factorized is not None else _factorize_key(df[key])
+    n_groups = len(uniques)
+    parts = {}
+    for col, track_m2 in columns.items():
+        values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = (codes >= 0) & ~np.isnan(values)
+        group, x = codes[valid], values[valid]
+        
+        counts = np.bincount(group, minlength=n_groups)
+        sums = np.bincount(group, weights=x, minlength=n_groups)
+        if pd.api.types.is_integer_dtype(df[col].dtype):
+            sums = np.rint(sums).astype(np.int64)
+        parts[f'{col}_count'] = counts
+        parts[f'{col}_sum'] = sums
+        if track_m2:
+            means = np.divide(sums, counts, out=np.zeros(n_groups), where=counts > 0)
+            parts[f'{col}_m2'] = np.bincount(group, weights=(x - means[group]) ** 2, minlength=n_groups)
+    return pd.DataFrame(parts, index=uniques)
+
+def _attach_stats(df: pd.DataFrame, stats: pd.DataFrame, positions: np.ndarray) -> None:
+    """
+    Add stats columns to df by row position instead of merging
+    
+    positions[i] is the stats row for df row i (-1 if none). As with a left
+    merge, integer columns become float when some rows have no match.
+    """
+    matched = positions >= 0
+    all_matched = matched.all()
+    for col in stats.columns:
+        values = stats[col].to_numpy()
+        if all_matched:
+            df[col] = values[positions]
+        else:
+            column = values.astype(np.float64)[positions]
+            column[~matched] = np.nan
+            df[col] = column
+
+def _merge_moments(states: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Merge partial moment frames sharing the same key index
+
+    Squared deviations are combined with the parallel variance formula, so the
+    result is identical to computing the moments over the concatenated rows.
+    """
+    combined = pd.concat(states)
+    grouped = combined.groupby(level=0)
+    merged = grouped.sum()
+    
+    for m2_col in [c for c in combined.columns if c.endswith('_m2')]:
+        base = m2_col[:-len('_m2')]
+        counts = combined[f'{base}_count']
+        part_means = (combined[f'{base}_sum'] / counts.where(counts > 0)).to_numpy()
+        overall = (merged[f'{base}_sum'] / merged[f'{base}_count']).reindex(combined.index).to_numpy()
+        shift = pd.Series(np.nan_to_num(counts.to_numpy() * (part_means - overall) ** 2),
+                          index=combined.index)
+        merged[m2_col] = merged[m2_col] + shift.groupby(level=0).sum()
+    
+    return merged
+
+class OrderAggregates:
+    """
+    Mergeable per-key order statistics for engineer_features
+    
+    Keeps counts, sums and squared deviations for every key in
+    ORDER_AGGREGATE_SPEC, so statistics built chunk by chunk match a single
+    groupby over the full order history. The state can be saved and folded
+    forward with new order batches (see SOpDataProcessor.process_order_increment).
+    """
+    
+    def __init__(self):
+        self.states: Dict[str, pd.DataFrame] = {}
+        self.touched_keys: Dict[str, pd.Index] = {}
+        self.batch_ids: List[str] = []
+        
+    def _fold(self, key: str, partial: pd.DataFrame) -> None:
+        # Only rows for keys present in the partial are re-merged
+        self.touched_keys[key] = partial.index
+        state = self.states.get(key)
+        if state is None:
+            self.states[key] = partial
+            return
+        existing = state.index.intersection(partial.index)
+        merged = _merge_moments([state.loc[existing], partial]) if len(existing) else partial
+        self.states[key] = pd.concat([state.drop(existing), merged]).sort_index()
+        
+    def update(self, orders_df: pd.DataFrame) -> 'OrderAggregates':
+        """
+        Fold a batch of cleaned orders into the running state
+        """
+        for key, columns in ORDER_AGGREGATE_SPEC.items():
+            self._fold(key, _partial_moments(orders_df, key, columns))
+        return self
+    
+    def merge(self, other: 'OrderAggregates') -> 'OrderAggregates':
+        """
+        Merge another partial aggregate (e.g. from a different chunk) into this one
+        """
+        for key, state in other.states.items():
+            self._fold(key, state)
+        return self
+    
+    @classmethod
+    def from_orders(cls, orders_df: pd.DataFrame,
+                    factorized: Optional[Dict[str, Tuple[np.ndarray, pd.Index]]] = None) -> 'OrderAggregates':
+        """
+        Build aggregates from a full orders frame
+        
+        Args:
+            orders_df: Cleaned orders
+            factorized: Pre-computed (codes, uniques) per key, reused if given
+        """
+        if not factorized:
+            return cls().update(orders_df)
+        aggregates = cls()
+        for key, columns in ORDER_AGGREGATE_SPEC.items():
+            aggregates._fold(key, _partial_moments(orders_df, key, columns, factorized.get(key)))
+        return aggregates
+    
+    def save(self, state_dir: str) -> None:
+        """
+        Persist the aggregate state as one Parquet file per key
+        """
+        from .storage import write_columnar
+        
+        os.makedirs(state_dir, exist_ok=True)
+        for key, state in self.states.items():
+            write_columnar(state.reset_index(), os.path.join(state_dir, f"{key}_state.parquet"))
+        with open(os.path.join(state_dir, 'aggregates.json'), 'w') as handle:
+            json.dump({'keys': list(self.states), 'batch_ids': self.batch_ids}, handle)
+    
+    @classmethod
+    def load(cls, state_dir: str) -> 'OrderAggregates':
+        """
+        Load state written by save(); an empty aggregate if none exists yet
+        """
+        from .storage import read_columnar
+        
+        aggregates = cls()
+        manifest_path = os.path.join(state_dir, 'aggregates.json')
+        if not os.path.exists(manifest_path):
+            return aggregates
+        with open(manifest_path) as handle:
+            manifest = json.load(handle)
+        for key in manifest['keys']:
+            state = read_columnar(os.path.join(state_dir, f"{key}_state.parquet"))
+            aggregates.states[key] = state.set_index(key)
+        aggregates.batch_ids = manifest.get('batch_ids', [])
+        return aggregates
+    
+    def customer_stats(self, keys: Optional[Sequence] = None) -> pd.DataFrame:
+        """
+        Customer behaviour features, same layout as the engineer_features groupby
+        
+        Args:
+            keys: Restrict to these customer types (default: all)
+        """
+        state = self.states['customer_type']
+        if keys is not None:
+            state = state.loc[keys]
+        counts = state['order_value_count']
+        stats = pd.DataFrame({
+            'avg_order_value': state['order_value_sum'] / counts,
+            'order_value_std': np.sqrt(state['order_value_m2'] / (counts - 1).where(counts > 1)),
+            'order_frequency': counts,
+            'avg_discount': state['discount_pct_sum'] / state['discount_pct_count'],
+        }).round(2)
+        return stats.reset_index()
+    
+    def product_stats(self, keys: Optional[Sequence] = None) -> pd.DataFrame:
+        """
+        Product performance features, same layout as the engineer_features groupby
+        
+        Args:
+            keys: Restrict to these product ids (default: all)
+        """
+        state = self.states['product_id']
+        if keys is not None:
+            state = state.loc[keys]
+        stats = pd.DataFrame({
+            'total_product_revenue': state['order_value_sum'],
+            'total_orders': state['order_value_count'],
+            'total_qty_sold': state['qty_sum'],
+        }).round(2)
+        return stats.reset_index()
+    
+    def demand_summary(self) -> pd.DataFrame:
+        """
+        Historical demand and revenue per product, indexed by product_id
+        """
+        state = self.states['product_id']
+        return pd.DataFrame({
+            'historical_demand': state['qty_sum'],
+            'historical_revenue': state['order_value_sum'],
+        })
+
 class SOpDataProcessor:
     """
     Main class for S&OP data processing operations
     """
     
-    def __init__(self):
+    def __init__(self, memory_optimized: bool = False, profiler: Optional[StageProfiler] = None,
+                 validation_sample: Optional[Union[int, float]] = None, backend=None,
+                 copy_free: bool = False):
+        """
+        Args:
+            memory_optimized: Convert low-cardinality text columns to
+                categoricals and downcast numerics at the end of every
+                clean_* method (see optimize_dtypes)
+            profiler: If set, every public method is recorded as a stage
+                (wall/CPU time, memory, rows in/out)
+            validation_sample: Validate a row sample of this size (int) or
+                fraction (float) and report scaled estimates
+            backend: Compute backend for order cleaning, order aggregates and
+                summary totals: None/'pandas' (default), 'duckdb' or a
+                backends.DuckDBBackend instance (see src/backends.py)
+            copy_free: Low-allocation mode. The clean_* methods start from
+                shallow copies, filter with one combined validity mask and
+                assign derived columns in place, and engineer_features no
+                longer deep-copies the datasets it passes through. Inputs are
+                still never modified because pandas copy-on-write copies a
+                shared column only when it is written to.
+        """
+        from .backends import get_backend
+        
+        if copy_free and not copy_on_write_enabled():
+            raise ValueError("copy_free requires pandas copy-on-write: upgrade to pandas 3 "
+                             "or set pd.options.mode.copy_on_write = True")
+        
         self.data_sources = {}
         self.processed_data = {}
+        self.validation_results = {}
+        self.order_aggregates: Optional[OrderAggregates] = None
+        self.memory_optimized = memory_optimized
+        self.memory_report = {}
+        self.profiler = profiler
+        self.validation_sample = validation_sample
+        self.copy_free = copy_free
+        self.backend = get_backend(backend, copy_free=copy_free)
         
-    def load_datasets(self, file_paths: Dict[str, str]) -> Dict[str, pd.DataFrame]:
+    def _stage(self, name: str, rows_in: Optional[int] = None):
+        """
+        profiler.stage(name) for work outside a @profile_stage method, or a
+        no-op context when no profiler is set (yields a dict either way)
+        """
+        if self.profiler is None:
+            return nullcontext({})
+        return self.profiler.stage(name, rows_in=rows_in)
+    
+    @profile_stage
+    def load_datasets(self, file_paths: Dict[str, str], cache_dir: Optional[str] = None,
+                      cache_format: str = 'parquet', start=None, end=None,
+                      regions: Optional[Sequence[str]] = None,
+                      columns: Optional[Dict[str, List[str]]] = None) -> Dict[str, pd.DataFrame]:
         """
         Load multiple CSV datasets
         
         Args:
-            file_paths: Dictionary with dataset names as keys and file paths as values
+            file_paths: Dictionary with dataset names as keys and file paths as values.
+                A path may also be a partitioned directory written by
+                storage.write_partitioned (or export_processed_data with partition_by).
+            cache_dir: Optional directory for a columnar cache of the raw files.
+                Cached datasets are read back with their schema dtypes and the
+                CSV is only re-parsed when the source file changes.
+            cache_format: 'parquet' or 'feather'
+            start, end: Inclusive order_date bounds for datasets with an
+                order_date column. Partitioned directories skip whole months
+                outside the range.
+            regions: Regions to keep for datasets with a region column
+            columns: Dataset name -> columns to read
             
         Returns:
             Dictionary of loaded DataFrames
         """
         loaded_data = {}
+        columns = columns or {}
         
         for dataset_name, file_path in file_paths.items():
-            try:
-                df = pd.read_csv(file_path)
-                loaded_data[dataset_name] = df
-                logger.info(f"✅ Loaded {dataset_name}: {len(df):,} records")
-            except FileNotFoundError:
-                logger.error(f"❌ File not found: {file_path}")
-                raise
-            except Exception as e:
-                logger.error(f"❌ Error loading {dataset_name}: {e}")
-                raise
+            loaded_data[dataset_name] = self._load_dataset(dataset_name, file_path, cache_dir, cache_format,
+                                                           start=start, end=end, regions=regions,
+                                                           columns=columns.get(dataset_name))
                 
         self.data_sources = loaded_data
         return loaded_data
     
-    def validate_data_quality(self, df: pd.DataFrame, dataset_name: str) -> Dict[str, any]:
+    @profile_stage
+    def load_from_source(self, connector, tables: Optional[Dict[str, str]] = None,
+                         columns: Optional[Dict[str, List[str]]] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Extract datasets from a database through a source connector
+        
+        The tables are queried concurrently (see src/connectors.py) and
+        come back with the same schema dtypes as the columnar CSV cache.
+        
+        Args:
+            connector: connectors.SourceConnector, e.g. SQLiteConnector or
+                BigQueryConnector
+            tables: Dataset name -> source table (default: connectors.SOP_TABLES)
+            columns: Dataset name -> columns to select
+            
+        Returns:
+            Dictionary of loaded DataFrames
+        """
+        from .connectors import extract_datasets
+        
+        loaded_data = extract_datasets(connector, tables, columns)
+        self.data_sources = loaded_data
+        return loaded_data
+    
+    def _load_dataset(self, dataset_name: str, file_path: str, cache_dir: Optional[str] = None,
+                      cache_format: str = 'parquet', start=None, end=None,
+                      regions: Optional[Sequence[str]] = None,
+                      columns: Optional[List[str]] = None) -> pd.DataFrame:
+        try:
+            filtered = start is not None or end is not None or regions is not None or columns is not None
+            if os.path.isdir(file_path):
+                from .storage import read_partitioned
+                df = read_partitioned(file_path, start=start, end=end, regions=regions, columns=columns)
+            elif cache_dir is not None:
+                from .storage import load_cached_dataset
+                df = load_cached_dataset(dataset_name, file_path, cache_dir, file_format=cache_format)
+            elif filtered:
+                from .storage import _read_columns
+                header = pd.read_csv(file_path, nrows=0).columns.tolist()
+                df = pd.read_csv(file_path, usecols=_read_columns(columns, start, end, regions, header))
+            else:
+                df = pd.read_csv(file_path)
+            if filtered and not os.path.isdir(file_path):
+                from .storage import filter_orders
+                df = filter_orders(df, start, end, regions)
+                if columns is not None:
+                    df = df[list(columns)]
+            logger.info(f"✅ Loaded {dataset_name}: {len(df):,} records")
+            return df
+        except FileNotFoundError:
+            logger.error(f"❌ File not found: {file_path}")
+            raise
+        except Exception as e:
+            logger.error(f"❌ Error loading {dataset_name}: {e}")
+            raise
+    
+    @profile_stage
+    def validate_data_quality(self, df: pd.DataFrame, dataset_name: str,
+                              references: Optional[Dict[str, pd.DataFrame]] = None) -> Dict[str, any]:
         """
         Perform comprehensive data quality checks
         
+        Evaluates the dataset's declarative rules (validation.VALIDATION_RULES)
+        together with the missing/negative/duplicate counts in one pass.
+        duplicate_records counts whole-row duplicates; duplicate_keys counts
+        rows repeating the dataset's declared key.
+        
         Args:
             df: DataFrame to validate
             dataset_name: Name of the dataset for reporting
+            references: Loaded datasets for referential-integrity rules
+                (e.g. {'products': products_df})
             
         Returns:
             Dictionary with validation results
         """
+        validation_results = self._validation_summary(df, dataset_name, references)
+        self._log_validation(validation_results)
+        return validation_results
+    
+    def _validation_summary(self, df: pd.DataFrame, dataset_name: str,
+                            references: Optional[Dict[str, pd.DataFrame]] = None) -> Dict[str, any]:
+        from .validation import evaluate_rules
+        
+        # Null counts, numeric checks and rule results come from one shared pass
+        checks = evaluate_rules(df, dataset_name, references=references, sample=self.validation_sample)
         validation_results = {
             'dataset_name': dataset_name,
             'total_records': len(df),
             'total_columns': len(df.columns),
-            'missing_values': df.isnull().sum().sum(),
-            'duplicate_records': df.duplicated().sum(),
+            'missing_values': checks['missing_values'],
+            'duplicate_records': checks['duplicate_records'],
+            'duplicate_keys': checks['duplicate_keys'],
             'data_types': df.dtypes.to_dict(),
-            'memory_usage_mb': df.memory_usage(deep=True).sum() / (1024*1024),
+            'memory_usage_mb': checks['memory_usage_mb'],
+            'missing_by_column': checks['missing_by_column'],
+            'negative_values': checks['negative_values'],
+            'rule_violations': checks['rule_violations'],
+            'sampled_rows': checks['sampled_rows'],
         }
-        
-        # Check for missing values by column
-        missing_by_column = df.isnull().sum()
-        validation_results['missing_by_column'] = missing_by_column[missing_by_column > 0].to_dict()
-        
-        # Check for negative values in numeric columns
-        numeric_columns = df.select_dtypes(include=[np.number]).columns
-        negative_values = {}
-        for col in numeric_columns:
-            negative_count = (df[col] < 0).sum()
-            if negative_count > 0:
-                negative_values[col] = negative_count
-        validation_results['negative_values'] = negative_values
-        
-        logger.info(f"📊 Data Quality Report for {dataset_name}:")
+        return validation_results
+    
+    @staticmethod
+    def _log_validation(validation_results: Dict[str, any]) -> None:
+        logger.info(f"📊 Data Quality Report for {validation_results['dataset_name']}:")
         logger.info(f"   Records: {validation_results['total_records']:,}")
         logger.info(f"   Missing Values: {validation_results['missing_values']:,}")
         logger.info(f"   Duplicates: {validation_results['duplicate_records']:,}")
+        if validation_results.get('duplicate_keys'):
+            logger.info(f"   Duplicate Keys: {validation_results['duplicate_keys']:,}")
+        broken = [v for v in validation_results.get('rule_violations', []) if v['violations']]
+        if broken:
+            details = ', '.join(f"{v['rule']}:{v['column']}={v['violations']:,}" for v in broken)
+            logger.info(f"   Rule Violations: {details}")
+        if validation_results.get('sampled_rows'):
+            logger.info(f"   (estimated from {validation_results['sampled_rows']:,} sampled rows)")
+    
+    @staticmethod
+    def _merge_validation_summaries(summaries: List[Dict[str, any]]) -> Dict[str, any]:
+        """
+        Combine chunk-level validation results into one report
         
-        return validation_results
+        Duplicates are counted within each chunk only.
+        """
+        merged = dict(summaries[0])
+        for key in ['total_records', 'missing_values', 'duplicate_records', 'memory_usage_mb']:
+            merged[key] = sum(summary[key] for summary in summaries)
+        key_counts = [summary.get('duplicate_keys') for summary in summaries]
+        merged['duplicate_keys'] = None if None in key_counts else sum(key_counts)
+        for key in ['missing_by_column', 'negative_values']:
+            totals = {}
+            for summary in summaries:
+                for col, count in summary[key].items():
+                    totals[col] = totals.get(col, 0) + count
+            merged[key] = totals
+        
+        rules = {}
+        for summary in summaries:
+            for violation in summary.get('rule_violations', []):
+                key = (violation['rule'], violation['column'])
+                rules[key] = rules.get(key, 0) + violation['violations']
+        merged['rule_violations'] = [
+            {'rule': rule, 'column': column, 'violations': count,
+             'rate': count / merged['total_records'] if merged['total_records'] else 0.0}
+            for (rule, column), count in rules.items()
+        ]
+        sampled = [summary.get('sampled_rows') for summary in summaries]
+        merged['sampled_rows'] = sum(n or 0 for n in sampled) if any(sampled) else None
+        return merged
     
-    def clean_orders_data(self, orders_df: pd.DataFrame) -> pd.DataFrame:
+    def stream_orders_data(self, file_path: str, chunksize: int = 100_000) -> Iterator[pd.DataFrame]:
         """
-        Clean and transform orders dataset
+        Read, validate and clean orders one chunk at a time
+        
+        Each cleaned chunk is folded into ``self.order_aggregates`` so the
+        customer/product features can be attached without a full-history
+        groupby. Only one raw chunk is held in memory at a time.
+        
+        Args:
+            file_path: Path to the orders CSV
+            chunksize: Number of rows per chunk
+            
+        Yields:
+            Cleaned orders chunks
         """
-        df = orders_df.copy()
+        aggregates = OrderAggregates()
+        summaries = []
         
-        # Convert date columns
-        df['order_date'] = pd.to_datetime(df['order_date'])
+        memory_before = memory_after = 0.0
         
-        # Create additional date features
-        df['order_year'] = df['order_date'].dt.year
-        df['order_month_num'] = df['order_date'].dt.month
-        df['order_quarter'] = df['order_date'].dt.quarter
-        df['order_week'] = df['order_date'].dt.isocalendar().week
-        df['is_weekend'] = df['order_date'].dt.dayofweek.isin([5, 6])
+        text_dtypes = {col: str for col in ORDERS_TEXT_COLUMNS}
+        reader = pd.read_csv(file_path, chunksize=chunksize, dtype=text_dtypes)
+        while True:
+            # Each chunk read is recorded as a load stage
+            with self._stage('load_datasets') as frame:
+                chunk = next(reader, None)
+                frame['rows_out'] = len(chunk) if chunk is not None else 0
+            if chunk is None:
+                break
+            summaries.append(self._validation_summary(chunk, 'orders'))
+            cleaned = self.clean_orders_data(chunk)
+            if self.memory_optimized:
+                memory_before += self.memory_report['orders']['before_mb']
+                memory_after += self.memory_report['orders']['after_mb']
+            aggregates.update(cleaned)
+            yield cleaned
         
-        # Clean price and value columns
-        numeric_columns = ['qty', 'base_price', 'unit_price', 'discount_pct', 'order_value']
-        for col in numeric_columns:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
+        self.order_aggregates = aggregates
+        if self.memory_optimized and memory_before > 0:
+            self.memory_report['orders'] = {
+                'before_mb': memory_before,
+                'after_mb': memory_after,
+                'reduction_pct': 100 * (1 - memory_after / memory_before),
+            }
+        if summaries:
+            self.validation_results['orders'] = self._merge_validation_summaries(summaries)
+            self._log_validation(self.validation_results['orders'])
+    
+    @profile_stage
+    def optimize_dtypes(self, df: pd.DataFrame, dataset_name: str) -> pd.DataFrame:
+        """
+        Convert a cleaned dataset to compact dtypes
         
-        # Remove invalid orders
-        initial_count = len(df)
-        df = df[df['qty'] > 0]
-        df = df[df['order_value'] > 0]
-        df = df[df['unit_price'] > 0]
+        Columns listed in COMPACT_CATEGORIES become categoricals, integers are
+        downcast to the smallest type that holds them and floats go to float32
+        only when that is lossless. Memory before/after is recorded in
+        ``self.memory_report``.
         
-        removed_count = initial_count - len(df)
-        if removed_count > 0:
-            logger.info(f"🧹 Removed {removed_count} invalid orders")
+        Args:
+            df: Cleaned DataFrame (modified in place)
+            dataset_name: 'orders', 'inventory', 'forecasts' or 'products'
+            
+        Returns:
+            The same DataFrame with compact dtypes
+        """
+        before = df.memory_usage(deep=True).sum() / (1024*1024)
         
-        # Calculate discount amount
-        if 'discount_pct' in df.columns and 'base_price' in df.columns:
-            df['discount_amount'] = df['base_price'] * (df['discount_pct'] / 100)
+        for col, categories in COMPACT_CATEGORIES.get(dataset_name, {}).items():
+            if col not in df.columns:
+                continue
+            if categories is None:
+                df[col] = df[col].astype('category')
+            else:
+                df[col] = pd.Categorical(df[col], categories=categories)
         
-        # Revenue per unit
-        df['revenue_per_unit'] = df['order_value'] / df['qty']
+        for col in df.select_dtypes(include=[np.integer]).columns:
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+        
+        for col in df.select_dtypes(include=[np.float64]).columns:
+            values = df[col].to_numpy()
+            compact = values.astype(np.float32)
+            if np.array_equal(compact.astype(np.float64), values, equal_nan=True):
+                df[col] = compact
+        
+        after = df.memory_usage(deep=True).sum() / (1024*1024)
+        self.memory_report[dataset_name] = {
+            'before_mb': before,
+            'after_mb': after,
+            'reduction_pct': 100 * (1 - after / before) if before > 0 else 0.0,
+        }
+        logger.info(f"🗜️ {dataset_name} memory: {before:.3f} MB → {after:.3f} MB")
+        return df
+    
+    @profile_stage
+    def clean_orders_data(self, orders_df: Union[pd.DataFrame, str]) -> pd.DataFrame:
+        """
+        Clean and transform orders dataset
+        
+        Args:
+            orders_df: Raw orders, or a file path the backend reads itself
+                (see DuckDBBackend.can_scan)
+        """
+        df = self.backend.clean_orders(orders_df)
+        
+        if isinstance(orders_df, pd.DataFrame) and len(orders_df) > len(df):
+            logger.info(f"🧹 Removed {len(orders_df) - len(df)} invalid orders")
+        
+        if self.memory_optimized:
+            df = self.optimize_dtypes(df, 'orders')
         
         logger.info(f"✅ Orders data cleaned: {len(df):,} records")
         return df
     
+    @profile_stage
+    def process_order_increment(self, new_orders_df: pd.DataFrame, state_dir: str,
+                                batch_id: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Fold a batch of new orders into persisted aggregate state
+        
+        Only the new rows are cleaned and only the customer_type/product_id
+        rows they touch are recomputed, so the cost scales with the batch,
+        not the history. The refreshed rows are also written into
+        ``customer_stats.parquet`` and ``product_stats.parquet`` in state_dir.
+        
+        Args:
+            new_orders_df: Raw orders not yet folded into the state
+            state_dir: Directory holding the OrderAggregates state
+            batch_id: Optional identifier (e.g. the order date); a batch id
+                already in the state is skipped so reruns do not double count
+            
+        Returns:
+            Dictionary with the cleaned batch ('orders', with the same feature
+            columns engineer_features adds) and the refreshed 'customer_stats'
+            and 'product_stats' rows
+        """
+        from .storage import read_columnar, write_columnar
+        
+        aggregates = OrderAggregates.load(state_dir)
+        if batch_id is not None and batch_id in aggregates.batch_ids:
+            logger.warning(f"⚠️ Batch {batch_id} already applied, skipping")
+            return {}
+        
+        orders_df = self.clean_orders_data(new_orders_df)
+        aggregates.update(orders_df)
+        if batch_id is not None:
+            aggregates.batch_ids.append(batch_id)
+        aggregates.save(state_dir)
+        self.order_aggregates = aggregates
+        
+        refreshed = {
+            'customer_stats': aggregates.customer_stats(aggregates.touched_keys['customer_type']),
+            'product_stats': aggregates.product_stats(aggregates.touched_keys['product_id']),
+        }
+        
+        # Update the materialised tables in place of the touched keys only
+        for table_name, key in [('customer_stats', 'customer_type'), ('product_stats', 'product_id')]:
+            table_path = os.path.join(state_dir, f"{table_name}.parquet")
+            fresh = refreshed[table_name].set_index(key)
+            if os.path.exists(table_path):
+                table = read_columnar(table_path).set_index(key)
+                fresh = pd.concat([table.drop(fresh.index, errors='ignore'), fresh]).sort_index()
+            write_columnar(fresh.reset_index(), table_path)
+        
+        orders_df = orders_df.merge(refreshed['customer_stats'], on='customer_type', how='left')
+        orders_df = orders_df.merge(refreshed['product_stats'], on='product_id', how='left')
+        
+        logger.info(f"➕ Folded {len(orders_df):,} new orders into {state_dir} "
+                    f"({len(refreshed['product_stats'])} products refreshed)")
+        return {'orders': orders_df, **refreshed}
+    
+    @profile_stage
     def clean_inventory_data(self, inventory_df: pd.DataFrame) -> pd.DataFrame:
         """
         Clean and transform inventory dataset
         """
-        df = inventory_df.copy()
+        df = inventory_df.copy(deep=not self.copy_free)
         
         # Clean numeric columns
         numeric_columns = ['available_qty', 'unit_cost', 'inventory_value', 'total_demand']
@@ -169,7 +742,7 @@ class SOpDataProcessor:
         )
         
         # Stock status validation
-        valid_statuses = ['Excess', 'Adequate', 'Low']
+        valid_statuses = VALID_STOCK_STATUSES
         df['stock_status'] = df['stock_status'].where(
             df['stock_status'].isin(valid_statuses), 
             'Unknown'
@@ -177,21 +750,30 @@ class SOpDataProcessor:
         
         # Remove invalid inventory records
         initial_count = len(df)
-        df = df[df['available_qty'] >= 0]
-        df = df[df['inventory_value'] >= 0]
+        if self.copy_free:
+            valid = ((df['available_qty'] >= 0) & (df['inventory_value'] >= 0)).to_numpy()
+            if not valid.all():
+                df = df[valid]
+        else:
+            df = df[df['available_qty'] >= 0]
+            df = df[df['inventory_value'] >= 0]
         
         removed_count = initial_count - len(df)
         if removed_count > 0:
             logger.info(f"🧹 Removed {removed_count} invalid inventory records")
         
+        if self.memory_optimized:
+            df = self.optimize_dtypes(df, 'inventory')
+        
         logger.info(f"✅ Inventory data cleaned: {len(df):,} records")
         return df
     
+    @profile_stage
     def clean_forecasts_data(self, forecasts_df: pd.DataFrame) -> pd.DataFrame:
         """
         Clean and transform forecasts dataset
         """
-        df = forecasts_df.copy()
+        df = forecasts_df.copy(deep=not self.copy_free)
         
         # Convert forecast_month to datetime
         df['forecast_month'] = pd.to_datetime(df['forecast_month'])
@@ -214,27 +796,31 @@ class SOpDataProcessor:
         )
         
         # Validate forecast types
-        valid_types = ['Manual', 'Statistical', 'ML_Model']
+        valid_types = VALID_FORECAST_TYPES
         df['forecast_type'] = df['forecast_type'].where(
             df['forecast_type'].isin(valid_types),
             'Unknown'
         )
         
         # Validate confidence levels
-        valid_confidence = ['Low', 'Medium', 'High']
+        valid_confidence = VALID_CONFIDENCE_LEVELS
         df['confidence_level'] = df['confidence_level'].where(
             df['confidence_level'].isin(valid_confidence),
             'Unknown'
         )
         
+        if self.memory_optimized:
+            df = self.optimize_dtypes(df, 'forecasts')
+        
         logger.info(f"✅ Forecasts data cleaned: {len(df):,} records")
         return df
     
+    @profile_stage
     def clean_products_data(self, products_df: pd.DataFrame) -> pd.DataFrame:
         """
         Clean and transform products dataset
         """
-        df = products_df.copy()
+        df = products_df.copy(deep=not self.copy_free)
         
         # Clean price columns
         df['base_price'] = pd.to_numeric(df['base_price'], errors='coerce')
@@ -247,7 +833,7 @@ class SOpDataProcessor:
         )
         
         # Clean categorical columns
-        valid_tiers = ['High', 'Medium', 'Low']
+        valid_tiers = VALID_TIERS
         df['promotional_tier'] = df['promotional_tier'].where(
             df['promotional_tier'].isin(valid_tiers),
             'Unknown'
@@ -261,59 +847,68 @@ class SOpDataProcessor:
         # Create product name length feature
         df['product_name_length'] = df['product_name'].str.len()
         
+        if self.memory_optimized:
+            df = self.optimize_dtypes(df, 'products')
+        
         logger.info(f"✅ Products data cleaned: {len(df):,} records")
         return df
     
-    def engineer_features(self, datasets: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    @profile_stage
+    def engineer_features(self, datasets: Dict[str, pd.DataFrame],
+                          aggregates: Optional[OrderAggregates] = None) -> Dict[str, pd.DataFrame]:
         """
         Engineer additional features across datasets
+        
+        Args:
+            datasets: Cleaned datasets keyed by name
+            aggregates: Pre-built order aggregates (e.g. from stream_orders_data).
+                When given, customer/product statistics are taken from it
+                instead of being reduced from the orders frame, and the
+                inventory demand features are added even without an
+                'orders' frame (streamed orders).
         """
-        enhanced_datasets = {}
+        # Orders and inventory are rebuilt below (reset_index gives new frames),
+        # everything else is copied so callers' frames are never modified
+        # (shallow copies in copy-free mode, where copy-on-write protects them)
+        enhanced_datasets = dict.fromkeys(datasets)
+        with_orders = 'orders' in datasets or aggregates is not None
+        rebuilt = ({'orders', 'inventory'} if with_orders else set()) & set(datasets)
         
         for name, df in datasets.items():
-            enhanced_datasets[name] = df.copy()
+            if name not in rebuilt:
+                enhanced_datasets[name] = df.copy(deep=not self.copy_free)
         
-        # Orders feature engineering
-        if 'orders' in enhanced_datasets:
-            orders_df = enhanced_datasets['orders']
-            
-            # Customer behavior features
-            customer_stats = orders_df.groupby('customer_type').agg({
-                'order_value': ['mean', 'std', 'count'],
-                'discount_pct': 'mean'
-            }).round(2)
+        # Orders feature engineering: one factorize per key, bincount reductions,
+        # and stats attached by position rather than merged
+        if 'orders' in datasets:
+            orders_df = datasets['orders'].reset_index(drop=True)
             
-            customer_stats.columns = ['avg_order_value', 'order_value_std', 'order_frequency', 'avg_discount']
-            customer_stats = customer_stats.reset_index()
+            if aggregates is None:
+                factorized = {key: _factorize_key(orders_df[key]) for key in ORDER_AGGREGATE_SPEC}
+                aggregates = self.backend.order_aggregates(orders_df, factorized)
+                positions = {key: codes for key, (codes, _) in factorized.items()}
+            else:
+                positions = {key: aggregates.states[key].index.get_indexer(orders_df[key])
+                             for key in ORDER_AGGREGATE_SPEC}
             
-            # Merge back to orders
-            orders_df = orders_df.merge(customer_stats, on='customer_type', how='left')
+            # Customer behavior features
+            customer_stats = aggregates.customer_stats().set_index('customer_type')
+            _attach_stats(orders_df, customer_stats, positions['customer_type'])
             
             # Product performance metrics
-            product_stats = orders_df.groupby('product_id').agg({
-                'order_value': ['sum', 'count'],
-                'qty': 'sum'
-            }).round(2)
-            
-            product_stats.columns = ['total_product_revenue', 'total_orders', 'total_qty_sold']
-            product_stats = product_stats.reset_index()
-            
-            orders_df = orders_df.merge(product_stats, on='product_id', how='left')
+            product_stats = aggregates.product_stats().set_index('product_id')
+            _attach_stats(orders_df, product_stats, positions['product_id'])
             
             enhanced_datasets['orders'] = orders_df
         
         # Cross-dataset features
-        if 'orders' in enhanced_datasets and 'inventory' in enhanced_datasets:
-            orders_df = enhanced_datasets['orders']
-            inventory_df = enhanced_datasets['inventory']
+        if with_orders and 'inventory' in datasets:
+            inventory_enhanced = datasets['inventory'].reset_index(drop=True)
             
             # Product demand vs inventory
-            demand_summary = orders_df.groupby('product_id').agg({
-                'qty': 'sum',
-                'order_value': 'sum'
-            }).rename(columns={'qty': 'historical_demand', 'order_value': 'historical_revenue'})
-            
-            inventory_enhanced = inventory_df.merge(demand_summary, on='product_id', how='left')
+            demand_summary = aggregates.demand_summary()
+            _attach_stats(inventory_enhanced, demand_summary,
+                          demand_summary.index.get_indexer(inventory_enhanced['product_id']))
             inventory_enhanced['demand_coverage_ratio'] = (
                 inventory_enhanced['available_qty'] / inventory_enhanced['historical_demand'].fillna(1)
             )
@@ -323,109 +918,427 @@ class SOpDataProcessor:
         logger.info("✅ Feature engineering completed")
         return enhanced_datasets
     
+    @profile_stage
     def create_summary_statistics(self, datasets: Dict[str, pd.DataFrame]) -> pd.DataFrame:
         """
         Create comprehensive summary statistics
         """
+        from .validation import memory_usage_mb
+        
         summary_stats = []
         
+        # These describe the enhanced frames, so validation_results (taken on the
+        # raw frames) cannot stand in for them even when the row count matches:
+        # cleaning drops rows, coerces bad values to NaN and rewrites invalid
+        # categories, and feature engineering adds columns with their own gaps.
+        # Duplicates use the key-first helper, so whole rows are only hashed
+        # where a key repeats.
         for dataset_name, df in datasets.items():
-            stats = {
-                'dataset': dataset_name,
-                'record_count': len(df),
-                'column_count': len(df.columns),
-                'memory_usage_mb': df.memory_usage(deep=True).sum() / (1024*1024),
-                'numeric_columns': len(df.select_dtypes(include=[np.number]).columns),
-                'categorical_columns': len(df.select_dtypes(include=['object']).columns),
-                'datetime_columns': len(df.select_dtypes(include=['datetime64']).columns),
-                'missing_values': df.isnull().sum().sum(),
-                'duplicate_rows': df.duplicated().sum()
-            }
-            
-            # Dataset specific metrics
-            if dataset_name == 'orders':
-                stats['total_revenue'] = df['order_value'].sum() if 'order_value' in df.columns else 0
-                stats['date_range'] = f"{df['order_date'].min()} to {df['order_date'].max()}" if 'order_date' in df.columns else 'N/A'
-            elif dataset_name == 'inventory':
-                stats['total_inventory_value'] = df['inventory_value'].sum() if 'inventory_value' in df.columns else 0
-            elif dataset_name == 'forecasts':
-                stats['avg_forecast_accuracy'] = (100 - df['absolute_error'].mean()) if 'absolute_error' in df.columns else 0
-            
-            summary_stats.append(stats)
+            totals = self.backend.dataset_totals(df, dataset_name)
+            totals.update(record_count=len(df), memory_usage_mb=memory_usage_mb(df))
+            summary_stats.append(self._summary_row(dataset_name, df, totals))
         
         summary_df = pd.DataFrame(summary_stats)
         logger.info("📊 Summary statistics created")
         return summary_df
     
-    def export_processed_data(self, datasets: Dict[str, pd.DataFrame], output_dir: str = './processed_data/') -> None:
+    @staticmethod
+    def _summary_row(dataset_name: str, df: pd.DataFrame, totals: Dict[str, any]) -> Dict[str, any]:
+        """
+        One create_summary_statistics row
+        
+        Column counts come from df; everything else from totals (backend
+        dataset_totals plus record_count and memory_usage_mb), so streamed
+        orders can pass one chunk with totals merged over all chunks.
+        """
+        stats = {
+            'dataset': dataset_name,
+            'record_count': totals['record_count'],
+            'column_count': len(df.columns),
+            'memory_usage_mb': totals['memory_usage_mb'],
+            'numeric_columns': len(df.select_dtypes(include=[np.number]).columns),
+            'categorical_columns': len(df.select_dtypes(include=['object']).columns),
+            'datetime_columns': len(df.select_dtypes(include=['datetime64']).columns),
+            'missing_values': totals['missing_values'],
+            'duplicate_rows': totals['duplicate_rows'],
+            'duplicate_keys': totals['duplicate_keys'],
+        }
+        
+        # Dataset specific metrics
+        if dataset_name == 'orders':
+            stats['total_revenue'] = totals.get('order_value_sum', 0)
+            stats['date_range'] = ("{} to {}".format(*totals['order_date_range'])
+                                   if 'order_date_range' in totals else 'N/A')
+        elif dataset_name == 'inventory':
+            stats['total_inventory_value'] = totals.get('inventory_value_sum', 0)
+        elif dataset_name == 'forecasts':
+            stats['avg_forecast_accuracy'] = (100 - totals['absolute_error_mean']) if 'absolute_error_mean' in totals else 0
+        return stats
+    
+    @profile_stage
+    def export_processed_data(self, datasets: Dict[str, pd.DataFrame], output_dir: str = './processed_data/',
+                              file_format: str = 'csv',
+                              partition_by: Optional[Sequence[str]] = None) -> None:
         """
-        Export processed datasets to CSV files
+        Export processed datasets to CSV, Parquet or Feather files
+        
+        Parquet and Feather keep the computed dtypes (datetimes, categoricals,
+        booleans); read them back with storage.load_processed_data.
+        
+        Args:
+            datasets: Datasets keyed by name
+            output_dir: Target directory
+            file_format: 'csv', 'parquet' or 'feather'
+            partition_by: Partition keys for datasets with an order_date
+                column, e.g. storage.PARTITION_COLUMNS (order_year,
+                order_month_num) or PARTITION_COLUMNS + ['region']. Those
+                datasets are written as a {name}_processed/ directory so
+                date/region-filtered loads only read matching partitions.
         """
-        import os
+        if partition_by is not None and file_format == 'csv':
+            raise ValueError("partition_by requires file_format 'parquet' or 'feather'")
         
         # Create output directory if it doesn't exist
         os.makedirs(output_dir, exist_ok=True)
         
         for dataset_name, df in datasets.items():
-            filename = f"{dataset_name}_processed.csv"
+            if partition_by is not None and 'order_date' in df.columns:
+                from .storage import write_partitioned
+                write_partitioned(df, os.path.join(output_dir, f"{dataset_name}_processed"), partition_by,
+                                  file_format)
+                continue
+            
+            filename = f"{dataset_name}_processed.{file_format}"
             filepath = os.path.join(output_dir, filename)
             
-            df.to_csv(filepath, index=False)
+            if file_format == 'csv':
+                df.to_csv(filepath, index=False)
+            else:
+                from .storage import write_columnar
+                write_columnar(df, filepath, file_format)
             logger.info(f"💾 Exported {dataset_name}: {filepath}")
         
         logger.info(f"✅ All datasets exported to {output_dir}")
 
-def process_sop_data(file_paths: Dict[str, str]) -> Dict[str, pd.DataFrame]:
+# clean_* method for each known dataset, in pipeline order
+DATASET_CLEANERS = {
+    'orders': 'clean_orders_data',
+    'inventory': 'clean_inventory_data',
+    'forecasts': 'clean_forecasts_data',
+    'products': 'clean_products_data',
+}
+
+def _spill_chunks(chunks: Iterator[pd.DataFrame], directory: str) -> List[str]:
+    """
+    Write each chunk to its own Parquet part and drop it before the next
+    one is produced
+    """
+    from .storage import write_columnar
+    
+    os.makedirs(directory, exist_ok=True)
+    parts = []
+    for i, chunk in enumerate(chunks):
+        part = os.path.join(directory, f"part-{i:05d}.parquet")
+        write_columnar(chunk, part)
+        parts.append(part)
+        del chunk
+    return parts
+
+def _merge_order_totals(totals: List[Dict[str, any]]) -> Dict[str, any]:
+    """
+    Combine per-chunk dataset_totals (plus record_count/memory_usage_mb)
+    of orders; duplicates are counted within each chunk only
+    """
+    merged = {}
+    for key in ['record_count', 'memory_usage_mb', 'missing_values', 'duplicate_rows', 'order_value_sum']:
+        values = [chunk[key] for chunk in totals if key in chunk]
+        if values:
+            merged[key] = sum(values)
+    key_counts = [chunk.get('duplicate_keys') for chunk in totals]
+    merged['duplicate_keys'] = None if None in key_counts else sum(key_counts)
+    ranges = [chunk['order_date_range'] for chunk in totals if 'order_date_range' in chunk]
+    ranges = [(low, high) for low, high in ranges if pd.notna(low)]
+    if ranges:
+        merged['order_date_range'] = (min(low for low, _ in ranges), max(high for _, high in ranges))
+    return merged
+
+def _engineer_streamed_orders(processor: SOpDataProcessor, parts: List[str], datasets: Dict[str, pd.DataFrame],
+                              output_dir: str) -> Dict[str, any]:
+    """
+    Feature engineering, reference checks and summary totals for spilled
+    order chunks, one part at a time
+    
+    Enhanced parts go to output_dir (read back with storage.read_partitioned).
+    Reference violations are added to processor.validation_results['orders'].
+    
+    Returns:
+        The orders row of create_summary_statistics
+    """
+    from .storage import PARTITION_MARKER, read_columnar, write_columnar
+    from .validation import VALIDATION_RULES, _reference_violations, memory_usage_mb
+    
+    os.makedirs(output_dir, exist_ok=True)
+    totals, references, first = [], {}, None
+    for i, part in enumerate(parts):
+        chunk = processor.engineer_features({'orders': read_columnar(part)},
+                                            aggregates=processor.order_aggregates)['orders']
+        for violation in _reference_violations(chunk, VALIDATION_RULES['orders'], datasets):
+            references[violation['column']] = references.get(violation['column'], 0) + violation['violations']
+        chunk_totals = processor.backend.dataset_totals(chunk, 'orders')
+        chunk_totals.update(record_count=len(chunk), memory_usage_mb=memory_usage_mb(chunk))
+        totals.append(chunk_totals)
+        write_columnar(chunk, os.path.join(output_dir, f"part-{i:05d}.parquet"))
+        if first is None:
+            first = chunk.iloc[:0]
+        os.remove(part)
+        del chunk
+    with open(os.path.join(output_dir, PARTITION_MARKER), 'w'):
+        pass
+    
+    merged = _merge_order_totals(totals)
+    records = merged.get('record_count', 0)
+    validation = processor.validation_results.get('orders')
+    for column, count in references.items():
+        if validation is not None:
+            validation.setdefault('rule_violations', []).append(
+                {'rule': 'references', 'column': column, 'violations': count,
+                 'rate': count / records if records else 0.0})
+        if count:
+            logger.warning(f"⚠️ orders: {count:,} rows break {column}")
+    logger.info(f"💾 Wrote {records:,} engineered orders in {len(parts)} parts: {output_dir}")
+    if first is None:
+        return None
+    return processor._summary_row('orders', first, merged)
+
+def _scans(backend, file_path: str) -> bool:
+    """
+    Whether backend reads file_path itself (DuckDBBackend.can_scan)
+    """
+    can_scan = getattr(backend, 'can_scan', None)
+    return can_scan is not None and can_scan(file_path)
+
+def _prepare_dataset(processor: SOpDataProcessor, dataset_name: str, file_path: str,
+                     chunksize: Optional[int] = None, cache_dir: Optional[str] = None,
+                     stream_dir: Optional[str] = None) -> Dict[str, any]:
+    """
+    Load → validate → clean chain for one dataset
+    
+    Module-level so it can be shipped to a process pool. Returns everything
+    process_sop_data needs, since a worker's processor state is not shared.
+    With a backend that reads files (DuckDB), orders are validated in
+    batches, cleaned and aggregated inside the backend and only the cleaned
+    frame is returned; duplicates are then counted within a batch
+    (backend.batch_rows rows). Streamed orders are spilled chunk by chunk to
+    stream_dir/orders_clean and returned as part paths ('parts'), not a frame.
+    """
+    timings = {}
+    start = time.perf_counter()
+    aggregates = None
+    parts = None
+    
+    if dataset_name == 'orders' and chunksize is not None:
+        cleaned = None
+        parts = _spill_chunks(processor.stream_orders_data(file_path, chunksize=chunksize),
+                              os.path.join(stream_dir, 'orders_clean'))
+        validation = processor.validation_results['orders']
+        aggregates = processor.order_aggregates
+        timings['stream'] = time.perf_counter() - start
+    elif dataset_name == 'orders' and _scans(processor.backend, file_path):
+        # The backend reads the file itself: pandas only sees raw rows one
+        # validation batch at a time and gets back the cleaned frame
+        summaries = []
+        with processor._stage('load_datasets') as frame:
+            for batch in processor.backend.read_batches(file_path, dataset_name):
+                summaries.append(processor._validation_summary(batch, dataset_name))
+            frame['rows_out'] = sum(summary['total_records'] for summary in summaries)
+        if not summaries:
+            summaries = [processor._validation_summary(pd.DataFrame(columns=list(DATASET_SCHEMAS[dataset_name])),
+                                                       dataset_name)]
+        validation = processor._merge_validation_summaries(summaries)
+        processor._log_validation(validation)
+        timings['load_validate'] = time.perf_counter() - start
+        
+        # Aggregates are also scanned from the file, so engineer_features
+        # does not reduce the cleaned frame again
+        stage_start = time.perf_counter()
+        aggregates = processor.backend.order_aggregates(file_path)
+        timings['aggregate'] = time.perf_counter() - stage_start
+        
+        stage_start = time.perf_counter()
+        cleaned = processor.clean_orders_data(file_path)
+        timings['clean'] = time.perf_counter() - stage_start
+    else:
+        # _load_dataset is undecorated (load_datasets is the profiled entry point)
+        with processor._stage('load_datasets') as frame:
+            df = processor._load_dataset(dataset_name, file_path, cache_dir)
+            frame['rows_out'] = len(df)
+        timings['load'] = time.perf_counter() - start
+        
+        stage_start = time.perf_counter()
+        validation = processor.validate_data_quality(df, dataset_name)
+        timings['validate'] = time.perf_counter() - stage_start
+        
+        stage_start = time.perf_counter()
+        cleaner = DATASET_CLEANERS.get(dataset_name)
+        cleaned = getattr(processor, cleaner)(df) if cleaner else None
+        timings['clean'] = time.perf_counter() - stage_start
+    
+    stage_log = ' | '.join(f"{stage} {seconds:.3f}s" for stage, seconds in timings.items())
+    logger.info(f"⏱️ {dataset_name}: {stage_log}")
+    return {
+        'name': dataset_name,
+        'validation': validation,
+        'cleaned': cleaned,
+        'parts': parts,
+        'aggregates': aggregates,
+        'memory_report': processor.memory_report.get(dataset_name),
+        'timings': timings,
+        'profile_records': processor.profiler.records if processor.profiler is not None else [],
+    }
+
+def process_sop_data(file_paths: Dict[str, str], chunksize: Optional[int] = None,
+                     cache_dir: Optional[str] = None, memory_optimized: bool = False,
+                     executor: Optional[Union[str, Executor]] = None,
+                     max_workers: Optional[int] = None,
+                     profiler: Optional[StageProfiler] = None,
+                     validation_sample: Optional[Union[int, float]] = None,
+                     backend=None, copy_free: bool = False,
+                     stream_dir: Optional[str] = None) -> Dict[str, pd.DataFrame]:
     """
     Main function to process all S&OP datasets
     
     Args:
         file_paths: Dictionary with dataset names and file paths
+        chunksize: If set, stream Orders in chunks of this many rows. Each
+            chunk is validated, cleaned, folded into the order aggregates
+            and spilled to Parquet before the next is read; a second pass
+            attaches the order features one spilled part at a time. Only
+            the current chunk and the merged aggregates are held in memory,
+            so the result has no 'orders' frame: the engineered orders are
+            written to stream_dir/orders_processed (read them back with
+            storage.read_partitioned). The orders summary row and the
+            duplicate counts in it are merged from the chunks (duplicates
+            within a chunk only).
+        cache_dir: If set, raw datasets are loaded through the columnar cache
+            (see SOpDataProcessor.load_datasets)
+        memory_optimized: Store cleaned datasets with categorical and
+            downcast dtypes (see SOpDataProcessor.optimize_dtypes)
+        executor: Run each dataset's load → validate → clean chain
+            concurrently. 'thread', 'process' or an existing
+            concurrent.futures Executor; None runs them serially.
+        max_workers: Pool size when executor is 'thread' or 'process'
+            (default: one worker per dataset)
+        profiler: Optional StageProfiler; every processor stage is recorded
+            and a per-stage summary is printed (full records via
+            profiler.report() / profiler.to_json())
+        validation_sample: Evaluate data-quality rules on a row sample of
+            this size or fraction (see SOpDataProcessor)
+        backend: Compute backend: None/'pandas' (default), 'duckdb' or an
+            instance (see SOpDataProcessor). With DuckDB, an orders CSV,
+            Parquet file or partitioned directory is validated in batches,
+            cleaned and aggregated inside DuckDB; only the cleaned orders
+            come back. The feature joins onto them still run in pandas
+            (engineer_features), so the cleaned orders must fit in memory;
+            use chunksize when they do not.
+        copy_free: Low-allocation mode relying on copy-on-write instead of
+            defensive copies (see SOpDataProcessor)
+        stream_dir: Where streamed orders are written (with chunksize).
+            Default: a temporary directory removed at the end, i.e. the
+            engineered orders are dropped and only their aggregates,
+            validation results and summary row are kept.
         
     Returns:
-        Dictionary of processed DataFrames
+        Dictionary of processed DataFrames (without 'orders' when streaming)
     """
-    processor = SOpDataProcessor()
+    processor = SOpDataProcessor(memory_optimized=memory_optimized, profiler=profiler,
+                                 validation_sample=validation_sample, backend=backend,
+                                 copy_free=copy_free)
     
-    # Load data
     logger.info("🔄 Starting S&OP data processing pipeline...")
-    raw_data = processor.load_datasets(file_paths)
+    streaming = chunksize is not None and 'orders' in file_paths
+    if streaming:
+        logger.info(f"🌊 Streaming orders in chunks of {chunksize:,} rows")
+    with (tempfile.TemporaryDirectory() if streaming and stream_dir is None else nullcontext(stream_dir)) as stream_dir:
+        return _run_pipeline(processor, file_paths, chunksize, cache_dir, executor, max_workers, stream_dir)
+
+def _run_pipeline(processor: SOpDataProcessor, file_paths: Dict[str, str], chunksize: Optional[int],
+                  cache_dir: Optional[str], executor: Optional[Union[str, Executor]],
+                  max_workers: Optional[int], stream_dir: Optional[str]) -> Dict[str, pd.DataFrame]:
+    from .validation import check_references
     
-    # Validate data quality
-    validation_results = {}
-    for name, df in raw_data.items():
-        validation_results[name] = processor.validate_data_quality(df, name)
+    profiler = processor.profiler
     
-    # Clean individual datasets
-    cleaned_data = {}
+    # Load, validate and clean each dataset (independent until feature engineering)
+    prepare = partial(_prepare_dataset, processor, chunksize=chunksize, cache_dir=cache_dir,
+                      stream_dir=stream_dir)
+    names, paths = list(file_paths), list(file_paths.values())
+    stage_start = time.perf_counter()
     
-    if 'orders' in raw_data:
-        cleaned_data['orders'] = processor.clean_orders_data(raw_data['orders'])
+    if executor is None:
+        results = [prepare(name, path) for name, path in zip(names, paths)]
+    elif isinstance(executor, Executor):
+        results = list(executor.map(prepare, names, paths))
+    elif executor in ('thread', 'process'):
+        pool_class = ThreadPoolExecutor if executor == 'thread' else ProcessPoolExecutor
+        with pool_class(max_workers=max_workers or len(names) or 1) as pool:
+            results = list(pool.map(prepare, names, paths))
+    else:
+        raise ValueError("executor must be None, 'thread', 'process' or a concurrent.futures.Executor")
     
-    if 'inventory' in raw_data:
-        cleaned_data['inventory'] = processor.clean_inventory_data(raw_data['inventory'])
-        
-    if 'forecasts' in raw_data:
-        cleaned_data['forecasts'] = processor.clean_forecasts_data(raw_data['forecasts'])
-        
-    if 'products' in raw_data:
-        cleaned_data['products'] = processor.clean_products_data(raw_data['products'])
+    logger.info(f"⏱️ Load/validate/clean stage: {time.perf_counter() - stage_start:.3f}s "
+                f"({executor or 'serial'})")
+    
+    results_by_name = {result['name']: result for result in results}
+    processor.validation_results = {name: result['validation'] for name, result in results_by_name.items()}
+    cleaned_data = {}
+    for name in DATASET_CLEANERS:
+        if name in results_by_name and results_by_name[name]['parts'] is None:
+            cleaned_data[name] = results_by_name[name]['cleaned']
+    order_parts = results_by_name['orders']['parts'] if 'orders' in results_by_name else None
+    for name, result in results_by_name.items():
+        if result['memory_report'] is not None:
+            processor.memory_report[name] = result['memory_report']
+        if result['aggregates'] is not None:
+            processor.order_aggregates = result['aggregates']
+        if profiler is not None:
+            # Records made in process-pool workers come back as copies
+            profiler.extend([record for record in result['profile_records'] if record['pid'] != os.getpid()])
+    
+    # Referential integrity needs every dataset, so it runs once they are all loaded
+    check_references(cleaned_data, processor.validation_results)
     
     # Feature engineering
-    enhanced_data = processor.engineer_features(cleaned_data)
+    enhanced_data = processor.engineer_features(cleaned_data, aggregates=processor.order_aggregates)
     
     # Create summary statistics
     summary_stats = processor.create_summary_statistics(enhanced_data)
+    if order_parts is not None:
+        # Streamed orders get their features, reference checks and totals part by part
+        orders_row = _engineer_streamed_orders(processor, order_parts, cleaned_data,
+                                               os.path.join(stream_dir, 'orders_processed'))
+        if orders_row is not None:
+            summary_stats = pd.DataFrame([orders_row] + summary_stats.to_dict('records'))
     print("\n" + "="*60)
     print("📊 DATA PROCESSING SUMMARY")
     print("="*60)
     print(summary_stats.to_string(index=False))
     
+    if processor.memory_report:
+        memory_report = pd.DataFrame.from_dict(processor.memory_report, orient='index')
+        print("\n🗜️ MEMORY OPTIMIZATION (MB)")
+        print(memory_report.round(3).to_string())
+    
+    if profiler is not None:
+        print("\n⏱️ STAGE PROFILE")
+        print(profiler.summary().round(4).to_string(index=False))
+    
     logger.info("🎉 S&OP data processing pipeline completed successfully!")
     
     return enhanced_data
 
 # Utility functions
+OUTLIER_THRESHOLDS = {'iqr': 1.5, 'zscore': 3.0, 'mad': 3.5}
+
 def detect_outliers(df: pd.DataFrame, column: str, method: str = 'iqr') -> pd.Series:
     """
     Detect outliers in a numeric column
@@ -433,26 +1346,125 @@ def detect_outliers(df: pd.DataFrame, column: str, method: str = 'iqr') -> pd.Se
     Args:
         df: DataFrame
         column: Column name
-        method: 'iqr' or 'zscore'
+        method: 'iqr', 'zscore' or 'mad'
         
     Returns:
-        Boolean series indicating outliers
+        Boolean series indicating outliers, aligned with df (missing values
+        are never outliers)
+    """
+    return detect_outliers_batch(df, [column], method=method)[column]
+
+def _group_quantiles(values: np.ndarray, codes: np.ndarray, n_groups: int, quantiles: List[float]) -> np.ndarray:
+    """
+    Per-group quantiles for every column of values, shape (len(quantiles), n_groups, n_columns)
+    """
+    frame = pd.DataFrame(values)
+    result = frame.groupby(codes).quantile(quantiles)
+    # Index is (group, quantile); groups with no rows are absent
+    out = np.full((len(quantiles), n_groups, values.shape[1]), np.nan)
+    groups = result.index.get_level_values(0).to_numpy()
+    levels = result.index.get_level_values(1).to_numpy()
+    for i, q in enumerate(quantiles):
+        rows = levels == q
+        out[i, groups[rows]] = result.to_numpy()[rows]
+    return out
+
+def _outlier_bounds(values: np.ndarray, codes: np.ndarray, n_groups: int, method: str,
+                    threshold: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Lower/upper outlier bounds per group and column, shape (n_groups, n_columns)
     """
     if method == 'iqr':
-        Q1 = df[column].quantile(0.25)
-        Q3 = df[column].quantile(0.75)
-        IQR = Q3 - Q1
-        lower_bound = Q1 - 1.5 * IQR
-        upper_bound = Q3 + 1.5 * IQR
-        return (df[column] < lower_bound) | (df[column] > upper_bound)
-    
-    elif method == 'zscore':
-        from scipy import stats
-        z_scores = np.abs(stats.zscore(df[column].dropna()))
-        return z_scores > 3
+        q1, q3 = _group_quantiles(values, codes, n_groups, [0.25, 0.75])
+        iqr = q3 - q1
+        return q1 - threshold * iqr, q3 + threshold * iqr
+    
+    if method == 'zscore':
+        valid = ~np.isnan(values)
+        filled = np.where(valid, values, 0.0)
+        n_columns = values.shape[1]
+        counts = np.stack([np.bincount(codes, weights=valid[:, j], minlength=n_groups)
+                           for j in range(n_columns)], axis=1)
+        sums = np.stack([np.bincount(codes, weights=filled[:, j], minlength=n_groups)
+                         for j in range(n_columns)], axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = sums / counts
+            deviations = np.where(valid, values - means[codes], 0.0)
+            m2 = np.stack([np.bincount(codes, weights=deviations[:, j] ** 2, minlength=n_groups)
+                           for j in range(n_columns)], axis=1)
+            std = np.sqrt(m2 / counts)
+        std[std == 0] = np.nan
+        return means - threshold * std, means + threshold * std
+    
+    (medians,) = _group_quantiles(values, codes, n_groups, [0.5])
+    (mad,) = _group_quantiles(np.abs(values - medians[codes]), codes, n_groups, [0.5])
+    mad[mad == 0] = np.nan
+    spread = threshold * mad / 0.6745
+    return medians - spread, medians + spread
+
+def detect_outliers_batch(df: pd.DataFrame, columns: List[str], by: Optional[Union[str, List[str]]] = None,
+                          method: str = 'iqr', threshold: Optional[float] = None,
+                          min_group_size: int = 1) -> pd.DataFrame:
+    """
+    Flag outliers in several columns at once, with thresholds per group
+    
+    Group statistics for all columns are computed in one grouped reduction
+    and broadcast back to the rows through integer group codes, so the cost
+    does not depend on the number of groups.
+    
+    Args:
+        df: DataFrame
+        columns: Numeric columns to check (e.g. ['qty', 'order_value', 'unit_price', 'discount_pct'])
+        by: Grouping column(s) such as 'product_id' or ['product_id', 'region']; None for global bounds
+        method: 'iqr' (Q1/Q3 ± k·IQR), 'zscore' (|x - mean| / std > k) or
+            'mad' (robust z-score 0.6745·|x - median| / MAD > k)
+        threshold: k for the chosen method (defaults: 1.5, 3, 3.5)
+        min_group_size: Groups with fewer rows use the global bounds instead
+        
+    Returns:
+        Boolean DataFrame with one column per checked column, aligned with df
+    """
+    if method not in OUTLIER_THRESHOLDS:
+        raise ValueError("Method must be 'iqr', 'zscore' or 'mad'")
+    threshold = OUTLIER_THRESHOLDS[method] if threshold is None else threshold
     
+    values = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    if by is None:
+        codes = np.zeros(len(df), dtype=np.intp)
     else:
-        raise ValueError("Method must be 'iqr' or 'zscore'")
+        codes = df.groupby(by, sort=False, observed=True, dropna=False).ngroup().to_numpy()
+    n_groups = int(codes.max()) + 1 if len(codes) else 0
+    
+    lower, upper = _outlier_bounds(values, codes, n_groups, method, threshold)
+    
+    # Groups below min_group_size fall back to the global bounds
+    if by is not None and min_group_size > 1:
+        small = np.bincount(codes, minlength=n_groups) < min_group_size
+        if small.any():
+            global_lower, global_upper = _outlier_bounds(values, np.zeros(len(df), dtype=np.intp), 1,
+                                                         method, threshold)
+            lower[small], upper[small] = global_lower[0], global_upper[0]
+    
+    with np.errstate(invalid='ignore'):
+        mask = (values < lower[codes]) | (values > upper[codes])
+    return pd.DataFrame(mask, index=df.index, columns=columns)
+
+def dataset_fingerprint(df: pd.DataFrame, columns: Optional[List[str]] = None) -> str:
+    """
+    Content hash of a DataFrame, used to version cached aggregates
+    
+    Args:
+        df: DataFrame
+        columns: Only hash these columns (missing ones are ignored)
+        
+    Returns:
+        Hex digest that changes whenever values, columns or dtypes change
+    """
+    subset = df if columns is None else df[[col for col in columns if col in df.columns]]
+    digest = hashlib.sha1()
+    digest.update(pd.util.hash_pandas_object(subset, index=False).to_numpy().tobytes())
+    digest.update(repr(list(zip(subset.columns, subset.dtypes.astype(str)))).encode())
+    return digest.hexdigest()
 
 def create_data_profile(df: pd.DataFrame, dataset_name: str) -> Dict[str, any]:
     """
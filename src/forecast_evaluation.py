@@ -0,0 +1,195 @@
+"""
+S&OP Forecast Evaluation Module
+===============================
+
+Forecast accuracy metrics on the Forecasts schema (forecast_qty,
+actual_demand, forecast_type, confidence_level), computed with grouped
+NumPy reductions so thousands of SKUs and model versions stay cheap.
+
+Errors are actual_demand - forecast_qty, the same sign as variance_pct:
+positive means the forecast was too low.
+
+Functions:
+- forecast_error_sums: additive per-group error sums (mergeable)
+- evaluate_forecasts: WAPE, MAPE, bias and MAD per group
+- tracking_signal: cumulative or rolling tracking signal per series
+"""
+
+import logging
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Default evaluation grain: SKU x month x forecast type
+FORECAST_KEYS = ['product_id', 'forecast_month', 'forecast_type']
+SERIES_KEYS = ['product_id', 'forecast_type']
+
+# |tracking signal| above this flags a biased forecast
+TRACKING_SIGNAL_LIMIT = 4.0
+
+ERROR_SUM_COLUMNS = ['n', 'n_mape', 'actual_sum', 'forecast_sum', 'error_sum', 'abs_error_sum', 'ape_sum']
+
+
+def _group_codes(df: pd.DataFrame, by: List[str]) -> Tuple[np.ndarray, pd.Index]:
+    """
+    Integer group codes per row (sorted key order) and the matching key index
+    """
+    grouper = df.groupby(by, sort=True, observed=True, dropna=False)
+    return grouper.ngroup().to_numpy(), grouper.size().index
+
+
+def _errors(forecasts: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    actual = forecasts['actual_demand'].to_numpy(dtype=np.float64, na_value=np.nan)
+    forecast = forecasts['forecast_qty'].to_numpy(dtype=np.float64, na_value=np.nan)
+    return actual, forecast
+
+
+def forecast_error_sums(forecasts: pd.DataFrame, by: Union[str, List[str]] = FORECAST_KEYS) -> pd.DataFrame:
+    """
+    Additive error sums per group
+
+    Sums (not ratios) can be added across batches or model runs before
+    calling forecast_metrics_from_sums. Rows missing either quantity are
+    ignored; MAPE terms skip rows with zero actual demand.
+
+    Args:
+        forecasts: Frame with forecast_qty, actual_demand and the by columns
+        by: Grouping column(s)
+
+    Returns:
+        One row per group, indexed by the keys, with ERROR_SUM_COLUMNS
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    codes, index = _group_codes(forecasts, by)
+    actual, forecast = _errors(forecasts)
+
+    valid = ~(np.isnan(actual) | np.isnan(forecast)) & (codes >= 0)
+    codes, actual, forecast = codes[valid], actual[valid], forecast[valid]
+    error = actual - forecast
+    abs_error = np.abs(error)
+    has_actual = actual != 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ape = np.where(has_actual, abs_error / np.abs(actual), 0.0)
+
+    n_groups = len(index)
+    sums = {
+        'n': np.bincount(codes, minlength=n_groups),
+        'n_mape': np.bincount(codes, weights=has_actual, minlength=n_groups).astype(np.int64),
+        'actual_sum': np.bincount(codes, weights=actual, minlength=n_groups),
+        'forecast_sum': np.bincount(codes, weights=forecast, minlength=n_groups),
+        'error_sum': np.bincount(codes, weights=error, minlength=n_groups),
+        'abs_error_sum': np.bincount(codes, weights=abs_error, minlength=n_groups),
+        'ape_sum': np.bincount(codes, weights=ape, minlength=n_groups),
+    }
+    return pd.DataFrame(sums, index=index, columns=ERROR_SUM_COLUMNS)
+
+
+def forecast_metrics_from_sums(sums: pd.DataFrame) -> pd.DataFrame:
+    """
+    Accuracy metrics from forecast_error_sums output
+
+    - wape_pct: sum |error| / sum actual x 100
+    - mape_pct: mean of |error| / actual x 100 (rows with actual > 0)
+    - bias_pct: sum error / sum actual x 100 (positive = under-forecast)
+    - mad: mean |error| in units
+    - forecast_accuracy: 100 - wape_pct
+    """
+    metrics = sums.copy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        actual_sum = sums['actual_sum'].where(sums['actual_sum'] != 0)
+        metrics['wape_pct'] = sums['abs_error_sum'] / actual_sum * 100
+        metrics['mape_pct'] = sums['ape_sum'] / sums['n_mape'].where(sums['n_mape'] > 0) * 100
+        metrics['bias_pct'] = sums['error_sum'] / actual_sum * 100
+        metrics['mad'] = sums['abs_error_sum'] / sums['n'].where(sums['n'] > 0)
+    metrics['forecast_accuracy'] = 100 - metrics['wape_pct']
+    return metrics
+
+
+def evaluate_forecasts(forecasts: pd.DataFrame, by: Union[str, List[str]] = FORECAST_KEYS) -> pd.DataFrame:
+    """
+    WAPE, MAPE, bias and MAD per group
+
+    Args:
+        forecasts: Forecasts frame (raw or cleaned)
+        by: Grouping column(s); add a model/version column to compare
+            several forecast runs in one pass, or use ['forecast_type'] for
+            a portfolio view
+
+    Returns:
+        One row per group with the keys as columns, the error sums and the
+        metrics from forecast_metrics_from_sums
+    """
+    metrics = forecast_metrics_from_sums(forecast_error_sums(forecasts, by)).reset_index()
+    logger.info(f"🎯 Evaluated {len(forecasts):,} forecasts across {len(metrics):,} groups")
+    return metrics
+
+
+def _rolling_group_sums(values: np.ndarray, starts: np.ndarray, positions: np.ndarray,
+                        window: Optional[int]) -> np.ndarray:
+    """
+    Cumulative (window=None) or trailing-window sums that restart per group
+
+    Rows must be sorted by group; starts is each row's group start offset and
+    positions its offset within the group.
+    """
+    cumulative = np.cumsum(values)
+    before = np.concatenate(([0.0], cumulative))
+    sums = cumulative - before[starts]
+    if window is not None:
+        lagged = np.arange(len(values)) - window
+        inside = positions >= window
+        sums[inside] = cumulative[inside] - cumulative[lagged[inside]]
+    return sums
+
+
+def tracking_signal(forecasts: pd.DataFrame, series: Sequence[str] = SERIES_KEYS,
+                    period: str = 'forecast_month', window: Optional[int] = None,
+                    limit: float = TRACKING_SIGNAL_LIMIT) -> pd.DataFrame:
+    """
+    Tracking signal (running sum of errors / MAD) per series and period
+
+    Errors are first summed per series x period. The running sum of errors
+    (RSFE) and the MAD are then taken over all periods so far, or over the
+    last ``window`` observed periods, restarting for every series.
+
+    Args:
+        forecasts: Forecasts frame
+        series: Columns identifying a forecast series (e.g. SKU x type, plus
+            a model version column)
+        period: Time column; periods are ordered by this column
+        window: Trailing window in periods (None = cumulative)
+        limit: |tracking_signal| above which out_of_control is set
+
+    Returns:
+        One row per series x period with error, rsfe, mad, tracking_signal
+        and out_of_control
+    """
+    series = list(series)
+    if window is not None and window < 1:
+        raise ValueError("window must be a positive number of periods")
+
+    # Sorted grouping puts each series' periods in time order
+    sums = forecast_error_sums(forecasts, series + [period])
+    result = sums[['n', 'actual_sum', 'forecast_sum', 'error_sum']].rename(columns={'error_sum': 'error'})
+    result = result.reset_index()
+
+    series_codes, _ = _group_codes(result, series)
+    boundaries = np.flatnonzero(np.diff(series_codes, prepend=-1) != 0)
+    group_sizes = np.diff(np.append(boundaries, len(result)))
+    starts = np.repeat(boundaries, group_sizes)
+    positions = np.arange(len(result)) - starts
+
+    error = result['error'].to_numpy(dtype=np.float64)
+    periods_seen = positions + 1 if window is None else np.minimum(positions + 1, window)
+    result['rsfe'] = _rolling_group_sums(error, starts, positions, window)
+    result['mad'] = _rolling_group_sums(np.abs(error), starts, positions, window) / periods_seen
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result['tracking_signal'] = np.where(result['mad'] > 0, result['rsfe'] / result['mad'], np.nan)
+    result['out_of_control'] = result['tracking_signal'].abs() > limit
+
+    flagged = result.loc[result['out_of_control'], series].drop_duplicates()
+    logger.info(f"📉 Tracking signal: {len(flagged):,} series beyond ±{limit:g}")
+    return result
@@ -0,0 +1,281 @@
+"""
+S&OP Forecasting Module
+=======================
+
+Baseline statistical demand forecasts for every SKU at once.
+
+Monthly demand is laid out as a SKU x month matrix and each model runs as a
+recursion over months with all SKUs updated together, so the cost grows with
+the number of months rather than with a per-SKU Python loop.
+
+Functions:
+- build_demand_matrix: monthly demand per product_id from orders
+- seasonal_naive, exponential_smoothing, croston: vectorised models
+- forecast_demand: backtest + future forecasts in the Forecasts.csv layout
+"""
+
+import logging
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .data_processing import DATASET_SCHEMAS
+
+logger = logging.getLogger(__name__)
+
+FORECAST_METHODS = ['auto', 'seasonal_naive', 'ses', 'croston']
+
+# Output layout of forecast_demand (the raw Forecasts.csv columns)
+FORECASTS_COLUMNS = list(DATASET_SCHEMAS['forecasts'])
+
+# Average demand interval above which a series is treated as intermittent
+# (Syntetos-Boylan cut-off)
+INTERMITTENT_ADI = 1.32
+
+# Smoothing constants tried per SKU by exponential_smoothing
+SES_ALPHAS = np.round(np.linspace(0.05, 0.95, 19), 2)
+
+# In-sample WAPE (%) limits for the confidence_level label
+CONFIDENCE_WAPE_LIMITS = {'High': 20.0, 'Medium': 40.0}
+
+
+def build_demand_matrix(orders: pd.DataFrame, value_column: str = 'qty',
+                        date_column: str = 'order_date') -> Tuple[np.ndarray, pd.Index, pd.PeriodIndex]:
+    """
+    Monthly demand per SKU as a dense matrix
+
+    Args:
+        orders: Orders frame (raw or cleaned)
+        value_column: Quantity to sum
+        date_column: Order date column
+
+    Returns:
+        (matrix of shape (n_skus, n_months), sorted product_id index,
+        consecutive monthly PeriodIndex); months without orders are 0.
+        Without any dated order the matrix has shape (0, 0).
+    """
+    months = pd.to_datetime(orders[date_column]).dt.to_period('M')
+    valid = months.notna().to_numpy() & orders['product_id'].notna().to_numpy()
+    if not valid.any():
+        return (np.zeros((0, 0)), pd.Index([], dtype=orders['product_id'].dtype, name='product_id'),
+                pd.PeriodIndex([], freq='M'))
+    months = months[valid]
+    sku_codes, skus = pd.factorize(orders['product_id'][valid], sort=True)
+    periods = pd.period_range(months.min(), months.max(), freq='M')
+
+    month_codes = (months.dt.year.to_numpy() - periods[0].year) * 12 + months.dt.month.to_numpy() - periods[0].month
+    values = orders[value_column].to_numpy(dtype=np.float64, na_value=0.0)[valid]
+    flat = np.bincount(sku_codes * len(periods) + month_codes, weights=values,
+                       minlength=len(skus) * len(periods))
+    return flat.reshape(len(skus), len(periods)), pd.Index(skus, name='product_id'), periods
+
+
+def seasonal_naive(demand: np.ndarray, horizon: int, season_length: int = 12) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Repeat the value from one season earlier
+
+    Series shorter than one season fall back to the naive (last value)
+    forecast.
+
+    Returns:
+        (one-step-ahead fitted values, NaN where undefined; future
+        forecasts of shape (n_skus, horizon))
+    """
+    n_periods = demand.shape[1]
+    lag = season_length if n_periods > season_length else 1
+    fitted = np.full(demand.shape, np.nan)
+    fitted[:, lag:] = demand[:, :-lag]
+    future_idx = n_periods - lag + np.arange(horizon) % lag
+    return fitted, demand[:, future_idx]
+
+
+def exponential_smoothing(demand: np.ndarray, horizon: int,
+                          alphas: Sequence[float] = SES_ALPHAS) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Simple exponential smoothing with a per-SKU smoothing constant
+
+    Every alpha in the grid is run for every SKU in one pass (an
+    alphas x SKUs level matrix). Each SKU keeps the alpha with the lowest
+    one-step-ahead squared error.
+
+    Returns:
+        (fitted values, future forecasts (flat), chosen alpha per SKU)
+    """
+    demand = np.asarray(demand, dtype=np.float64)
+    grid = np.asarray(alphas, dtype=np.float64)[:, None]
+    n_skus, n_periods = demand.shape
+    # First pass scores every alpha; only the squared errors are kept
+    level = np.broadcast_to(demand[:, 0], (len(grid), n_skus)).copy()
+    sse = np.zeros((len(grid), n_skus))
+    for t in range(1, n_periods):
+        error = demand[:, t] - level
+        sse += error ** 2
+        level += grid * error
+    chosen = grid[np.argmin(sse, axis=0), 0]
+
+    # Second pass keeps the fitted values for the chosen alpha only
+    fitted = np.full(demand.shape, np.nan)
+    level = demand[:, 0].copy()
+    for t in range(1, n_periods):
+        fitted[:, t] = level
+        level += chosen * (demand[:, t] - level)
+    return fitted, np.repeat(level[:, None], horizon, axis=1), chosen
+
+
+def croston(demand: np.ndarray, horizon: int, alpha: float = 0.1,
+            bias_correction: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Croston's method for intermittent demand
+
+    Non-zero demand sizes and the intervals between them are smoothed
+    separately; the forecast rate is size / interval. With bias_correction
+    the Syntetos-Boylan (SBA) factor 1 - alpha / 2 is applied.
+
+    Returns:
+        (fitted values, NaN before a SKU's first demand; future forecasts)
+    """
+    demand = np.asarray(demand, dtype=np.float64)
+    n_skus, n_periods = demand.shape
+    factor = 1 - alpha / 2 if bias_correction else 1.0
+    size = np.full(n_skus, np.nan)
+    interval = np.full(n_skus, np.nan)
+    since_last = np.ones(n_skus)
+    fitted = np.full(demand.shape, np.nan)
+
+    for t in range(n_periods):
+        fitted[:, t] = factor * size / interval
+        observed = demand[:, t]
+        positive = observed > 0
+        first = positive & np.isnan(size)
+        update = positive & ~first
+        size = np.where(first, observed, np.where(update, size + alpha * (observed - size), size))
+        interval = np.where(first, since_last,
+                            np.where(update, interval + alpha * (since_last - interval), interval))
+        since_last = np.where(positive, 1.0, since_last + 1)
+
+    future = np.repeat((factor * size / interval)[:, None], horizon, axis=1)
+    return fitted, future
+
+
+def average_demand_interval(demand: np.ndarray) -> np.ndarray:
+    """
+    Periods per non-zero demand for each SKU (inf for SKUs without demand)
+    """
+    nonzero = (demand > 0).sum(axis=1)
+    with np.errstate(divide='ignore'):
+        return demand.shape[1] / nonzero
+
+
+def _fit(demand: np.ndarray, method: str, horizon: int, season_length: int,
+         croston_alpha: float) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    fits = {}
+    if method == 'seasonal_naive':
+        fits['seasonal_naive'] = seasonal_naive(demand, horizon, season_length)
+    if method in ('ses', 'auto'):
+        fitted, future, _ = exponential_smoothing(demand, horizon)
+        fits['ses'] = (fitted, future)
+    if method in ('croston', 'auto'):
+        fits['croston'] = croston(demand, horizon, alpha=croston_alpha)
+    return fits
+
+
+def _confidence_levels(actual: np.ndarray, fitted: np.ndarray) -> np.ndarray:
+    valid = ~np.isnan(fitted)
+    abs_error = np.where(valid, np.abs(actual - fitted), 0.0).sum(axis=1)
+    total = np.where(valid, actual, 0.0).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        wape = np.where(total > 0, abs_error / total * 100, np.inf)
+    return np.where(wape <= CONFIDENCE_WAPE_LIMITS['High'], 'High',
+                    np.where(wape <= CONFIDENCE_WAPE_LIMITS['Medium'], 'Medium', 'Low'))
+
+
+def forecast_demand(orders: pd.DataFrame, horizon: int = 3, method: str = 'auto', season_length: int = 12,
+                    croston_alpha: float = 0.1, include_history: bool = True,
+                    forecast_type: str = 'Statistical') -> pd.DataFrame:
+    """
+    Statistical forecasts for all SKUs in the Forecasts.csv layout
+
+    History rows hold the one-step-ahead (backtest) forecast for each
+    observed month next to its actual demand, like Forecasts.csv. Future
+    rows cover the next ``horizon`` months with actual_demand and
+    variance_pct left empty. The frame can go straight to
+    clean_forecasts_data or forecast_evaluation.
+
+    Args:
+        orders: Orders frame with product_id, order_date and qty
+        horizon: Months to forecast beyond the last order month
+        method: 'seasonal_naive', 'ses', 'croston' or 'auto'. 'auto' uses
+            Croston (SBA) when a SKU's average demand interval exceeds
+            INTERMITTENT_ADI and exponential smoothing otherwise.
+        season_length: Season length in months for seasonal_naive
+        croston_alpha: Smoothing constant for Croston
+        include_history: Include the backtest rows
+        forecast_type: Label for the forecast_type column
+
+    Returns:
+        FORECASTS_COLUMNS plus a 'model' column naming the model per row
+        (empty when no order has a date)
+    """
+    if method not in FORECAST_METHODS:
+        raise ValueError(f"method must be one of {FORECAST_METHODS}")
+
+    demand, skus, periods = build_demand_matrix(orders)
+    if len(periods) == 0:
+        logger.warning("⚠️ No dated orders to forecast from")
+        return pd.DataFrame(columns=FORECASTS_COLUMNS + ['model'])
+    fits = _fit(demand, method, horizon, season_length, croston_alpha)
+
+    if method == 'auto':
+        intermittent = average_demand_interval(demand) > INTERMITTENT_ADI
+        fitted = np.where(intermittent[:, None], fits['croston'][0], fits['ses'][0])
+        future = np.where(intermittent[:, None], fits['croston'][1], fits['ses'][1])
+        models = np.where(intermittent, 'croston', 'ses')
+    else:
+        fitted, future = fits[method]
+        models = np.full(len(skus), method)
+
+    confidence = _confidence_levels(demand, fitted)
+    future_periods = pd.period_range(periods[-1] + 1, periods=horizon, freq='M')
+
+    frames = []
+    if include_history:
+        frames.append(_forecast_frame(skus, periods, fitted, demand, models, confidence, forecast_type))
+    frames.append(_forecast_frame(skus, future_periods, future, None, models, confidence, forecast_type))
+    result = pd.concat(frames, ignore_index=True)
+
+    logger.info(f"📈 Forecast {len(skus):,} SKUs x {horizon} months ({method}): "
+                f"{pd.Series(models).value_counts().to_dict()}")
+    return result
+
+
+def _forecast_frame(skus: pd.Index, periods: pd.PeriodIndex, forecast: np.ndarray, actual: Optional[np.ndarray],
+                    models: np.ndarray, confidence: np.ndarray, forecast_type: str) -> pd.DataFrame:
+    """
+    Long SKU x month frame; months without a defined forecast are dropped
+    """
+    n_skus, n_periods = forecast.shape
+    keep = ~np.isnan(forecast).ravel()
+    forecast_qty = np.maximum(np.rint(forecast.ravel()[keep]), 0).astype(np.int64)
+    if actual is not None:
+        actual_demand = actual.ravel()[keep].astype(np.int64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variance_pct = np.where(forecast_qty > 0,
+                                    ((actual_demand - forecast_qty) / forecast_qty * 100).round(2), np.nan)
+    else:
+        actual_demand = np.full(keep.sum(), np.nan)
+        variance_pct = np.full(keep.sum(), np.nan)
+
+    sku_idx = np.repeat(np.arange(n_skus), n_periods)[keep]
+    month_labels = np.asarray(periods.strftime('%Y-%m-01'), dtype=object)
+    frame = pd.DataFrame({
+        'product_id': skus.to_numpy()[sku_idx],
+        'forecast_month': month_labels[np.tile(np.arange(n_periods), n_skus)[keep]],
+        'forecast_qty': forecast_qty,
+        'actual_demand': actual_demand,
+        'variance_pct': variance_pct,
+        'forecast_type': forecast_type,
+        'confidence_level': confidence[sku_idx],
+    }, columns=FORECASTS_COLUMNS)
+    frame['model'] = models[sku_idx]
+    return frame
@@ -0,0 +1,284 @@
+"""
+S&OP Inventory Simulation Module
+================================
+
+Monte Carlo projection of every SKU x warehouse stock position under
+demand uncertainty.
+
+Demand for each future month is the SKU's latest forecast times (1 + e).
+The relative forecast error e is drawn either by resampling the SKU's
+historical errors in Forecasts ('empirical') or from a normal with their
+mean and standard deviation ('normal'). SKUs without forecast history
+use the errors pooled over all SKUs. available_qty is projected forward
+as a (SKU x scenario x month) array with unmet demand backordered, so a
+position stocks out in a scenario when its projected stock goes negative.
+
+Work is split into blocks of rows x scenarios. Each block draws from its
+own seed derived from (seed, row block, scenario block), so results do
+not depend on the executor or the worker count, and memory per block is
+bounded by chunk_rows x chunk_scenarios x horizon. Each block is handed
+only its rows' inputs (and error samples) and returns per-row sums, so
+process-pool traffic scales with the block, not the inventory.
+
+Functions:
+- forecast_error_samples: relative forecast errors per SKU from Forecasts
+- simulate_inventory: stockout probability, shortage and excess per SKU x warehouse
+"""
+
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .inventory_policy import DAYS_PER_MONTH, daily_demand_stats
+
+logger = logging.getLogger(__name__)
+
+ERROR_MODELS = ('empirical', 'normal')
+
+# Per-row sums returned by every block
+_SUMS = ['stockouts', 'shortage', 'ending', 'ending_sq', 'excess_count', 'excess']
+
+
+def forecast_error_samples(forecasts: pd.DataFrame,
+                           forecast_type: Optional[str] = None) -> Tuple[np.ndarray, pd.DataFrame]:
+    """
+    Relative forecast errors (actual - forecast) / forecast per SKU
+
+    Rows without a positive forecast or with a missing actual are skipped.
+
+    Args:
+        forecasts: Forecasts frame
+        forecast_type: Only use this forecast_type (default: all)
+
+    Returns:
+        (errors grouped by SKU, frame indexed by product_id with offset and
+        count into the errors plus error_mean, error_std and
+        latest_forecast: mean forecast_qty of the SKU's latest month)
+    """
+    if forecast_type is not None:
+        forecasts = forecasts[forecasts['forecast_type'] == forecast_type]
+    forecast = forecasts['forecast_qty'].to_numpy(dtype=np.float64, na_value=np.nan)
+    actual = forecasts['actual_demand'].to_numpy(dtype=np.float64, na_value=np.nan)
+    months = pd.to_datetime(forecasts['forecast_month']).to_numpy()
+    codes, skus = pd.factorize(forecasts['product_id'], sort=True)
+
+    with np.errstate(invalid='ignore'):
+        valid = (codes >= 0) & (forecast > 0) & ~np.isnan(actual)
+    order = np.argsort(codes[valid], kind='stable')
+    errors = ((actual[valid] - forecast[valid]) / forecast[valid])[order]
+    error_codes = codes[valid][order]
+    counts = np.bincount(error_codes, minlength=len(skus))
+    sums = np.bincount(error_codes, weights=errors, minlength=len(skus))
+    sums_sq = np.bincount(error_codes, weights=errors ** 2, minlength=len(skus))
+
+    # Latest forecast month per SKU, averaged over the forecast types in it
+    keyed = codes >= 0
+    latest = pd.Series(months[keyed]).groupby(codes[keyed]).transform('max').to_numpy()
+    in_latest = months[keyed] == latest
+    latest_codes = codes[keyed][in_latest]
+    latest_forecast = (np.bincount(latest_codes, weights=np.nan_to_num(forecast[keyed][in_latest]),
+                                   minlength=len(skus))
+                       / np.maximum(np.bincount(latest_codes, minlength=len(skus)), 1))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = sums / counts
+        std = np.sqrt(np.maximum(sums_sq / counts - mean ** 2, 0))
+    summary = pd.DataFrame({
+        'offset': np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.int64) if len(skus) else [],
+        'count': counts,
+        'error_mean': mean,
+        'error_std': std,
+        'latest_forecast': latest_forecast,
+    }, index=pd.Index(skus, name='product_id'))
+    return errors, summary
+
+
+def _row_block(start: int, end: int, errors: np.ndarray, offsets: np.ndarray, counts: np.ndarray,
+               error_model: str, **columns: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Rows [start, end) of the per-row arrays a block needs
+
+    For the empirical model the block also gets only the error samples its
+    rows draw from, with offsets into that local copy, so a process-pool
+    task pickles one row block instead of every position's arrays.
+    """
+    rows = slice(start, end)
+    block = {name: values[rows] for name, values in columns.items()}
+    if error_model == 'empirical':
+        segments, first, local = np.unique(offsets[rows], return_index=True, return_inverse=True)
+        lengths = counts[rows][first]
+        block['errors'] = np.concatenate([errors[offset:offset + length]
+                                          for offset, length in zip(segments, lengths)])
+        block['offsets'] = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(np.int64)[local]
+        block['counts'] = counts[rows]
+    return block
+
+
+def _simulate_block(unit: Tuple[int, int, int, int, int, Dict[str, np.ndarray]], horizon: int,
+                    error_model: str, seed: int) -> Tuple[int, int, Dict[str, np.ndarray]]:
+    """
+    Per-row sums for one rows x scenarios block
+
+    Module-level so it can be shipped to a process pool.
+    """
+    row_block, scenario_block, start, end, n_scenarios, block = unit
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(row_block, scenario_block)))
+    shape = (end - start, n_scenarios, horizon)
+
+    if error_model == 'normal':
+        demand = rng.standard_normal(shape)
+        demand *= block['error_std'][:, None, None]
+        demand += block['error_mean'][:, None, None]
+    else:
+        draws = rng.random(shape)
+        draws *= block['counts'][:, None, None]
+        demand = block['errors'][block['offsets'][:, None, None] + draws.astype(np.int64)]
+    demand += 1.0
+    demand *= block['base'][:, None, None]
+    np.maximum(demand, 0.0, out=demand)
+
+    # Projected stock after each month (backorders go negative)
+    stock = np.cumsum(demand, axis=2, out=demand)
+    np.negative(stock, out=stock)
+    stock += block['available'][:, None, None]
+    stock += block['receipts'][:, None, None] * np.arange(1, horizon + 1)
+
+    ending = stock[:, :, -1]
+    above = ending - block['excess_level'][:, None]
+    sums = {
+        'stockouts': (stock.min(axis=2) < 0).sum(axis=1),
+        'shortage': np.maximum(-ending, 0).sum(axis=1),
+        'ending': ending.sum(axis=1),
+        'ending_sq': (ending ** 2).sum(axis=1),
+        'excess_count': (above > 0).sum(axis=1),
+        'excess': np.maximum(above, 0).sum(axis=1),
+    }
+    return start, end, sums
+
+
+def simulate_inventory(inventory: pd.DataFrame, forecasts: pd.DataFrame, orders: Optional[pd.DataFrame] = None,
+                       horizon: int = 3, n_scenarios: int = 10_000, error_model: str = 'empirical',
+                       forecast_type: Optional[str] = None, receipts: Union[float, str, None] = None,
+                       excess_days: float = 90.0, seed: int = 0, chunk_rows: int = 256,
+                       chunk_scenarios: int = 1000, executor: Optional[Union[str, Executor]] = None,
+                       max_workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    Monte Carlo stockout and excess risk per SKU x warehouse
+
+    Monthly demand per position is the SKU's latest forecast split evenly
+    over the warehouses stocking it (as in inventory_policy). SKUs without
+    forecasts fall back to their order rate when orders are given, else
+    zero demand.
+
+    Args:
+        inventory: Inventory frame (product_id, warehouse, available_qty)
+        forecasts: Forecasts frame (forecast history and latest forecast)
+        orders: Orders frame for SKUs without forecasts
+        horizon: Months to project
+        n_scenarios: Demand paths per position
+        error_model: 'empirical' (resample historical errors) or 'normal'
+        forecast_type: Only use this forecast_type's forecasts and errors
+        receipts: Units received per month, a number or an inventory column
+        excess_days: Ending stock above this many days of forecast demand
+            counts as excess
+        seed: Base seed; results are reproducible for a given seed,
+            chunk_rows and chunk_scenarios
+        chunk_rows, chunk_scenarios: Block size (memory per block is about
+            8 bytes x rows x scenarios x horizon)
+        executor: None (serial), 'thread', 'process' or a
+            concurrent.futures.Executor
+        max_workers: Pool size when executor is 'thread' or 'process'
+
+    Returns:
+        Copy of inventory with monthly_demand_forecast, stockout_probability
+        (stock below zero in any month), expected_shortage (backordered units
+        at the horizon), expected_ending_stock, ending_stock_std,
+        excess_probability and expected_excess (units above the excess level)
+    """
+    if error_model not in ERROR_MODELS:
+        raise ValueError(f"error_model must be one of {ERROR_MODELS}")
+    if horizon < 1 or n_scenarios < 1:
+        raise ValueError("horizon and n_scenarios must be positive")
+
+    result = inventory.copy()
+    n_rows = len(result)
+    errors, summary = forecast_error_samples(forecasts, forecast_type)
+    positions = summary.index.get_indexer(result['product_id'])
+    found = positions >= 0
+    has_errors = found & (summary['count'].to_numpy()[positions] > 0)
+
+    # Latest forecast, else the order rate
+    base = np.zeros(n_rows)
+    base[found] = summary['latest_forecast'].to_numpy()[positions[found]]
+    if orders is not None and not found.all():
+        rates = daily_demand_stats(orders)['daily_demand_mean']
+        rate_positions = rates.index.get_indexer(result['product_id'])
+        fallback = ~found & (rate_positions >= 0)
+        base[fallback] = rates.to_numpy()[rate_positions[fallback]] * DAYS_PER_MONTH
+    share = 1.0 / result.groupby('product_id', sort=False)['product_id'].transform('size').to_numpy()
+    base *= share
+
+    # Rows without error history point at the pooled errors appended at the end
+    pooled_offset = len(errors)
+    errors = np.concatenate([errors, errors]) if len(errors) else np.zeros(1)
+    offsets = np.full(n_rows, pooled_offset, dtype=np.int64)
+    counts = np.full(n_rows, max(pooled_offset, 1), dtype=np.int64)
+    offsets[has_errors] = summary['offset'].to_numpy()[positions[has_errors]]
+    counts[has_errors] = summary['count'].to_numpy()[positions[has_errors]]
+    pooled = errors[pooled_offset:]
+    error_mean = np.full(n_rows, pooled.mean())
+    error_std = np.full(n_rows, pooled.std())
+    error_mean[has_errors] = summary['error_mean'].to_numpy()[positions[has_errors]]
+    error_std[has_errors] = summary['error_std'].to_numpy()[positions[has_errors]]
+
+    available = result['available_qty'].to_numpy(dtype=np.float64, na_value=0.0)
+    incoming = (result[receipts].to_numpy(dtype=np.float64, na_value=0.0) if isinstance(receipts, str)
+                else np.full(n_rows, float(receipts or 0.0)))
+    excess_level = base * excess_days / DAYS_PER_MONTH
+
+    # (row block, scenario block, first row, end row, scenarios in the block, row block arrays)
+    units = []
+    for row_block, start in enumerate(range(0, n_rows, chunk_rows)):
+        end = min(start + chunk_rows, n_rows)
+        block = _row_block(start, end, errors, offsets, counts, error_model, base=base, available=available,
+                           receipts=incoming, excess_level=excess_level, error_mean=error_mean,
+                           error_std=error_std)
+        units += [(row_block, scenario_block, start, end, min(chunk_scenarios, n_scenarios - scenario_start), block)
+                  for scenario_block, scenario_start in enumerate(range(0, n_scenarios, chunk_scenarios))]
+    simulate = partial(_simulate_block, horizon=horizon, error_model=error_model, seed=seed)
+
+    started = time.perf_counter()
+    if executor is None:
+        blocks = map(simulate, units)
+    elif isinstance(executor, Executor):
+        blocks = executor.map(simulate, units)
+    elif executor in ('thread', 'process'):
+        pool_class = ThreadPoolExecutor if executor == 'thread' else ProcessPoolExecutor
+        with pool_class(max_workers=max_workers) as pool:
+            blocks = list(pool.map(simulate, units))
+    else:
+        raise ValueError("executor must be None, 'thread', 'process' or a concurrent.futures.Executor")
+
+    totals = {name: np.zeros(n_rows) for name in _SUMS}
+    for start, end, sums in blocks:
+        for name in _SUMS:
+            totals[name][start:end] += sums[name]
+
+    mean_ending = totals['ending'] / n_scenarios
+    result['monthly_demand_forecast'] = base
+    result['stockout_probability'] = totals['stockouts'] / n_scenarios
+    result['expected_shortage'] = totals['shortage'] / n_scenarios
+    result['expected_ending_stock'] = mean_ending
+    result['ending_stock_std'] = np.sqrt(np.maximum(totals['ending_sq'] / n_scenarios - mean_ending ** 2, 0))
+    result['excess_probability'] = totals['excess_count'] / n_scenarios
+    result['expected_excess'] = totals['excess'] / n_scenarios
+
+    logger.info(f"🎲 Simulated {n_rows:,} positions x {n_scenarios:,} scenarios x {horizon} months in "
+                f"{time.perf_counter() - started:.2f}s ({executor or 'serial'}): "
+                f"{int((result['stockout_probability'] > 0.5).sum()):,} likely to stock out")
+    return result
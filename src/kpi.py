@@ -0,0 +1,203 @@
+"""
+S&OP KPI Module
+===============
+
+Memoised KPI aggregates shared by the dashboard and notebooks.
+
+Functions:
+- KPIStore: versioned, lazily computed KPI summaries for a set of datasets
+- KPICache: LRU memo keyed by KPI name and dataset version
+- Dashboard KPIs (segment, regional, monthly, forecast, inventory)
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .data_processing import dataset_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Columns each dataset's KPIs read; only these feed the dataset version
+KPI_COLUMNS = {
+    'orders': ['order_date', 'customer_type', 'region', 'product_id', 'order_value'],
+    'forecasts': ['forecast_type', 'variance_pct'],
+    'inventory': ['stock_status', 'inventory_value'],
+}
+
+# name -> (dataset, function)
+KPI_REGISTRY: Dict[str, tuple] = {}
+
+
+def kpi(dataset: str) -> Callable:
+    """
+    Register a KPI computed from one dataset
+    """
+    def register(func):
+        KPI_REGISTRY[func.__name__] = (dataset, func)
+        return func
+    return register
+
+
+@kpi('orders')
+def segment_summary(orders: pd.DataFrame) -> pd.DataFrame:
+    """
+    Revenue, order count and AOV per customer segment
+    """
+    grouped = orders.groupby('customer_type', observed=True)['order_value']
+    return pd.DataFrame({'revenue': grouped.sum(), 'orders': grouped.count(), 'aov': grouped.mean()})
+
+
+@kpi('orders')
+def regional_revenue(orders: pd.DataFrame) -> pd.Series:
+    return orders.groupby('region', observed=True)['order_value'].sum().sort_values(ascending=True)
+
+
+@kpi('orders')
+def monthly_revenue(orders: pd.DataFrame) -> pd.Series:
+    months = pd.to_datetime(orders['order_date']).dt.to_period('M')
+    return orders['order_value'].groupby(months).sum()
+
+
+@kpi('orders')
+def top_products(orders: pd.DataFrame, n: int = 10) -> pd.Series:
+    return orders.groupby('product_id', observed=True)['order_value'].sum().nlargest(n)
+
+
+@kpi('orders')
+def order_totals(orders: pd.DataFrame) -> Dict[str, float]:
+    total_revenue = orders['order_value'].sum()
+    total_orders = len(orders)
+    return {
+        'total_revenue': total_revenue,
+        'total_orders': total_orders,
+        'aov': total_revenue / total_orders if total_orders else np.nan,
+    }
+
+
+@kpi('forecasts')
+def forecast_accuracy(forecasts: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Accuracy (100 - mean absolute variance %) overall and by forecast type
+    """
+    absolute_error = forecasts['variance_pct'].abs()
+    return {
+        'overall': 100 - absolute_error.mean(),
+        'by_type': 100 - absolute_error.groupby(forecasts['forecast_type'], observed=True).mean(),
+    }
+
+
+@kpi('inventory')
+def stock_status_counts(inventory: pd.DataFrame) -> pd.Series:
+    return inventory['stock_status'].value_counts()
+
+
+@kpi('inventory')
+def inventory_value_histogram(inventory: pd.DataFrame, bins: int = 20) -> Dict[str, np.ndarray]:
+    """
+    Pre-binned inventory value distribution plus the total
+    """
+    values = inventory['inventory_value'].dropna().to_numpy()
+    counts, edges = np.histogram(values, bins=bins)
+    return {'counts': counts, 'edges': edges, 'total': values.sum()}
+
+
+class KPICache:
+    """
+    LRU memo of KPI results keyed by (kpi name, dataset version)
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._entries: 'OrderedDict[tuple, Any]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key: tuple, compute: Callable[[], Any]) -> Any:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+        self.misses += 1
+        value = compute()
+        self._entries[key] = value
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+
+_DEFAULT_CACHE = KPICache()
+
+
+def clear_kpi_cache() -> None:
+    _DEFAULT_CACHE.clear()
+
+
+def _copy_result(value: Any) -> Any:
+    # Callers get copies so they cannot alter cached results
+    if isinstance(value, (pd.Series, pd.DataFrame, np.ndarray)):
+        return value.copy()
+    if isinstance(value, dict):
+        return {k: _copy_result(v) for k, v in value.items()}
+    return value
+
+
+class KPIStore:
+    """
+    Versioned KPI view over a set of datasets
+
+    Each dataset is fingerprinted once (over the KPI_COLUMNS it uses) when
+    the store is built or refreshed. KPIs are computed on first access and
+    memoised in a shared KPICache under that version, so another store over
+    the same data, or a re-render, reuses them. Input frames are only read.
+
+    Args:
+        datasets: Dictionary with 'orders', 'forecasts' and/or 'inventory'
+        versions: Explicit dataset versions (skip fingerprinting), e.g. a
+            load timestamp or the source file hash
+        cache: KPICache to use (default: the module-wide cache)
+    """
+
+    def __init__(self, datasets: Dict[str, pd.DataFrame], versions: Optional[Dict[str, str]] = None,
+                 cache: Optional[KPICache] = None):
+        self.datasets = datasets
+        self.cache = cache if cache is not None else _DEFAULT_CACHE
+        self._explicit_versions = dict(versions or {})
+        self.versions: Dict[str, str] = {}
+        self.refresh()
+
+    def refresh(self) -> Dict[str, str]:
+        """
+        Re-fingerprint the datasets; changed data gets fresh KPIs on next access
+        """
+        self.versions = {
+            name: self._explicit_versions.get(name) or dataset_fingerprint(df, KPI_COLUMNS.get(name))
+            for name, df in self.datasets.items() if name in KPI_COLUMNS
+        }
+        return self.versions
+
+    def get(self, name: str) -> Any:
+        """
+        Value of a registered KPI (see KPI_REGISTRY)
+        """
+        if name not in KPI_REGISTRY:
+            raise KeyError(f"Unknown KPI: {name}")
+        dataset, func = KPI_REGISTRY[name]
+        if dataset not in self.versions:
+            raise KeyError(f"KPI {name} needs the '{dataset}' dataset")
+        value = self.cache.get_or_compute((name, dataset, self.versions[dataset]),
+                                          lambda: func(self.datasets[dataset]))
+        return _copy_result(value)
+
+    def all(self) -> Dict[str, Any]:
+        """
+        Every KPI whose dataset is available
+        """
+        return {name: self.get(name) for name, (dataset, _) in KPI_REGISTRY.items() if dataset in self.versions}
@@ -0,0 +1,234 @@
+"""
+S&OP Profiling Module
+=====================
+
+Stage-level timing and memory instrumentation for the S&OP pipeline.
+
+Functions:
+- StageProfiler: records wall time, CPU time, memory and row counts per stage
+- profile_stage: decorator used on SOpDataProcessor methods
+- Structured reports (DataFrame/JSON) and optional cProfile dumps
+"""
+
+import cProfile
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+def count_rows(obj: Any) -> Optional[int]:
+    """
+    Row count of a DataFrame, or the total over a dict/list of DataFrames
+    """
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return len(obj)
+    if isinstance(obj, dict):
+        obj = list(obj.values())
+    if isinstance(obj, (list, tuple)):
+        counts = [count_rows(item) for item in obj]
+        counts = [count for count in counts if count is not None]
+        return sum(counts) if counts else None
+    return None
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Process high-water mark RSS in MB (None where unavailable)
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+class StageProfiler:
+    """
+    Collects one record per profiled stage call
+
+    Memory is measured with tracemalloc (peak and net allocation during the
+    stage, nested stages included). peak_rss_mb is the process high-water mark
+    when the stage finished. Stages running concurrently in threads share one
+    tracemalloc counter, so their memory figures overlap.
+
+    Args:
+        trace_memory: Track allocations with tracemalloc (slows the run)
+        cprofile_dir: If set, dump a cProfile .prof file per outermost stage
+    """
+
+    def __init__(self, trace_memory: bool = True, cprofile_dir: Optional[str] = None):
+        self.trace_memory = trace_memory
+        self.cprofile_dir = cprofile_dir
+        self.records: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._active = 0
+        self._owns_tracing = False
+
+    def __getstate__(self):
+        # Locks and thread-locals cannot be pickled (process pools)
+        state = self.__dict__.copy()
+        del state['_lock'], state['_local']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._active = 0
+        self._owns_tracing = False
+
+    def _stack(self) -> list:
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def stage(self, name: str, rows_in: Optional[int] = None):
+        """
+        Profile a block of code
+
+        Yields a dict; set ``rows_out`` on it to record output rows.
+        """
+        stack = self._stack()
+        frame = {'rows_out': None, 'peak_seen': 0}
+
+        if self.trace_memory:
+            with self._lock:
+                # tracemalloc runs only while a stage is active, unless the caller started it
+                if self._active == 0 and not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    self._owns_tracing = True
+                self._active += 1
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1]['peak_seen'] = max(stack[-1]['peak_seen'], peak)
+            tracemalloc.reset_peak()
+            frame['mem_start'] = current
+
+        profile = None
+        if self.cprofile_dir and not stack:
+            profile = cProfile.Profile()
+            profile.enable()
+
+        stack.append(frame)
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        try:
+            yield frame
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.thread_time() - cpu_start
+            stack.pop()
+
+            if profile is not None:
+                profile.disable()
+                os.makedirs(self.cprofile_dir, exist_ok=True)
+                profile.dump_stats(os.path.join(self.cprofile_dir, f"{os.getpid()}_{len(self.records):03d}_{name}.prof"))
+
+            record = {
+                'stage': name,
+                'depth': len(stack),
+                'wall_s': wall,
+                'cpu_s': cpu,
+                'mem_peak_mb': None,
+                'mem_net_mb': None,
+                'peak_rss_mb': peak_rss_mb(),
+                'rows_in': rows_in,
+                'rows_out': frame['rows_out'],
+                'pid': os.getpid(),
+                'thread': threading.current_thread().name,
+            }
+            if self.trace_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                peak = max(peak, frame['peak_seen'])
+                record['mem_peak_mb'] = (peak - frame['mem_start']) / (1024 * 1024)
+                record['mem_net_mb'] = (current - frame['mem_start']) / (1024 * 1024)
+                if stack:
+                    stack[-1]['peak_seen'] = max(stack[-1]['peak_seen'], peak)
+
+            with self._lock:
+                self.records.append(record)
+                if self.trace_memory:
+                    self._active -= 1
+                    if self._active == 0 and self._owns_tracing:
+                        tracemalloc.stop()
+                        self._owns_tracing = False
+            logger.debug(f"⏱️ {name}: {wall:.3f}s wall, {cpu:.3f}s cpu")
+
+    def extend(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Add records collected elsewhere (e.g. by a process-pool worker)
+        """
+        with self._lock:
+            self.records.extend(records)
+
+    def report(self) -> pd.DataFrame:
+        """
+        One row per stage call, in completion order
+        """
+        columns = ['stage', 'depth', 'wall_s', 'cpu_s', 'mem_peak_mb', 'mem_net_mb', 'peak_rss_mb',
+                   'rows_in', 'rows_out', 'pid', 'thread']
+        return pd.DataFrame(self.records, columns=columns)
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Per-stage totals (calls, wall/cpu time) and worst-case memory
+        """
+        report = self.report()
+        if report.empty:
+            return report
+        return report.groupby('stage', sort=False).agg(
+            calls=('stage', 'size'),
+            wall_s=('wall_s', 'sum'),
+            cpu_s=('cpu_s', 'sum'),
+            mem_peak_mb=('mem_peak_mb', 'max'),
+            rows_in=('rows_in', 'sum'),
+            rows_out=('rows_out', 'sum'),
+        ).reset_index()
+
+    def to_json(self, path: Optional[str] = None) -> str:
+        """
+        Serialise the records as JSON, optionally writing them to path
+        """
+        payload = json.dumps(self.records, default=str, indent=2)
+        if path is not None:
+            with open(path, 'w') as handle:
+                handle.write(payload)
+        return payload
+
+
+def profile_stage(method):
+    """
+    Record a SOpDataProcessor method as a stage when ``self.profiler`` is set
+
+    Input rows are counted over DataFrame (or dict of DataFrame) arguments and
+    output rows over the return value.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        profiler = getattr(self, 'profiler', None)
+        if profiler is None:
+            return method(self, *args, **kwargs)
+
+        with profiler.stage(method.__name__, rows_in=count_rows(list(args) + list(kwargs.values()))) as frame:
+            result = method(self, *args, **kwargs)
+            frame['rows_out'] = count_rows(result)
+        return result
+
+    return wrapper
@@ -0,0 +1,344 @@
+"""
+S&OP Promotions Module
+======================
+
+Price elasticity and promotion-event lift for every SKU at once.
+
+Orders are rolled up once into a SKU x period panel holding units, the
+quantity-weighted net price and the share of orders placed under each
+sale event. The models are log-log regressions on that panel:
+
+- elasticity: log(units) = a + e * log(price)
+- event lift: log(units) = a + sum_k b_k * share_k, lift_k = exp(b_k) - 1
+  (units in a fully promoted period relative to a period without events;
+  the discount that comes with the event is part of the lift)
+
+All groups are fitted together: each group's normal equations are summed
+in one pass over the sorted rows and solved as one stacked system. Pooled
+fits (per category or promotional tier) demean within SKU, so they use
+only price and event variation within each SKU. Results are memoised
+under the dataset_fingerprint of the inputs.
+
+Functions:
+- promotion_panel: SKU x period units, price and event shares
+- batched_least_squares: OLS for many independent groups in one solve
+- price_elasticity: elasticity per SKU, category or promotional tier
+- event_lift: lift per sale event for the same groupings
+"""
+
+import logging
+from typing import Callable, Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .data_processing import dataset_fingerprint
+from .kpi import KPICache
+
+logger = logging.getLogger(__name__)
+
+PANEL_COLUMNS = ['product_id', 'order_date', 'qty', 'unit_price', 'sale_event', 'category']
+
+# Groupings for price_elasticity / event_lift. Anything but product_id is
+# pooled across the SKUs it contains.
+EFFECT_GROUPS = ('product_id', 'category', 'promotional_tier')
+
+# Fewer panel periods than this leave a group's coefficients NaN
+MIN_PERIODS = 8
+
+SHARE_PREFIX = 'share: '
+
+_MODEL_CACHE = KPICache(maxsize=16)
+
+
+def promotion_panel(orders: pd.DataFrame, freq: str = 'W') -> pd.DataFrame:
+    """
+    SKU x period demand panel (periods without orders are left out)
+
+    Orders with a missing SKU or date, or a non-positive qty or
+    unit_price, are ignored.
+
+    Args:
+        orders: Orders with product_id, order_date, qty, unit_price and
+            optionally sale_event
+        freq: Period frequency ('D', 'W', 'M')
+
+    Returns:
+        One row per SKU and period, sorted by both, with units, orders,
+        price (quantity-weighted unit_price) and a 'share: <event>' column
+        per sale event (fraction of the period's orders under the event)
+    """
+    qty = pd.to_numeric(orders['qty'], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    price = pd.to_numeric(orders['unit_price'], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    sku_codes, skus = pd.factorize(orders['product_id'], sort=True)
+    period_codes, periods = pd.factorize(pd.to_datetime(orders['order_date']).dt.to_period(freq), sort=True)
+
+    with np.errstate(invalid='ignore'):
+        valid = (sku_codes >= 0) & (period_codes >= 0) & (qty > 0) & (price > 0)
+    cell = sku_codes[valid].astype(np.int64) * len(periods) + period_codes[valid]
+    cells, inverse = np.unique(cell, return_inverse=True)
+    qty, price = qty[valid], price[valid]
+
+    n_orders = np.bincount(inverse, minlength=len(cells))
+    units = np.bincount(inverse, weights=qty, minlength=len(cells))
+    panel = pd.DataFrame({
+        'product_id': skus[cells // len(periods)],
+        'period': periods[cells % len(periods)],
+        'units': units,
+        'orders': n_orders,
+        'price': np.bincount(inverse, weights=qty * price, minlength=len(cells)) / units,
+    })
+
+    if 'sale_event' in orders.columns:
+        event_codes, events = pd.factorize(orders['sale_event'], sort=True)
+        event_codes = event_codes[valid]
+        for code, event in enumerate(events):
+            on_event = event_codes == code
+            panel[SHARE_PREFIX + str(event)] = np.bincount(inverse[on_event], minlength=len(cells)) / n_orders
+    return panel
+
+
+def batched_least_squares(X: np.ndarray, y: np.ndarray, groups: np.ndarray, n_groups: Optional[int] = None,
+                          intercept: bool = True, absorbed: Union[int, np.ndarray] = 0,
+                          min_obs: int = 2) -> Dict[str, np.ndarray]:
+    """
+    Ordinary least squares fitted separately for every group in one pass
+
+    Rows are sorted by group and X'X, X'y and y'y are summed per group
+    with one reduceat; all systems are then solved as a single stacked
+    pseudo-inverse. A coefficient whose regressor does not vary within
+    its group is NaN (the others stay identified).
+
+    Args:
+        X: Regressors (n_rows, p)
+        y: Response (n_rows,)
+        groups: Group code per row (0 .. n_groups - 1; negative rows are ignored)
+        n_groups: Number of groups (default: max code + 1)
+        intercept: Prepend a constant column (its coefficient comes first)
+        absorbed: Parameters already removed from the data, e.g. per-SKU
+            means in a demeaned fit; only reduces the residual degrees of
+            freedom. Scalar or one value per group.
+        min_obs: Groups with fewer rows get NaN everywhere
+
+    Returns:
+        Dictionary with coef and std_error (n_groups, p[+1]), r2 and n_obs
+        (n_groups,)
+    """
+    X = np.asarray(X, dtype=np.float64).reshape(len(y), -1)
+    y = np.asarray(y, dtype=np.float64)
+    groups = np.asarray(groups)
+    n_groups = int(groups.max()) + 1 if n_groups is None else n_groups
+    if intercept:
+        X = np.column_stack([np.ones(len(y)), X])
+    n_params = X.shape[1]
+
+    keep = (groups >= 0) & np.isfinite(y) & np.isfinite(X).all(axis=1)
+    order = np.argsort(groups[keep], kind='stable')
+    X, y, groups = X[keep][order], y[keep][order], groups[keep][order]
+    present, starts = np.unique(groups, return_index=True)
+
+    xtx = np.zeros((n_groups, n_params, n_params))
+    xty = np.zeros((n_groups, n_params))
+    yty = np.zeros(n_groups)
+    x_sum = np.zeros((n_groups, n_params))
+    y_sum = np.zeros(n_groups)
+    n_obs = np.zeros(n_groups, dtype=np.int64)
+    if len(present):
+        xtx[present] = np.add.reduceat(X[:, :, None] * X[:, None, :], starts)
+        xty[present] = np.add.reduceat(X * y[:, None], starts)
+        yty[present] = np.add.reduceat(y * y, starts)
+        x_sum[present] = np.add.reduceat(X, starts)
+        y_sum[present] = np.add.reduceat(y, starts)
+        n_obs[present] = np.diff(np.append(starts, len(y)))
+
+    inverse = np.linalg.pinv(xtx)
+    coef = np.einsum('gij,gj->gi', inverse, xty)
+
+    # Regressors without variation within the group (constant, or all zero without an intercept)
+    diagonal = np.diagonal(xtx, axis1=1, axis2=2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        spread = diagonal - (x_sum ** 2 / n_obs[:, None] if intercept else 0.0)
+    degenerate = spread <= 1e-10 * np.maximum(diagonal, 1.0)
+    if intercept:
+        degenerate[:, 0] = False
+
+    rank = n_params - degenerate.sum(axis=1)
+    dof = n_obs - rank - np.asarray(absorbed)
+    rss = np.maximum(yty - 2 * np.einsum('gi,gi->g', coef, xty) + np.einsum('gi,gij,gj->g', coef, xtx, coef), 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tss = yty - (y_sum ** 2 / n_obs if intercept else 0.0)
+        sigma2 = np.where(dof > 0, rss / dof, np.nan)
+        std_error = np.sqrt(sigma2[:, None] * np.maximum(np.diagonal(inverse, axis1=1, axis2=2), 0.0))
+        r2 = np.where(tss > 0, 1 - rss / tss, np.nan)
+
+    unfitted = n_obs < max(min_obs, 1)
+    coef[degenerate | unfitted[:, None]] = np.nan
+    std_error[degenerate | unfitted[:, None]] = np.nan
+    r2[unfitted] = np.nan
+    return {'coef': coef, 'std_error': std_error, 'r2': r2, 'n_obs': n_obs}
+
+
+def _cached(name: str, orders: pd.DataFrame, products: Optional[pd.DataFrame], params: tuple,
+            cache: Optional[KPICache], compute: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+    cache = cache if cache is not None else _MODEL_CACHE
+    version = (dataset_fingerprint(orders, PANEL_COLUMNS),
+               dataset_fingerprint(products, ['product_id', 'category', 'promotional_tier'])
+               if products is not None else None)
+    return cache.get_or_compute((name, params, version), compute).copy()
+
+
+def _sku_attributes(orders: pd.DataFrame, products: Optional[pd.DataFrame], skus: pd.Index) -> pd.DataFrame:
+    """
+    category / promotional_tier per SKU, from products where given, else from orders
+    """
+    if products is not None:
+        columns = [col for col in ('category', 'promotional_tier') if col in products.columns]
+        attributes = products.drop_duplicates('product_id').set_index('product_id')[columns]
+    else:
+        columns = [col for col in ('category', 'promotional_tier') if col in orders.columns]
+        attributes = orders.drop_duplicates('product_id').set_index('product_id')[columns]
+    return attributes.reindex(skus)
+
+
+def _group_design(orders: pd.DataFrame, products: Optional[pd.DataFrame], by: str, freq: str):
+    """
+    Panel, group code per panel row and group index; pooled groupings get
+    within-SKU demeaning through the returned sku codes
+    """
+    if by not in EFFECT_GROUPS:
+        raise ValueError(f"by must be one of {EFFECT_GROUPS}")
+    panel = promotion_panel(orders, freq)
+    sku_codes, skus = pd.factorize(panel['product_id'], sort=True)
+    if by == 'product_id':
+        return panel, sku_codes, pd.Index(skus, name='product_id'), skus
+
+    attributes = _sku_attributes(orders, products, pd.Index(skus))
+    if by not in attributes.columns:
+        raise ValueError(f"'{by}' is not available; pass products with a {by} column")
+    group_of_sku, levels = pd.factorize(attributes[by], sort=True)
+    return panel, group_of_sku[sku_codes], pd.Index(levels, name=by), skus
+
+
+def _demean(values: np.ndarray, codes: np.ndarray, n_codes: int) -> np.ndarray:
+    """
+    Subtract each code's mean (per column for 2-D values)
+    """
+    counts = np.bincount(codes, minlength=n_codes)
+    if values.ndim == 1:
+        return values - (np.bincount(codes, weights=values, minlength=n_codes) / counts)[codes]
+    means = np.column_stack([np.bincount(codes, weights=column, minlength=n_codes) for column in values.T]) / counts[:, None]
+    return values - means[codes]
+
+
+def _group_sums(values: np.ndarray, groups: np.ndarray, n_groups: int) -> np.ndarray:
+    """
+    Per-group column sums of (n_rows, k) values; rows with a negative group are skipped
+    """
+    keep = groups >= 0
+    values = values.reshape(len(groups), -1)
+    sums = np.zeros((n_groups, values.shape[1]))
+    for k in range(values.shape[1]):
+        sums[:, k] = np.bincount(groups[keep], weights=values[keep, k], minlength=n_groups)
+    return sums
+
+
+def _sku_counts(panel: pd.DataFrame, groups: np.ndarray, n_groups: int) -> np.ndarray:
+    first_rows = np.unique(pd.factorize(panel['product_id'])[0], return_index=True)[1]
+    return _group_sums(np.ones(len(first_rows)), groups[first_rows], n_groups)[:, 0].astype(np.int64)
+
+
+def _fit(panel: pd.DataFrame, X: np.ndarray, groups: np.ndarray, n_groups: int, pooled: bool,
+         min_periods: int) -> Dict[str, np.ndarray]:
+    y = np.log(panel['units'].to_numpy())
+    if not pooled:
+        return batched_least_squares(X, y, groups, n_groups, min_obs=min_periods)
+    # SKU fixed effects: only variation within each SKU identifies the pooled slope
+    sku_codes, skus = pd.factorize(panel['product_id'], sort=True)
+    return batched_least_squares(_demean(X, sku_codes, len(skus)), _demean(y, sku_codes, len(skus)), groups,
+                                 n_groups, intercept=False, absorbed=_sku_counts(panel, groups, n_groups),
+                                 min_obs=min_periods)
+
+
+def price_elasticity(orders: pd.DataFrame, products: Optional[pd.DataFrame] = None, by: str = 'product_id',
+                     freq: str = 'W', min_periods: int = MIN_PERIODS,
+                     cache: Optional[KPICache] = None) -> pd.DataFrame:
+    """
+    Log-log price elasticity of demand per SKU, category or promotional tier
+
+    Args:
+        orders: Orders frame (raw or cleaned)
+        products: Products frame, for promotional_tier (and the category
+            of SKUs); without it category comes from orders
+        by: 'product_id', 'category' or 'promotional_tier'
+        freq: Panel period ('D', 'W', 'M')
+        min_periods: Minimum panel periods per group
+        cache: KPICache for the results (default: a module-wide cache)
+
+    Returns:
+        Indexed by the grouping with n_skus, n_periods, elasticity,
+        std_error, r2 and mean_price; SKU results also carry category and
+        promotional_tier where known
+    """
+    def compute():
+        panel, groups, index, skus = _group_design(orders, products, by, freq)
+        log_price = np.log(panel['price'].to_numpy())
+        fit = _fit(panel, log_price, groups, len(index), by != 'product_id', min_periods)
+        result = pd.DataFrame({
+            'n_skus': _sku_counts(panel, groups, len(index)),
+            'n_periods': fit['n_obs'],
+            'elasticity': fit['coef'][:, -1],
+            'std_error': fit['std_error'][:, -1],
+            'r2': fit['r2'],
+            'mean_price': _group_sums(panel['price'].to_numpy(), groups, len(index))[:, 0]
+                          / np.maximum(_group_sums(np.ones(len(panel)), groups, len(index))[:, 0], 1),
+        }, index=index)
+        if by == 'product_id':
+            result = result.join(_sku_attributes(orders, products, index))
+        logger.info(f"📉 Price elasticity fitted for {int(result['elasticity'].notna().sum()):,} of "
+                    f"{len(result):,} groups ({by}, {freq})")
+        return result
+
+    return _cached('price_elasticity', orders, products, (by, freq, min_periods), cache, compute)
+
+
+def event_lift(orders: pd.DataFrame, products: Optional[pd.DataFrame] = None, by: str = 'product_id',
+               freq: str = 'W', min_periods: int = MIN_PERIODS,
+               cache: Optional[KPICache] = None) -> pd.DataFrame:
+    """
+    Demand lift per sale event, per SKU, category or promotional tier
+
+    All events are fitted jointly against periods without events. lift is
+    exp(coefficient) - 1: the relative change in units for a period in
+    which every order was under that event.
+
+    Args:
+        orders: Orders frame with sale_event
+        products, by, freq, min_periods, cache: as for price_elasticity
+
+    Returns:
+        Indexed by (grouping, sale_event) with coefficient, std_error,
+        lift, event_periods (periods with any order under the event) and
+        r2 of the group's fit
+    """
+    def compute():
+        panel, groups, index, _ = _group_design(orders, products, by, freq)
+        share_columns = [col for col in panel.columns if col.startswith(SHARE_PREFIX)]
+        events = pd.Index([col[len(SHARE_PREFIX):] for col in share_columns], name='sale_event')
+        shares = panel[share_columns].to_numpy(dtype=np.float64).reshape(len(panel), len(share_columns))
+        fit = _fit(panel, shares, groups, len(index), by != 'product_id', min_periods)
+        # Event coefficients follow the intercept (if any)
+        coef = fit['coef'][:, fit['coef'].shape[1] - len(events):]
+        std_error = fit['std_error'][:, fit['coef'].shape[1] - len(events):]
+        event_periods = _group_sums((shares > 0).astype(np.float64), groups, len(index))
+
+        result = pd.DataFrame({
+            'coefficient': coef.ravel(),
+            'std_error': std_error.ravel(),
+            'lift': np.expm1(coef).ravel(),
+            'event_periods': event_periods.ravel().astype(np.int64),
+            'r2': np.repeat(fit['r2'], len(events)),
+        }, index=pd.MultiIndex.from_product([index, events]))
+        logger.info(f"📈 Event lift fitted for {len(index):,} groups x {len(events)} events ({by}, {freq})")
+        return result
+
+    return _cached('event_lift', orders, products, (by, freq, min_periods), cache, compute)
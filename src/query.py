@@ -0,0 +1,223 @@
+"""
+S&OP Query Module
+=================
+
+Indexed lookups over processed orders for interactive tools and APIs.
+
+Orders are sorted once by product_id, region, customer_type and order
+month. Each distinct combination (a cell) gets its row offsets and
+pre-summed measures. Queries resolve their filters to integer codes, pick
+the matching cells (a contiguous range per SKU) and add up a few cell
+totals instead of scanning the whole frame.
+
+Functions:
+- OrderQueryIndex: point/range row lookups and cached slice aggregates
+"""
+
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .kpi import KPICache
+
+logger = logging.getLogger(__name__)
+
+QUERY_DIMENSIONS = ['product_id', 'region', 'customer_type', 'month']
+
+# Order column -> aggregate name
+QUERY_MEASURES = {'order_value': 'revenue', 'qty': 'qty'}
+
+
+def _concat_ranges(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    Concatenation of the integer ranges [start, end) without a Python loop
+    """
+    lengths = ends - starts
+    return np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+
+
+class OrderQueryIndex:
+    """
+    Sorted cell index over an orders frame
+
+    Filters are keyword arguments named after QUERY_DIMENSIONS. A filter
+    can be a single value, a list of values, or (for month) a
+    ``(start, end)`` tuple covering an inclusive range of months. Months
+    can be given as 'YYYY-MM' strings, Periods or timestamps.
+
+    Example:
+        index = OrderQueryIndex(process_sop_data(file_paths)['orders'])
+        index.aggregate(product_id='SKU0028', region='Gauteng', month='2025-03')['revenue']
+
+    Args:
+        orders: Orders frame with product_id, region, customer_type,
+            order_date and the QUERY_MEASURES columns
+        measures: Order column -> aggregate name
+        cache_size: Number of aggregate results kept
+    """
+
+    def __init__(self, orders: pd.DataFrame, measures: Optional[Dict[str, str]] = None, cache_size: int = 4096):
+        self.measures = dict(measures or QUERY_MEASURES)
+        self.cache = KPICache(maxsize=cache_size)
+
+        keys = {
+            'product_id': orders['product_id'],
+            'region': orders['region'],
+            'customer_type': orders['customer_type'],
+            'month': pd.to_datetime(orders['order_date']).dt.to_period('M'),
+        }
+        codes, self.levels = [], {}
+        for name in QUERY_DIMENSIONS:
+            dim_codes, uniques = pd.factorize(keys[name], sort=True)
+            codes.append(dim_codes.astype(np.int64))
+            self.levels[name] = pd.Index(uniques, name=name)
+
+        # Rows with a missing key cannot be addressed by any query
+        keyed = np.all([c >= 0 for c in codes], axis=0)
+        positions = np.flatnonzero(keyed)
+        codes = [c[keyed] for c in codes]
+        # lexsort sorts by the last key first
+        order = np.lexsort(codes[::-1])
+        self.row_positions = positions[order]
+        self.orders = orders
+
+        sorted_codes = [c[order] for c in codes]
+        cell_id = np.zeros(len(order), dtype=np.int64)
+        for c, name in zip(sorted_codes, QUERY_DIMENSIONS):
+            cell_id = cell_id * len(self.levels[name]) + c
+        starts = np.flatnonzero(np.diff(cell_id, prepend=-1) != 0) if len(cell_id) else np.array([], dtype=np.int64)
+        self.cell_start = starts
+        self.cell_end = np.append(starts[1:], len(order))
+        self.cell_codes = {name: c[starts] for c, name in zip(sorted_codes, QUERY_DIMENSIONS)}
+
+        self.cell_totals = {'orders': self.cell_end - self.cell_start}
+        for column, name in self.measures.items():
+            values = orders[column].to_numpy(dtype=np.float64, na_value=0.0)[self.row_positions]
+            self.cell_totals[name] = np.add.reduceat(values, starts) if len(starts) else np.zeros(0)
+
+        # Per dimension, cell positions ordered by that dimension's code and the
+        # offsets of each code, so any filter maps to contiguous ranges. Cells
+        # are already sorted by product, whose order is the identity.
+        self.dim_order, self.dim_offsets, self._code_of = {}, {}, {}
+        for name in QUERY_DIMENSIONS:
+            cell_codes = self.cell_codes[name]
+            dim_order = np.argsort(cell_codes, kind='stable')
+            self.dim_order[name] = dim_order
+            self.dim_offsets[name] = np.searchsorted(cell_codes[dim_order], np.arange(len(self.levels[name]) + 1))
+            # Plain dict lookups keep filter resolution off the pandas path
+            self._code_of[name] = {value: code for code, value in enumerate(self.levels[name])}
+        self._code_of['month'].update({str(period): code for code, period in enumerate(self.levels['month'])})
+        logger.info(f"🔎 Indexed {len(order):,} orders into {len(starts):,} cells")
+
+    @classmethod
+    def from_processed(cls, datasets: Dict[str, pd.DataFrame], **kwargs) -> 'OrderQueryIndex':
+        """
+        Build from the dictionary returned by process_sop_data
+        """
+        return cls(datasets['orders'], **kwargs)
+
+    def _month(self, value: Any) -> Any:
+        if isinstance(value, str) and len(value) == 7:
+            return value
+        return pd.Period(value, freq='M')
+
+    def _codes(self, name: str, value: Any) -> Tuple[int, ...]:
+        code_of = self._code_of[name]
+        if name == 'month':
+            if isinstance(value, tuple) and len(value) == 2:
+                start, end = (pd.Period(v, freq='M') for v in value)
+                level = self.levels['month']
+                return tuple(np.flatnonzero((level >= start) & (level <= end)).tolist())
+            values = value if isinstance(value, (list, set, np.ndarray, pd.Index)) else [value]
+            values = [self._month(v) for v in values]
+        else:
+            values = value if isinstance(value, (list, tuple, set, np.ndarray, pd.Index)) else [value]
+        return tuple(sorted({code_of[v] for v in values if v in code_of}))
+
+    def _normalise(self, filters: Dict[str, Any]) -> Tuple:
+        unknown = set(filters) - set(QUERY_DIMENSIONS)
+        if unknown:
+            raise KeyError(f"Unknown query dimensions: {sorted(unknown)}")
+        return tuple((name, self._codes(name, filters[name]))
+                     for name in QUERY_DIMENSIONS if filters.get(name) is not None)
+
+    def _cells(self, key: Tuple) -> np.ndarray:
+        """
+        Positions of the cells matching normalised filter codes
+
+        Candidates come from the most selective filter (fewest cells); the
+        remaining filters are applied as masks on those candidates.
+        """
+        if not key:
+            return np.arange(len(self.cell_start))
+
+        def extent(item):
+            name, codes = item
+            offsets = self.dim_offsets[name]
+            codes = np.asarray(codes, dtype=np.int64)
+            return int((offsets[codes + 1] - offsets[codes]).sum())
+
+        filters = sorted(key, key=extent)
+        name, codes = filters[0]
+        codes = np.asarray(codes, dtype=np.int64)
+        offsets = self.dim_offsets[name]
+        cells = self.dim_order[name][_concat_ranges(offsets[codes], offsets[codes + 1])]
+
+        for name, codes in filters[1:]:
+            cell_codes = self.cell_codes[name][cells]
+            mask = cell_codes == codes[0] if len(codes) == 1 else np.isin(cell_codes, codes)
+            cells = cells[mask]
+        return cells
+
+    def aggregate(self, **filters) -> Dict[str, float]:
+        """
+        Order count and measure totals (revenue, qty) for a slice, plus AOV
+
+        Results are cached per normalised filter set.
+        """
+        key = self._normalise(filters)
+
+        def compute():
+            cells = self._cells(key)
+            totals = {name: values[cells].sum() for name, values in self.cell_totals.items()}
+            totals['orders'] = int(totals['orders'])
+            if 'revenue' in totals:
+                totals['aov'] = totals['revenue'] / totals['orders'] if totals['orders'] else np.nan
+            return totals
+
+        return dict(self.cache.get_or_compute(('aggregate', key), compute))
+
+    def revenue(self, **filters) -> float:
+        """
+        Order value total for a slice
+        """
+        return self.aggregate(**filters)['revenue']
+
+    def breakdown(self, by: str, **filters) -> pd.DataFrame:
+        """
+        Slice totals per value of one dimension, e.g. revenue by month for a SKU
+        """
+        if by not in QUERY_DIMENSIONS:
+            raise KeyError(f"Unknown query dimension: {by}")
+        key = self._normalise(filters)
+
+        def compute():
+            cells = self._cells(key)
+            group = self.cell_codes[by][cells]
+            n_groups = len(self.levels[by])
+            frame = pd.DataFrame({name: np.bincount(group, weights=values[cells], minlength=n_groups)
+                                  for name, values in self.cell_totals.items()}, index=self.levels[by])
+            frame['orders'] = frame['orders'].astype(np.int64)
+            return frame[frame['orders'] > 0]
+
+        return self.cache.get_or_compute(('breakdown', by, key), compute).copy()
+
+    def rows(self, **filters) -> pd.DataFrame:
+        """
+        Order rows in a slice, in index order (product, region, segment, month)
+        """
+        cells = np.sort(self._cells(self._normalise(filters)))
+        offsets = _concat_ranges(self.cell_start[cells], self.cell_end[cells])
+        return self.orders.iloc[self.row_positions[offsets]]
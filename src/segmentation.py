@@ -0,0 +1,228 @@
+"""
+S&OP Segmentation Module
+========================
+
+Data-driven demand segmentation for every SKU at once.
+
+The SKU x month demand matrix is built once per orders version (cached
+under its dataset_fingerprint). ABC (revenue share), XYZ (demand
+variability) and ADI/CV² (intermittency) classes then come from
+row-wise reductions over that matrix, so the cost grows with the
+matrix size rather than with a per-SKU loop.
+
+Functions:
+- demand_matrix: cached SKU x month matrix (see forecasting.build_demand_matrix)
+- sku_totals: per-SKU sums (revenue for ABC) with one bincount
+- abc_classes, xyz_classes, demand_patterns: class arrays from per-SKU values
+- segment_demand: all classes and their inputs per SKU
+- apply_segmentation: write the classes back into the products frame
+"""
+
+import logging
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .data_processing import dataset_fingerprint
+from .forecasting import INTERMITTENT_ADI, average_demand_interval, build_demand_matrix
+from .kpi import KPICache
+
+logger = logging.getLogger(__name__)
+
+# Cumulative revenue share (before the SKU) below which a SKU is A, then B
+ABC_THRESHOLDS = {'A': 0.80, 'B': 0.95}
+
+# Coefficient of variation of monthly demand up to which a SKU is X, then Y
+XYZ_THRESHOLDS = {'X': 0.5, 'Y': 1.0}
+
+# Squared CV of non-zero demand sizes separating smooth/intermittent from
+# erratic/lumpy demand (Syntetos-Boylan; ADI cut-off INTERMITTENT_ADI)
+CV2_CUTOFF = 0.49
+
+DEMAND_PATTERNS = ['Smooth', 'Intermittent', 'Erratic', 'Lumpy', 'No Demand']
+
+# XYZ class -> demand_volatility tier (Products.csv vocabulary)
+XYZ_VOLATILITY = {'X': 'Low', 'Y': 'Medium', 'Z': 'High'}
+
+_MATRIX_CACHE = KPICache(maxsize=8)
+
+
+def demand_matrix(orders: pd.DataFrame, value_column: str = 'qty',
+                  cache: Optional[KPICache] = None) -> Tuple[np.ndarray, pd.Index, pd.PeriodIndex]:
+    """
+    Monthly demand matrix per SKU, memoised by orders content
+
+    The returned matrix is read-only because it is shared between callers;
+    copy it before modifying.
+
+    Args:
+        orders: Orders frame (raw or cleaned)
+        value_column: Quantity to sum (e.g. 'qty' or 'order_value')
+        cache: KPICache to use (default: a module-wide cache of 8 matrices)
+
+    Returns:
+        (matrix (n_skus, n_months), product_id index, monthly PeriodIndex)
+    """
+    cache = cache if cache is not None else _MATRIX_CACHE
+    version = dataset_fingerprint(orders, ['product_id', 'order_date', value_column])
+
+    def build():
+        matrix, skus, periods = build_demand_matrix(orders, value_column)
+        matrix.flags.writeable = False
+        return matrix, skus, periods
+
+    return cache.get_or_compute(('demand_matrix', value_column, version), build)
+
+
+def sku_totals(orders: pd.DataFrame, skus: pd.Index, value_column: str,
+               date_column: str = 'order_date') -> np.ndarray:
+    """
+    Sum of value_column per SKU in skus order, over the orders counted by
+    build_demand_matrix (product_id and a date present)
+    """
+    valid = pd.to_datetime(orders[date_column]).notna().to_numpy() & orders['product_id'].notna().to_numpy()
+    codes, uniques = pd.factorize(orders['product_id'][valid])
+    totals = np.bincount(codes, weights=orders[value_column].to_numpy(dtype=np.float64, na_value=0.0)[valid],
+                         minlength=len(uniques))
+    result = np.zeros(len(skus))
+    positions = skus.get_indexer(uniques)
+    result[positions[positions >= 0]] = totals[positions >= 0]
+    return result
+
+
+def abc_classes(revenue: np.ndarray, thresholds: Dict[str, float] = ABC_THRESHOLDS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    ABC class per SKU from its revenue
+
+    SKUs are ranked by revenue; a SKU is A while the revenue share of the
+    SKUs ranked above it is below thresholds['A'], then B below
+    thresholds['B'], otherwise C. The top SKU is always A.
+
+    Returns:
+        (class per SKU, cumulative share including the SKU)
+    """
+    revenue = np.asarray(revenue, dtype=np.float64)
+    order = np.argsort(-revenue, kind='stable')
+    total = revenue.sum()
+    cumulative = np.empty(len(revenue))
+    cumulative[order] = np.cumsum(revenue[order]) / total if total > 0 else 1.0
+    before = cumulative - (revenue / total if total > 0 else 0.0)
+    classes = np.where(before < thresholds['A'], 'A', np.where(before < thresholds['B'], 'B', 'C'))
+    return classes, cumulative
+
+
+def xyz_classes(cv: np.ndarray, thresholds: Dict[str, float] = XYZ_THRESHOLDS) -> np.ndarray:
+    """
+    XYZ class per SKU from the coefficient of variation (NaN counts as Z)
+    """
+    cv = np.asarray(cv, dtype=np.float64)
+    return np.where(cv <= thresholds['X'], 'X', np.where(cv <= thresholds['Y'], 'Y', 'Z'))
+
+
+def demand_patterns(adi: np.ndarray, cv2: np.ndarray, adi_cutoff: float = INTERMITTENT_ADI,
+                    cv2_cutoff: float = CV2_CUTOFF) -> np.ndarray:
+    """
+    Syntetos-Boylan demand pattern per SKU ('No Demand' for infinite ADI)
+    """
+    adi = np.asarray(adi, dtype=np.float64)
+    cv2 = np.asarray(cv2, dtype=np.float64)
+    intermittent = adi >= adi_cutoff
+    erratic = cv2 >= cv2_cutoff
+    patterns = np.select([intermittent & erratic, intermittent, erratic],
+                         ['Lumpy', 'Intermittent', 'Erratic'], default='Smooth')
+    return np.where(np.isfinite(adi), patterns, 'No Demand')
+
+
+def segment_demand(orders: pd.DataFrame, products: Optional[pd.DataFrame] = None,
+                   value_column: str = 'qty', revenue_column: str = 'order_value',
+                   cache: Optional[KPICache] = None) -> pd.DataFrame:
+    """
+    ABC, XYZ and ADI/CV² segmentation for every SKU
+
+    Months run from the first to the last order month across all SKUs;
+    months without orders count as zero demand. CVs use the population
+    standard deviation.
+
+    - demand_cv: std / mean of monthly demand (XYZ)
+    - adi: months per month with demand
+    - cv2: squared CV of the non-zero monthly demand sizes
+
+    Args:
+        orders: Orders frame with product_id, order_date, value_column and
+            revenue_column
+        products: If given, every product_id in it gets a row (SKUs without
+            orders are C / Z / 'No Demand')
+        value_column: Demand quantity column
+        revenue_column: Revenue column for ABC
+        cache: KPICache for the demand matrices
+
+    Returns:
+        Indexed by product_id with revenue, revenue_share, cumulative_share,
+        abc_class, mean_demand, demand_cv, xyz_class, adi, cv2,
+        demand_pattern and abc_xyz (e.g. 'AX')
+    """
+    demand, skus, periods = demand_matrix(orders, value_column, cache)
+    revenue = sku_totals(orders, skus, revenue_column)
+
+    if products is not None:
+        # Products without orders get an all-zero demand row
+        all_skus = skus.append(pd.Index(products['product_id']).difference(skus)).rename('product_id')
+        padding = len(all_skus) - len(skus)
+        demand = np.vstack([demand, np.zeros((padding, demand.shape[1]))])
+        revenue = np.concatenate([revenue, np.zeros(padding)])
+        skus = all_skus
+
+    n_periods = demand.shape[1]
+    mean = demand.sum(axis=1) / n_periods
+    std = np.sqrt(np.maximum((demand ** 2).sum(axis=1) / n_periods - mean ** 2, 0))
+    positive = demand > 0
+    n_positive = positive.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        demand_cv = np.where(mean > 0, std / mean, np.nan)
+        size_mean = demand.sum(axis=1) / n_positive
+        size_var = np.maximum((demand ** 2).sum(axis=1) / n_positive - size_mean ** 2, 0)
+        cv2 = np.where(n_positive > 0, size_var / size_mean ** 2, np.nan)
+    adi = average_demand_interval(demand)
+
+    abc, cumulative = abc_classes(revenue)
+    xyz = xyz_classes(demand_cv)
+    total_revenue = revenue.sum()
+    result = pd.DataFrame({
+        'revenue': revenue,
+        'revenue_share': revenue / total_revenue if total_revenue > 0 else 0.0,
+        'cumulative_share': cumulative,
+        'abc_class': abc,
+        'mean_demand': mean,
+        'demand_cv': demand_cv,
+        'xyz_class': xyz,
+        'adi': adi,
+        'cv2': cv2,
+        'demand_pattern': pd.Categorical(demand_patterns(adi, cv2), categories=DEMAND_PATTERNS),
+    }, index=pd.Index(skus, name='product_id'))
+    result['abc_xyz'] = np.char.add(abc.astype(str), xyz.astype(str))
+
+    logger.info(f"🧮 Segmented {len(result):,} SKUs over {len(periods)} months: "
+                f"{result['abc_xyz'].value_counts().sort_index().to_dict()}")
+    return result
+
+
+def apply_segmentation(products: pd.DataFrame, segments: pd.DataFrame,
+                       overwrite_volatility: bool = False) -> pd.DataFrame:
+    """
+    Copy of products with the segmentation columns attached
+
+    Adds abc_class, xyz_class, abc_xyz, demand_pattern, demand_cv, adi and
+    cv2, plus derived_volatility (XYZ_VOLATILITY tier). With
+    overwrite_volatility the hand-assigned demand_volatility is replaced
+    by the derived tier.
+    """
+    result = products.copy()
+    columns = ['abc_class', 'xyz_class', 'abc_xyz', 'demand_pattern', 'demand_cv', 'adi', 'cv2']
+    # Products missing from segments get NaN
+    attached = segments[columns].reindex(result['product_id']).set_axis(result.index)
+    result[columns] = attached
+    result['derived_volatility'] = result['xyz_class'].map(XYZ_VOLATILITY)
+    if overwrite_volatility:
+        result['demand_volatility'] = result['derived_volatility']
+    return result
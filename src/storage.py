@@ -0,0 +1,416 @@
+"""
+S&OP Storage Module
+===================
+
+Columnar (Parquet/Feather) storage for raw and processed S&OP datasets.
+
+Functions:
+- Schema-typed CSV reading (apply_schema for other sources)
+- Raw dataset cache with mtime/hash invalidation
+- Columnar export and reload of processed datasets
+- Time-partitioned datasets with partition pruning
+"""
+
+import hashlib
+import json
+import os
+import logging
+import shutil
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import quote, unquote
+
+import numpy as np
+import pandas as pd
+
+from .data_processing import DATASET_SCHEMAS
+
+logger = logging.getLogger(__name__)
+
+COLUMNAR_FORMATS = ('parquet', 'feather')
+_BOOL_STRINGS = {'true': True, 'false': False, '1': True, '0': False}
+
+# Default partition keys for orders; 'region' can be appended
+PARTITION_COLUMNS = ['order_year', 'order_month_num']
+# Directory name for a missing partition value (Hive convention)
+NULL_PARTITION = '__HIVE_DEFAULT_PARTITION__'
+# Written last by write_partitioned; marks a directory it may replace
+PARTITION_MARKER = '_SOP_PARTITIONED'
+
+
+def _check_format(file_format: str) -> None:
+    if file_format not in COLUMNAR_FORMATS:
+        raise ValueError(f"file_format must be one of {COLUMNAR_FORMATS}")
+
+
+def _coerce_column(series: pd.Series, kind: str) -> pd.Series:
+    """
+    Coerce one column to its schema kind, tolerating dirty values
+    """
+    if kind == 'datetime':
+        return pd.to_datetime(series, errors='coerce')
+    if kind == 'int':
+        values = pd.to_numeric(series, errors='coerce')
+        return values.astype('int64') if values.notna().all() else values.astype('float64')
+    if kind == 'float':
+        return pd.to_numeric(series, errors='coerce').astype('float64')
+    if kind == 'bool':
+        if series.dtype == bool:
+            return series
+        mapped = series.astype(str).str.strip().str.lower().map(_BOOL_STRINGS)
+        return mapped.astype(bool) if mapped.notna().all() else mapped.astype('boolean')
+    return series
+
+
+def apply_schema(df: pd.DataFrame, dataset_name: str) -> pd.DataFrame:
+    """
+    Coerce the columns of df in place to the dataset schema from DATASET_SCHEMAS
+
+    Text columns are left as read. Columns not in the schema keep their dtype.
+    """
+    for col, kind in DATASET_SCHEMAS.get(dataset_name, {}).items():
+        if col in df.columns and kind != 'text':
+            df[col] = _coerce_column(df[col], kind)
+    return df
+
+
+def read_csv_with_schema(dataset_name: str, file_path: str) -> pd.DataFrame:
+    """
+    Read a raw CSV and apply the dataset schema from DATASET_SCHEMAS
+
+    Columns not in the schema keep the dtype pandas infers.
+    """
+    schema = DATASET_SCHEMAS.get(dataset_name, {})
+    text_dtypes = {col: str for col, kind in schema.items() if kind == 'text'}
+    return apply_schema(pd.read_csv(file_path, dtype=text_dtypes), dataset_name)
+
+
+def file_digest(file_path: str, block_size: int = 1 << 20) -> str:
+    """
+    SHA-256 of a file, read in blocks
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as handle:
+        for block in iter(lambda: handle.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _schema_digest(dataset_name: str) -> str:
+    schema = DATASET_SCHEMAS.get(dataset_name, {})
+    return hashlib.sha256(json.dumps(schema, sort_keys=True).encode()).hexdigest()
+
+
+def write_columnar(df: pd.DataFrame, file_path: str, file_format: str = 'parquet') -> None:
+    """
+    Write a DataFrame as Parquet or Feather without its index
+    """
+    _check_format(file_format)
+    if file_format == 'parquet':
+        df.to_parquet(file_path, index=False)
+    else:
+        df.reset_index(drop=True).to_feather(file_path)
+
+
+def read_columnar(file_path: str, file_format: str = 'parquet',
+                  columns: Optional[list] = None) -> pd.DataFrame:
+    _check_format(file_format)
+    if file_format == 'parquet':
+        return pd.read_parquet(file_path, columns=columns)
+    return pd.read_feather(file_path, columns=columns)
+
+
+def load_cached_dataset(dataset_name: str, file_path: str, cache_dir: str,
+                        file_format: str = 'parquet') -> pd.DataFrame:
+    """
+    Load a raw dataset through the columnar cache
+
+    The cache entry is reused while the source file's size and mtime are
+    unchanged. If only the mtime moved, the file hash decides. A schema
+    change always rebuilds the entry.
+
+    Args:
+        dataset_name: Key in DATASET_SCHEMAS ('orders', 'inventory', ...)
+        file_path: Source CSV path
+        cache_dir: Directory holding cached files and their metadata
+        file_format: 'parquet' or 'feather'
+
+    Returns:
+        Schema-typed DataFrame
+    """
+    _check_format(file_format)
+    os.makedirs(cache_dir, exist_ok=True)
+    cache_path = os.path.join(cache_dir, f"{dataset_name}.{file_format}")
+    meta_path = os.path.join(cache_dir, f"{dataset_name}.{file_format}.json")
+
+    source_stat = os.stat(file_path)
+    source = {
+        'path': os.path.abspath(file_path),
+        'size': source_stat.st_size,
+        'mtime_ns': source_stat.st_mtime_ns,
+        'schema': _schema_digest(dataset_name),
+    }
+
+    meta = None
+    if os.path.exists(meta_path) and os.path.exists(cache_path):
+        with open(meta_path) as handle:
+            meta = json.load(handle)
+
+    if meta is not None and all(meta.get(k) == source[k] for k in ['path', 'size', 'schema']):
+        if meta.get('mtime_ns') == source['mtime_ns']:
+            logger.info(f"⚡ Cache hit for {dataset_name}: {cache_path}")
+            return read_columnar(cache_path, file_format)
+
+        source['sha256'] = file_digest(file_path)
+        if meta.get('sha256') == source['sha256']:
+            # Touched but unchanged: refresh the mtime so the next load skips hashing
+            with open(meta_path, 'w') as handle:
+                json.dump(source, handle)
+            logger.info(f"⚡ Cache hit for {dataset_name} (content unchanged): {cache_path}")
+            return read_columnar(cache_path, file_format)
+
+    df = read_csv_with_schema(dataset_name, file_path)
+    write_columnar(df, cache_path, file_format)
+    source.setdefault('sha256', file_digest(file_path))
+    with open(meta_path, 'w') as handle:
+        json.dump(source, handle)
+    logger.info(f"💾 Cached {dataset_name}: {cache_path}")
+    return df
+
+
+def _partition_keys(df: pd.DataFrame, partition_cols: Sequence[str]) -> pd.DataFrame:
+    """
+    Partition key columns, deriving order_year/order_month_num from
+    order_date when the frame (e.g. raw orders) does not carry them
+    """
+    keys = {}
+    for col in partition_cols:
+        if col in df.columns:
+            keys[col] = df[col]
+        elif col in ('order_year', 'order_month_num') and 'order_date' in df.columns:
+            dates = pd.to_datetime(df['order_date'], errors='coerce')
+            keys[col] = (dates.dt.year if col == 'order_year' else dates.dt.month).astype('Int64')
+        else:
+            raise KeyError(f"Cannot partition on missing column: {col}")
+    return pd.DataFrame(keys, index=df.index)
+
+
+def _partition_dir(value) -> str:
+    if pd.isna(value):
+        return NULL_PARTITION
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        value = int(value)
+    return quote(str(value), safe='')
+
+
+def write_partitioned(df: pd.DataFrame, path: str, partition_cols: Sequence[str] = PARTITION_COLUMNS,
+                      file_format: str = 'parquet', overwrite: bool = False) -> int:
+    """
+    Write a DataFrame as a Hive-style partitioned directory
+
+    Layout: path/order_year=2025/order_month_num=3[/region=Gauteng]/part-0.parquet.
+    Rows keep every column (partition columns included), so a reload has
+    the same columns and dtypes. A dataset previously written here
+    (PARTITION_MARKER present) is replaced; any other non-empty directory
+    is only deleted with overwrite=True.
+
+    Args:
+        df: Frame to write (processed or raw orders)
+        path: Dataset directory
+        partition_cols: Partition keys, outermost first
+        file_format: 'parquet' or 'feather'
+        overwrite: Replace path even if it is not a partitioned dataset
+
+    Returns:
+        Number of partitions written
+    """
+    _check_format(file_format)
+    partition_cols = list(partition_cols)
+    keys = _partition_keys(df, partition_cols)
+    if os.path.exists(path):
+        if not os.path.isdir(path):
+            raise FileExistsError(f"Not a directory: {path}")
+        ours = os.path.exists(os.path.join(path, PARTITION_MARKER))
+        if os.listdir(path) and not ours and not overwrite:
+            raise FileExistsError(f"{path} is not empty and was not written by write_partitioned; "
+                                  f"pass overwrite=True to replace it")
+        shutil.rmtree(path)
+    os.makedirs(path)
+
+    groups = keys.groupby(partition_cols, sort=True, dropna=False).indices
+    for values, positions in groups.items():
+        values = values if isinstance(values, tuple) else (values,)
+        partition_dir = os.path.join(path, *(f"{col}={_partition_dir(value)}"
+                                             for col, value in zip(partition_cols, values)))
+        os.makedirs(partition_dir, exist_ok=True)
+        write_columnar(df.iloc[positions], os.path.join(partition_dir, f"part-0.{file_format}"), file_format)
+    with open(os.path.join(path, PARTITION_MARKER), 'w'):
+        pass
+    logger.info(f"💾 Wrote {len(df):,} rows in {len(groups):,} partitions: {path}")
+    return len(groups)
+
+
+def list_partitions(path: str, file_format: Optional[str] = None) -> List[Tuple[Dict[str, str], str]]:
+    """
+    Partition values (column -> raw string, None for nulls) and file path
+    for every data file under a partitioned directory, in path order
+
+    file_format None accepts files of any COLUMNAR_FORMATS.
+    """
+    suffix = tuple(f".{fmt}" for fmt in COLUMNAR_FORMATS) if file_format is None else f".{file_format}"
+    partitions = []
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        values = {}
+        for segment in os.path.relpath(root, path).split(os.sep):
+            if '=' in segment:
+                col, raw = segment.split('=', 1)
+                values[col] = None if raw == NULL_PARTITION else unquote(raw)
+        partitions.extend((values, os.path.join(root, name)) for name in sorted(files) if name.endswith(suffix))
+    return partitions
+
+
+def _month_number(timestamp: pd.Timestamp) -> int:
+    return timestamp.year * 12 + timestamp.month
+
+
+def _keep_partition(values: Dict[str, str], start: Optional[pd.Timestamp], end: Optional[pd.Timestamp],
+                    regions: Optional[set]) -> bool:
+    if regions is not None and 'region' in values and values['region'] not in regions:
+        return False
+    if (start is None and end is None) or 'order_year' not in values or 'order_month_num' not in values:
+        return True
+    if values['order_year'] is None or values['order_month_num'] is None:
+        return False
+    month = int(values['order_year']) * 12 + int(values['order_month_num'])
+    return (start is None or month >= _month_number(start)) and (end is None or month <= _month_number(end))
+
+
+def filter_orders(df: pd.DataFrame, start=None, end=None, regions: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Rows with order_date in [start, end] (inclusive, by day) and region in
+    regions; filters on columns the frame does not have are ignored
+    """
+    mask = np.ones(len(df), dtype=bool)
+    if (start is not None or end is not None) and 'order_date' in df.columns:
+        days = pd.to_datetime(df['order_date']).dt.normalize()
+        if start is not None:
+            mask &= (days >= pd.Timestamp(start).normalize()).to_numpy()
+        if end is not None:
+            mask &= (days <= pd.Timestamp(end).normalize()).to_numpy()
+    if regions is not None and 'region' in df.columns:
+        mask &= df['region'].isin(list(regions)).to_numpy()
+    return df if mask.all() else df[mask]
+
+
+def file_columns(file_path: str, file_format: str = 'parquet') -> List[str]:
+    """
+    Column names of a columnar file, read from its schema only
+    """
+    _check_format(file_format)
+    if file_format == 'parquet':
+        import pyarrow.parquet as pq
+        return pq.read_schema(file_path).names
+    import pyarrow.ipc as ipc
+    with ipc.open_file(file_path) as reader:
+        return reader.schema.names
+
+
+def _read_columns(columns: Optional[List[str]], start, end, regions, available: List[str]) -> Optional[List[str]]:
+    """
+    Requested columns plus those the row filters need (dropped after filtering)
+    """
+    if columns is None:
+        return None
+    extra = (['order_date'] if start is not None or end is not None else []) + \
+            (['region'] if regions is not None else [])
+    return list(columns) + [col for col in extra if col not in columns and col in available]
+
+
+def read_partitioned(path: str, start=None, end=None, regions: Optional[Sequence[str]] = None,
+                     columns: Optional[List[str]] = None, file_format: Optional[str] = None) -> pd.DataFrame:
+    """
+    Read a partitioned dataset, skipping partitions outside the filters
+
+    Whole partitions are pruned on their directory values (month and, if
+    partitioned by it, region); only the requested columns are read from
+    the remaining files. Rows are then filtered exactly, e.g. for a start
+    date in the middle of a month.
+
+    Args:
+        path: Directory written by write_partitioned
+        start, end: Inclusive order_date bounds
+        regions: Regions to keep
+        columns: Columns to return (default: all)
+        file_format: 'parquet' or 'feather' (default: from the file names)
+
+    Returns:
+        Matching rows with a fresh RangeIndex
+    """
+    partitions = list_partitions(path, file_format)
+    if file_format is None:
+        file_format = os.path.splitext(partitions[0][1])[1][1:] if partitions else 'parquet'
+    _check_format(file_format)
+    start = pd.Timestamp(start) if start is not None else None
+    end = pd.Timestamp(end) if end is not None else None
+    region_set = set(regions) if regions is not None else None
+
+    selected = [file for values, file in partitions if _keep_partition(values, start, end, region_set)]
+
+    available = file_columns(partitions[0][1], file_format) if partitions else []
+    read_columns = _read_columns(columns, start, end, regions, available)
+    if selected:
+        frames = [read_columnar(file, file_format, columns=read_columns) for file in selected]
+        df = filter_orders(pd.concat(frames, ignore_index=True), start, end, regions)
+    else:
+        df = read_columnar(partitions[0][1], file_format, columns=read_columns).iloc[:0] if partitions \
+            else pd.DataFrame(columns=columns)
+    logger.info(f"⚡ Read {len(selected):,} of {len(partitions):,} partitions from {path}")
+    if columns is not None:
+        df = df[list(columns)]
+    return df.reset_index(drop=True)
+
+
+def load_processed_data(output_dir: str, file_format: str = 'parquet',
+                        dataset_names: Optional[list] = None, start=None, end=None,
+                        regions: Optional[Sequence[str]] = None,
+                        columns: Optional[Dict[str, List[str]]] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Load datasets written by SOpDataProcessor.export_processed_data
+
+    Datasets exported with partition_by are read through read_partitioned,
+    so date and region filters skip whole partitions.
+
+    Args:
+        output_dir: Directory passed to export_processed_data
+        file_format: 'parquet' or 'feather'
+        dataset_names: Datasets to load (default: every *_processed file
+            or partitioned directory found)
+        start, end: Inclusive order_date bounds (datasets with order_date)
+        regions: Regions to keep (datasets with region)
+        columns: Dataset name -> columns to read
+
+    Returns:
+        Dictionary of DataFrames with their exported dtypes
+    """
+    _check_format(file_format)
+    suffix = f"_processed.{file_format}"
+    if dataset_names is None:
+        dataset_names = sorted(
+            {f[:-len(suffix)] for f in os.listdir(output_dir) if f.endswith(suffix)} |
+            {f[:-len('_processed')] for f in os.listdir(output_dir)
+             if f.endswith('_processed') and os.path.isdir(os.path.join(output_dir, f))})
+
+    columns = columns or {}
+    datasets = {}
+    for name in dataset_names:
+        partitioned_path = os.path.join(output_dir, f"{name}_processed")
+        if os.path.isdir(partitioned_path):
+            datasets[name] = read_partitioned(partitioned_path, start, end, regions, columns.get(name), file_format)
+        else:
+            file_path = os.path.join(output_dir, f"{name}{suffix}")
+            read_columns = _read_columns(columns.get(name), start, end, regions,
+                                         file_columns(file_path, file_format))
+            df = read_columnar(file_path, file_format, columns=read_columns)
+            df = filter_orders(df, start, end, regions)
+            datasets[name] = df[columns[name]] if name in columns else df
+    return datasets
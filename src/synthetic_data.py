@@ -0,0 +1,225 @@
+"""
+S&OP Synthetic Data Module
+==========================
+
+Synthetic Orders/Products/Inventory/Forecasts generator with the same
+schemas as the shipped Data/*.csv files, for scale testing.
+
+Functions:
+- Scaled dataset generation (vectorised, millions of orders)
+- CSV export matching the Data/ file layout
+"""
+
+import os
+import logging
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Size of the shipped sample in Data/ (scale=1)
+BASE_ORDERS = 4798
+BASE_PRODUCTS = 30
+
+CATEGORIES = ['Computers & Laptops', 'Mobile & Smartphones', 'Displays & Audio Visual',
+              'Accessories & Peripherals', 'Networking & Storage', 'Gaming & Entertainment',
+              'Software & Licensing', 'Wearables & Smart Devices']
+CATEGORY_WEIGHTS = [8, 6, 4, 4, 3, 2, 2, 1]
+# Median base price per category (R)
+CATEGORY_PRICES = [30000, 25000, 12000, 2500, 6000, 28000, 4500, 9000]
+
+REGIONS = ['Western Cape', 'Gauteng', 'KwaZulu-Natal', 'Eastern Cape', 'Free State']
+CUSTOMER_TYPES = ['Individual', 'Business', 'Premium']
+CUSTOMER_WEIGHTS = [0.76, 0.21, 0.03]
+SALE_EVENTS = ['Year End Sale', 'Bulk Purchase', 'Volume Discount', 'New Client Promotion', 'Business Sale']
+WAREHOUSES = ['JHB_Main', 'CPT_Main', 'DBN_Main', 'PE_Main', 'BFN_Main']
+TIERS = ['High', 'Medium', 'Low']
+FORECAST_TYPES = ['Manual', 'Statistical', 'ML_Model']
+DAY_NAMES = np.array(['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'])
+
+# Column order of each file in Data/
+ORDERS_COLUMNS = ['order_id', 'product_id', 'order_date', 'qty', 'region', 'customer_type', 'base_price',
+                  'unit_price', 'discount_pct', 'order_value', 'order_month', 'category', 'is_on_sale',
+                  'sale_event', 'day_of_week', 'calc_order_value']
+PRODUCTS_COLUMNS = ['product_id', 'product_name', 'category', 'base_price', 'promotional_tier',
+                    'demand_volatility', 'sales_events_count']
+INVENTORY_COLUMNS = ['product_id', 'available_qty', 'warehouse', 'stock_status', 'unit_cost',
+                     'inventory_value', 'total_demand', 'turnover_ratio']
+FORECASTS_COLUMNS = ['product_id', 'forecast_month', 'forecast_qty', 'actual_demand', 'variance_pct',
+                     'forecast_type', 'confidence_level']
+
+
+def _choice(rng: np.random.Generator, values, size: int, p=None) -> np.ndarray:
+    if p is not None:
+        p = np.asarray(p, dtype=float) / np.sum(p)
+    return np.asarray(values, dtype=object)[rng.choice(len(values), size=size, p=p)]
+
+
+def generate_products(n_products: int, rng: np.random.Generator) -> pd.DataFrame:
+    """
+    Product master with category-driven price points
+    """
+    width = max(4, len(str(n_products)))
+    product_ids = np.array([f"SKU{i:0{width}d}" for i in range(1, n_products + 1)], dtype=object)
+
+    category_idx = rng.choice(len(CATEGORIES), size=n_products, p=np.array(CATEGORY_WEIGHTS) / sum(CATEGORY_WEIGHTS))
+    medians = np.asarray(CATEGORY_PRICES, dtype=float)[category_idx]
+    # Retail price points ending in 999
+    base_price = np.maximum(np.ceil(medians * rng.lognormal(0, 0.35, n_products) / 1000) * 1000 - 1, 499)
+
+    categories = np.asarray(CATEGORIES, dtype=object)[category_idx]
+    return pd.DataFrame({
+        'product_id': product_ids,
+        'product_name': [f"{category} Item {i}" for i, category in enumerate(categories, start=1)],
+        'category': categories,
+        'base_price': base_price.astype(np.int64),
+        'promotional_tier': _choice(rng, TIERS, n_products, p=[0.5, 0.3, 0.2]),
+        'demand_volatility': _choice(rng, TIERS, n_products, p=[0.2, 0.3, 0.5]),
+        'sales_events_count': rng.integers(0, 4, n_products),
+    }, columns=PRODUCTS_COLUMNS)
+
+
+def generate_orders(products: pd.DataFrame, n_orders: int, rng: np.random.Generator,
+                    start_date: str = '2025-01-01', end_date: str = '2025-08-29') -> pd.DataFrame:
+    """
+    Order lines drawn from a Zipf-like product popularity curve
+    """
+    n_products = len(products)
+    popularity = 1.0 / np.arange(1, n_products + 1) ** 0.8
+    product_idx = rng.permutation(n_products)[rng.choice(n_products, size=n_orders, p=popularity / popularity.sum())]
+
+    start, end = np.datetime64(start_date, 'D'), np.datetime64(end_date, 'D')
+    offsets = np.sort(rng.integers(0, (end - start).astype(int) + 1, n_orders))
+    dates = start + offsets.astype('timedelta64[D]')
+
+    qty = np.minimum(rng.geometric(0.7, n_orders), 10)
+    base_price = products['base_price'].to_numpy()[product_idx]
+    is_on_sale = rng.random(n_orders) < 0.095
+    discount_pct = np.where(is_on_sale, rng.uniform(20, 40, n_orders), rng.uniform(0, 25, n_orders)).round(2)
+    unit_price = (base_price * (1 - discount_pct / 100)).round(2)
+    order_value = (qty * unit_price).round(2)
+
+    sale_event = _choice(rng, SALE_EVENTS, n_orders)
+    sale_event[~is_on_sale] = None
+    # numpy weekday: 1970-01-01 was a Thursday
+    weekday = (dates.astype(np.int64) + 3) % 7
+
+    return pd.DataFrame({
+        'order_id': np.arange(1, n_orders + 1),
+        'product_id': products['product_id'].to_numpy()[product_idx],
+        'order_date': dates.astype(str),
+        'qty': qty,
+        'region': _choice(rng, REGIONS, n_orders),
+        'customer_type': _choice(rng, CUSTOMER_TYPES, n_orders, p=CUSTOMER_WEIGHTS),
+        'base_price': base_price,
+        'unit_price': unit_price,
+        'discount_pct': discount_pct,
+        'order_value': order_value,
+        'order_month': dates.astype('datetime64[M]').astype(str),
+        'category': products['category'].to_numpy()[product_idx],
+        'is_on_sale': is_on_sale,
+        'sale_event': sale_event,
+        'day_of_week': DAY_NAMES[weekday],
+        'calc_order_value': order_value,
+    }, columns=ORDERS_COLUMNS)
+
+
+def generate_inventory(products: pd.DataFrame, orders: pd.DataFrame, rng: np.random.Generator,
+                       n_warehouses: int = 1) -> pd.DataFrame:
+    """
+    Stock position per SKU x warehouse, consistent with order demand
+    """
+    demand = orders.groupby('product_id')['qty'].sum().reindex(products['product_id'], fill_value=0).to_numpy()
+    n_products = len(products)
+    warehouses = (WAREHOUSES * (n_warehouses // len(WAREHOUSES) + 1))[:n_warehouses]
+
+    product_ids = np.tile(products['product_id'].to_numpy(), n_warehouses)
+    warehouse = np.repeat(np.asarray(warehouses, dtype=object), n_products)
+    total_demand = np.maximum(np.tile(demand, n_warehouses) // n_warehouses, 1)
+    available_qty = np.maximum((total_demand * rng.uniform(0.05, 0.4, len(total_demand))).astype(np.int64), 1)
+    unit_cost = (np.tile(products['base_price'].to_numpy(), n_warehouses) * rng.uniform(0.5, 0.75, len(total_demand))).round(2)
+    turnover_ratio = total_demand / available_qty
+
+    return pd.DataFrame({
+        'product_id': product_ids,
+        'available_qty': available_qty,
+        'warehouse': warehouse,
+        'stock_status': np.where(turnover_ratio > 8, 'Low', np.where(turnover_ratio < 3, 'Optimal', 'Adequate')),
+        'unit_cost': unit_cost,
+        'inventory_value': (available_qty * unit_cost).round(2),
+        'total_demand': total_demand,
+        'turnover_ratio': turnover_ratio,
+    }, columns=INVENTORY_COLUMNS)
+
+
+def generate_forecasts(orders: pd.DataFrame, rng: np.random.Generator) -> pd.DataFrame:
+    """
+    Monthly forecast vs actual per SKU with type-dependent error
+    """
+    actuals = orders.groupby(['product_id', 'order_month'])['qty'].sum().reset_index()
+    n = len(actuals)
+    forecast_type_idx = rng.choice(len(FORECAST_TYPES), size=n, p=[0.27, 0.39, 0.34])
+    error_scale = np.array([0.25, 0.15, 0.12])[forecast_type_idx]
+    actual = actuals['qty'].to_numpy()
+    forecast = np.maximum(np.round(actual * (1 + rng.normal(0, error_scale))), 1).astype(np.int64)
+
+    return pd.DataFrame({
+        'product_id': actuals['product_id'].to_numpy(),
+        'forecast_month': actuals['order_month'].to_numpy() + '-01',
+        'forecast_qty': forecast,
+        'actual_demand': actual,
+        'variance_pct': ((actual - forecast) / forecast * 100).round(2),
+        'forecast_type': np.asarray(FORECAST_TYPES, dtype=object)[forecast_type_idx],
+        'confidence_level': _choice(rng, ['Low', 'Medium', 'High'], n, p=[0.35, 0.42, 0.23]),
+    }, columns=FORECASTS_COLUMNS)
+
+
+def generate_sop_datasets(scale: float = 1.0, n_orders: Optional[int] = None, n_products: Optional[int] = None,
+                          n_warehouses: int = 1, seed: int = 42, start_date: str = '2025-01-01',
+                          end_date: str = '2025-08-29') -> Dict[str, pd.DataFrame]:
+    """
+    Generate a full synthetic S&OP dataset
+
+    Args:
+        scale: Multiple of the shipped sample (4,798 orders, 30 SKUs)
+        n_orders: Explicit order count (overrides scale)
+        n_products: Explicit SKU count (overrides scale)
+        n_warehouses: Warehouses per SKU in Inventory
+        seed: Random seed
+        start_date, end_date: Order date range
+
+    Returns:
+        Dictionary with 'orders', 'products', 'inventory' and 'forecasts'
+        in the same layout pd.read_csv gives for Data/*.csv
+    """
+    rng = np.random.default_rng(seed)
+    n_orders = n_orders or int(round(BASE_ORDERS * scale))
+    n_products = n_products or max(int(round(BASE_PRODUCTS * scale)), 1)
+
+    products = generate_products(n_products, rng)
+    orders = generate_orders(products, n_orders, rng, start_date, end_date)
+    datasets = {
+        'orders': orders,
+        'products': products,
+        'inventory': generate_inventory(products, orders, rng, n_warehouses),
+        'forecasts': generate_forecasts(orders, rng),
+    }
+    logger.info(f"🧪 Generated synthetic S&OP data: {n_orders:,} orders, {n_products:,} SKUs")
+    return datasets
+
+
+def write_sop_datasets(datasets: Dict[str, pd.DataFrame], output_dir: str) -> Dict[str, str]:
+    """
+    Write datasets as Orders.csv, Products.csv, ... and return their paths
+
+    The returned dictionary can be passed straight to process_sop_data.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    file_paths = {}
+    for name, df in datasets.items():
+        file_path = os.path.join(output_dir, f"{name.capitalize()}.csv")
+        df.to_csv(file_path, index=False)
+        file_paths[name] = file_path
+    return file_paths
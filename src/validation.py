@@ -0,0 +1,291 @@
+"""
+S&OP Validation Module
+======================
+
+Declarative data-quality rules per dataset, evaluated in one vectorised
+pass.
+
+Each dataset's rules are plain data (VALIDATION_RULES). evaluate_rules
+computes the shared intermediates once: the null mask, the numeric block
+and the declared key. Every rule reads from them, and the same
+intermediates feed the summary counts used by validate_data_quality. For
+very large inputs, rules can be evaluated on a row sample with the counts
+scaled up.
+
+Rule kinds:
+- not_null: columns that must be populated
+- ranges: column -> (min, max), inclusive, None for open
+- allowed: column -> permitted values
+- unique: key columns that identify a row
+- references: column -> dataset whose product_id (or same-named column)
+  must contain every value
+- matches: (column, [factors], atol): column equals the product of the
+  factor columns within atol
+
+Functions:
+- evaluate_rules: run one dataset's rules
+- check_references: referential integrity against loaded datasets
+- duplicate_count: whole-row duplicates (hashing only rows with a repeated key)
+- duplicate_key_count: rows repeating the dataset's declared key
+- memory_usage_mb: footprint without deep scans of non-object columns
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .data_processing import VALID_CONFIDENCE_LEVELS, VALID_FORECAST_TYPES, VALID_STOCK_STATUSES, VALID_TIERS
+
+logger = logging.getLogger(__name__)
+
+CUSTOMER_TYPES = ['Individual', 'Business', 'Premium']
+
+VALIDATION_RULES = {
+    'orders': {
+        'not_null': ['order_id', 'product_id', 'order_date', 'qty', 'region', 'customer_type', 'unit_price',
+                     'order_value'],
+        'ranges': {'qty': (1, None), 'base_price': (0, None), 'unit_price': (0, None),
+                   'discount_pct': (0, 100), 'order_value': (0, None)},
+        'allowed': {'customer_type': CUSTOMER_TYPES},
+        'unique': ['order_id'],
+        'references': {'product_id': 'products'},
+        # order_value = calc_order_value = qty * unit_price (to the cent, after rounding)
+        'matches': [('order_value', ['calc_order_value'], 0.01), ('calc_order_value', ['qty', 'unit_price'], 0.05)],
+    },
+    'inventory': {
+        'not_null': ['product_id', 'warehouse', 'available_qty'],
+        'ranges': {'available_qty': (0, None), 'unit_cost': (0, None), 'inventory_value': (0, None),
+                   'total_demand': (0, None)},
+        'allowed': {'stock_status': VALID_STOCK_STATUSES},
+        'unique': ['product_id', 'warehouse'],
+        'references': {'product_id': 'products'},
+        # unit_cost is rounded to the cent, so allow R1 over a line
+        'matches': [('inventory_value', ['available_qty', 'unit_cost'], 1.0)],
+    },
+    'forecasts': {
+        'not_null': ['product_id', 'forecast_month', 'forecast_qty', 'actual_demand'],
+        'ranges': {'forecast_qty': (0, None), 'actual_demand': (0, None)},
+        'allowed': {'forecast_type': VALID_FORECAST_TYPES, 'confidence_level': VALID_CONFIDENCE_LEVELS},
+        'unique': ['product_id', 'forecast_month', 'forecast_type'],
+        'references': {'product_id': 'products'},
+    },
+    'products': {
+        'not_null': ['product_id', 'category', 'base_price'],
+        'ranges': {'base_price': (0, None), 'sales_events_count': (0, None)},
+        'allowed': {'promotional_tier': VALID_TIERS, 'demand_volatility': VALID_TIERS},
+        'unique': ['product_id'],
+    },
+}
+
+
+def _violation(rule: str, column: str, count: float, checked: int, scale: float) -> Dict[str, Any]:
+    return {'rule': rule, 'column': column, 'violations': int(round(count * scale)),
+            'rate': count / checked if checked else 0.0}
+
+
+def memory_usage_mb(df: pd.DataFrame, sample: Optional[pd.DataFrame] = None) -> float:
+    """
+    Memory footprint in MB
+
+    Numeric columns are sized from their buffers; every other column
+    (object, str, string, ...) gets a deep (per-value) scan. With a row
+    sample their size is extrapolated from the sample instead, except for
+    categoricals, whose categories are shared by every row and are sized
+    in full.
+    """
+    shallow = df.memory_usage(deep=False)
+    other_columns = [col for col in df.columns if not pd.api.types.is_numeric_dtype(df[col].dtype)]
+    if not other_columns:
+        return shallow.sum() / (1024 * 1024)
+    categorical = [col for col in other_columns if isinstance(df[col].dtype, pd.CategoricalDtype)]
+    per_value = [col for col in other_columns if col not in categorical]
+    source = df if sample is None else sample
+    deep = source[per_value].memory_usage(deep=True, index=False) * (len(df) / max(len(source), 1))
+    deep_categorical = df[categorical].memory_usage(deep=True, index=False)
+    return (shallow.drop(other_columns).sum() + deep.sum() + deep_categorical.sum()) / (1024 * 1024)
+
+
+def _declared_key(df: pd.DataFrame, key: Optional[List[str]]) -> Optional[List[str]]:
+    return key if key and set(key) <= set(df.columns) else None
+
+
+def _duplicate_counts(df: pd.DataFrame, key: Optional[List[str]]):
+    """
+    (whole-row duplicates, key duplicates or None without a usable key)
+
+    A full duplicate always repeats the key as well, so only rows whose
+    key occurs more than once are hashed in full.
+    """
+    key = _declared_key(df, key)
+    if key is None:
+        return int(df.duplicated().sum()), None
+    key_duplicates = int(df.duplicated(subset=key).sum())
+    if key_duplicates == 0:
+        return 0, 0
+    candidates = df.duplicated(subset=key, keep=False).to_numpy()
+    return int(df[candidates].duplicated().sum()), key_duplicates
+
+
+def duplicate_count(df: pd.DataFrame, dataset_name: Optional[str] = None) -> int:
+    """
+    Rows repeating an earlier row in every column
+    """
+    return _duplicate_counts(df, VALIDATION_RULES.get(dataset_name, {}).get('unique'))[0]
+
+
+def duplicate_key_count(df: pd.DataFrame, dataset_name: str) -> Optional[int]:
+    """
+    Rows repeating an earlier row's declared key (None if the dataset has none)
+    """
+    key = _declared_key(df, VALIDATION_RULES.get(dataset_name, {}).get('unique'))
+    return int(df.duplicated(subset=key).sum()) if key is not None else None
+
+
+def evaluate_rules(df: pd.DataFrame, dataset_name: str, rules: Optional[Dict[str, Any]] = None,
+                   references: Optional[Dict[str, pd.DataFrame]] = None,
+                   sample: Optional[Union[int, float]] = None, seed: int = 0) -> Dict[str, Any]:
+    """
+    Evaluate a dataset's rules and the shared quality counts in one pass
+
+    Args:
+        df: Dataset to check
+        dataset_name: Key into VALIDATION_RULES
+        rules: Rules to use instead of VALIDATION_RULES[dataset_name]
+        references: Loaded datasets for 'references' rules (skipped if absent)
+        sample: Evaluate on this many rows (int) or this fraction (float)
+            and scale the counts; duplicates then only count within the sample
+        seed: Sampling seed
+
+    Returns:
+        Dictionary with memory_usage_mb, missing_values, missing_by_column,
+        negative_values, duplicate_records (whole rows), duplicate_keys
+        (rows repeating the declared key, None without one), rule_violations
+        (one dict per rule and column, with violations and rate) and
+        sampled_rows
+    """
+    rules = VALIDATION_RULES.get(dataset_name, {}) if rules is None else rules
+    total = len(df)
+    frame = df
+    if sample is not None:
+        n_sample = int(sample * total) if isinstance(sample, float) else int(sample)
+        if n_sample < total:
+            rows = np.sort(np.random.default_rng(seed).choice(total, size=n_sample, replace=False))
+            frame = df.take(rows)
+    checked = len(frame)
+    scale = total / checked if checked else 1.0
+
+    # Shared intermediates
+    null_counts = frame.isna().sum()
+    numeric = frame.select_dtypes(include=[np.number])
+    numeric_values = {col: numeric[col].to_numpy(dtype=np.float64, na_value=np.nan) for col in numeric.columns}
+
+    def values(col: str) -> np.ndarray:
+        if col not in numeric_values:
+            numeric_values[col] = pd.to_numeric(frame[col], errors='coerce').to_numpy(dtype=np.float64,
+                                                                                       na_value=np.nan)
+        return numeric_values[col]
+
+    with np.errstate(invalid='ignore'):
+        negative = {col: int((numeric_values[col] < 0).sum()) for col in numeric.columns}
+
+    violations = []
+    for col in rules.get('not_null', []):
+        count = null_counts[col] if col in null_counts else checked
+        violations.append(_violation('not_null', col, count, checked, scale))
+
+    for col, (low, high) in rules.get('ranges', {}).items():
+        if col not in frame.columns:
+            continue
+        column = values(col)
+        with np.errstate(invalid='ignore'):
+            outside = np.zeros(checked, dtype=bool)
+            if low is not None:
+                outside |= column < low
+            if high is not None:
+                outside |= column > high
+        violations.append(_violation('range', col, outside.sum(), checked, scale))
+
+    for col, allowed in rules.get('allowed', {}).items():
+        if col not in frame.columns:
+            continue
+        present = frame[col].notna().to_numpy()
+        count = (present & ~frame[col].isin(allowed).to_numpy()).sum()
+        violations.append(_violation('allowed', col, count, checked, scale))
+
+    duplicates, key_duplicates = _duplicate_counts(frame, rules.get('unique'))
+    if key_duplicates is not None:
+        violations.append(_violation('unique', '+'.join(rules['unique']), key_duplicates, checked, scale))
+
+    for col, factors, atol in rules.get('matches', []):
+        if col not in frame.columns or not set(factors) <= set(frame.columns):
+            continue
+        expected = np.prod([values(factor) for factor in factors], axis=0)
+        with np.errstate(invalid='ignore'):
+            mismatched = np.abs(values(col) - expected) > atol
+        violations.append(_violation('matches', f"{col}={'*'.join(factors)}", mismatched.sum(), checked, scale))
+
+    if references:
+        violations.extend(_reference_violations(frame, rules, references, scale))
+
+    missing_by_column = (null_counts[null_counts > 0] * scale).round().astype(int).to_dict()
+    return {
+        'memory_usage_mb': memory_usage_mb(df, frame if frame is not df else None),
+        'missing_values': int(round(null_counts.sum() * scale)),
+        'missing_by_column': missing_by_column,
+        'negative_values': {col: int(round(count * scale)) for col, count in negative.items() if count > 0},
+        'duplicate_records': int(round(duplicates * scale)),
+        'duplicate_keys': int(round(key_duplicates * scale)) if key_duplicates is not None else None,
+        'rule_violations': violations,
+        'sampled_rows': checked if checked < total else None,
+    }
+
+
+def _reference_violations(frame: pd.DataFrame, rules: Dict[str, Any], references: Dict[str, pd.DataFrame],
+                          scale: float = 1.0) -> List[Dict[str, Any]]:
+    violations = []
+    for col, target in rules.get('references', {}).items():
+        if col not in frame.columns or target not in references:
+            continue
+        target_df = references[target]
+        target_col = col if col in target_df.columns else 'product_id'
+        present = frame[col].notna().to_numpy()
+        count = (present & ~frame[col].isin(target_df[target_col]).to_numpy()).sum()
+        violations.append(_violation('references', f"{col}->{target}.{target_col}", count, len(frame), scale))
+    return violations
+
+
+def check_references(datasets: Dict[str, pd.DataFrame],
+                     validation_results: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Referential integrity of every dataset against the others
+
+    Used after datasets are loaded independently (e.g. in parallel). If
+    validation_results is given, the violations are appended to each
+    dataset's rule_violations.
+
+    Returns:
+        Dataset name -> reference rule results
+    """
+    results = {}
+    for name, df in datasets.items():
+        rules = VALIDATION_RULES.get(name, {})
+        if not rules.get('references'):
+            continue
+        results[name] = _reference_violations(df, rules, datasets)
+        if validation_results is not None and name in validation_results:
+            validation_results[name].setdefault('rule_violations', []).extend(results[name])
+        for violation in results[name]:
+            if violation['violations']:
+                logger.warning(f"⚠️ {name}: {violation['violations']:,} rows break {violation['column']}")
+    return results
+
+
+def violations_frame(validation_results: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
+    """
+    All rule results of a validation_results mapping as one table
+    """
+    rows = [dict(violation, dataset=name)
+            for name, result in validation_results.items() for violation in result.get('rule_violations', [])]
+    return pd.DataFrame(rows, columns=['dataset', 'rule', 'column', 'violations', 'rate'])
@@ -9,20 +9,63 @@ Functions:
 - Forecast accuracy visualization
 - Regional performance analysis
 - Inventory optimization charts
+- Headless batch rendering of per-slice dashboards (region, category, ...)
+- Interactive Plotly dashboard and WebGL point views over pre-aggregated data
 """
 
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import logging
+import os
+import re
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
 import pandas as pd
 import numpy as np
-from typing import Dict, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from .kpi import KPI_REGISTRY, KPICache, KPIStore
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+    from plotly.graph_objects import Figure as PlotlyFigure
+
+# matplotlib/seaborn are imported on the first render so that importing the
+# package (e.g. for data-only batch jobs) stays fast
+_STYLE_APPLIED = False
+
+logger = logging.getLogger(__name__)
+
+# Filter columns describing a product; they also restrict product-level
+# datasets (inventory, forecasts) that do not carry the column themselves
+PRODUCT_ATTRIBUTES = ('product_id', 'category', 'promotional_tier', 'demand_volatility')
+
+DASHBOARD_TITLE = '🔥 S&OP Executive Dashboard - AD Solutions'
+
+
+def _apply_style() -> None:
+    """
+    Apply the dashboard style once per process
+    """
+    global _STYLE_APPLIED
+    if not _STYLE_APPLIED:
+        import matplotlib.style
+        import seaborn as sns
+
+        # Set visualization style
+        matplotlib.style.use('seaborn-v0_8')
+        sns.set_palette("husl")
+        _STYLE_APPLIED = True
+
+
+def _pyplot():
+    """
+    Import pyplot with the dashboard style applied
+    """
+    import matplotlib.pyplot as plt
+
+    _apply_style()
+    return plt
 
-# Set visualization style
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
 
 # AD Solutions color scheme
 AD_COLORS = {
@@ -33,63 +76,91 @@ AD_COLORS = {
     'neutral': '#8B4513'
 }
 
-def create_sop_dashboard(datasets: Dict[str, pd.DataFrame], figsize: Tuple[int,int]=(20,15)) -> plt.Figure:
-    orders_df = datasets['orders']
-    inventory_df = datasets['inventory']
-    forecasts_df = datasets['forecasts']
+def create_sop_dashboard(datasets: Dict[str, pd.DataFrame], figsize: Tuple[int,int]=(20,15),
+                         kpis: Optional[KPIStore] = None) -> 'Figure':
+    """
+    Render the 3x3 executive dashboard
+
+    All aggregates come from a KPIStore, so the input frames are never
+    modified. Pass the same store again to re-render without recomputing.
+
+    Args:
+        datasets: Dictionary with 'orders', 'inventory' and 'forecasts'
+        figsize: Figure size
+        kpis: Existing KPIStore over datasets (built if omitted)
+    """
+    plt = _pyplot()
+    kpis = kpis if kpis is not None else KPIStore(datasets)
+
+    fig = plt.figure(figsize=figsize)
+    _draw_dashboard(fig, kpis)
+    return fig
+
+
+def _draw_dashboard(fig: 'Figure', kpis: Any, title: str = DASHBOARD_TITLE) -> None:
+    """
+    Draw the dashboard panels on an empty figure
 
-    fig, axes = plt.subplots(3, 3, figsize=figsize)
-    fig.suptitle('🔥 S&OP Executive Dashboard - AD Solutions', fontsize=20, fontweight='bold', y=0.95)
+    Args:
+        fig: Figure to draw on
+        kpis: KPIStore, or the dict returned by KPIStore.all()
+        title: Figure title
+    """
+    axes = fig.subplots(3, 3)
+    fig.suptitle(title, fontsize=20, fontweight='bold', y=0.95)
 
-    segment_revenue = orders_df.groupby('customer_type')['order_value'].sum()
+    segments = kpis.get('segment_summary')
+    segment_revenue = segments['revenue']
     axes[0, 0].pie(segment_revenue.values, labels=segment_revenue.index, autopct='%1.1f%%', colors=[AD_COLORS['primary'], AD_COLORS['secondary'], AD_COLORS['accent']])
     axes[0, 0].set_title('Customer Segment Revenue Distribution', fontweight='bold')
 
-    regional_revenue = orders_df.groupby('region')['order_value'].sum().sort_values(ascending=True)
+    regional_revenue = kpis.get('regional_revenue')
     axes[0, 1].barh(regional_revenue.index, regional_revenue.values, color=AD_COLORS['highlight'])
     axes[0, 1].set_title('Revenue by Region', fontweight='bold')
     axes[0, 1].set_xlabel('Revenue (R)')
 
-    orders_df['order_date'] = pd.to_datetime(orders_df['order_date'])
-    monthly_revenue = orders_df.groupby(orders_df['order_date'].dt.to_period('M'))['order_value'].sum()
+    monthly_revenue = kpis.get('monthly_revenue')
     axes[0, 2].plot(monthly_revenue.index.astype(str), monthly_revenue.values, marker='o', color=AD_COLORS['primary'], linewidth=3)
     axes[0, 2].set_title('Monthly Revenue Trend', fontweight='bold')
     axes[0, 2].tick_params(axis='x', rotation=45)
 
-    forecasts_df['absolute_error'] = abs(forecasts_df['variance_pct'])
-    accuracy_by_type = 100 - forecasts_df.groupby('forecast_type')['absolute_error'].mean()
+    accuracy = kpis.get('forecast_accuracy')
+    accuracy_by_type = accuracy['by_type']
     axes[1, 0].bar(accuracy_by_type.index, accuracy_by_type.values, color=[AD_COLORS['secondary'], AD_COLORS['accent'], AD_COLORS['highlight']])
     axes[1, 0].set_title('Forecast Accuracy by Type', fontweight='bold')
     axes[1, 0].set_ylabel('Accuracy (%)')
     axes[1, 0].tick_params(axis='x', rotation=45)
 
-    stock_status = inventory_df['stock_status'].value_counts()
+    stock_status = kpis.get('stock_status_counts')
     axes[1, 1].bar(stock_status.index, stock_status.values, color=[AD_COLORS['primary'], AD_COLORS['secondary'], AD_COLORS['accent']])
     axes[1, 1].set_title('Inventory Stock Status', fontweight='bold')
     axes[1, 1].set_ylabel('Number of Products')
 
-    aov_by_segment = orders_df.groupby('customer_type')['order_value'].mean()
+    aov_by_segment = segments['aov']
     axes[1, 2].bar(aov_by_segment.index, aov_by_segment.values, color=AD_COLORS['highlight'])
     axes[1, 2].set_title('Average Order Value by Segment', fontweight='bold')
     axes[1, 2].set_ylabel('AOV (R)')
     axes[1, 2].tick_params(axis='x', rotation=45)
 
-    product_revenue = orders_df.groupby('product_id')['order_value'].sum().nlargest(10)
+    product_revenue = kpis.get('top_products')
     axes[2, 0].barh(range(len(product_revenue)), product_revenue.values, color=AD_COLORS['secondary'])
     axes[2, 0].set_yticks(range(len(product_revenue)))
     axes[2, 0].set_yticklabels(product_revenue.index)
     axes[2, 0].set_title('Top 10 Products by Revenue', fontweight='bold')
     axes[2, 0].set_xlabel('Revenue (R)')
 
-    axes[2, 1].hist(inventory_df['inventory_value'], bins=20, color=AD_COLORS['accent'], alpha=0.7, edgecolor='black')
+    histogram = kpis.get('inventory_value_histogram')
+    axes[2, 1].hist(histogram['edges'][:-1], bins=histogram['edges'], weights=histogram['counts'],
+                    color=AD_COLORS['accent'], alpha=0.7, edgecolor='black')
     axes[2, 1].set_title('Inventory Value Distribution', fontweight='bold')
     axes[2, 1].set_xlabel('Inventory Value (R)')
     axes[2, 1].set_ylabel('Frequency')
 
-    total_revenue = orders_df['order_value'].sum()
-    total_orders = len(orders_df)
-    forecast_accuracy = 100 - forecasts_df['absolute_error'].mean()
-    inventory_value = inventory_df['inventory_value'].sum()
+    totals = kpis.get('order_totals')
+    total_revenue = totals['total_revenue']
+    total_orders = totals['total_orders']
+    forecast_accuracy = accuracy['overall']
+    inventory_value = histogram['total']
 
     metrics_text = f"""
     📊 S&OP KEY METRICS
@@ -107,7 +178,303 @@ def create_sop_dashboard(datasets: Dict[str, pd.DataFrame], figsize: Tuple[int,i
     axes[2, 2].set_ylim(0, 1)
     axes[2, 2].axis('off')
 
-    plt.tight_layout()
-    plt.subplots_adjust(top=0.92)
+    fig.tight_layout()
+    fig.subplots_adjust(top=0.92)
+
+
+def slice_datasets(datasets: Dict[str, pd.DataFrame], filters: Dict[str, Any]) -> Dict[str, pd.DataFrame]:
+    """
+    Restrict datasets to one dashboard slice
+
+    Each dataset is filtered on the filter columns it has. Product attributes
+    (PRODUCT_ATTRIBUTES, e.g. category) also restrict datasets without that
+    column through product_id, so a category slice covers its inventory and
+    forecasts too. Non-product filters such as region leave datasets without
+    the column unfiltered.
+
+    Args:
+        datasets: Dictionary of DataFrames
+        filters: Column -> value or list of values, e.g. {'region': 'Gauteng'}
+    """
+    filters = {column: list(value) if isinstance(value, (list, tuple, set)) else [value]
+               for column, value in filters.items()}
+
+    product_ids = None
+    for column, values in filters.items():
+        if column not in PRODUCT_ATTRIBUTES:
+            continue
+        source = next((datasets[name] for name in ('products', 'orders')
+                       if name in datasets and column in datasets[name].columns), None)
+        if source is None:
+            continue
+        ids = source.loc[source[column].isin(values), 'product_id']
+        product_ids = ids if product_ids is None else product_ids[product_ids.isin(ids)]
+
+    sliced = {}
+    for name, df in datasets.items():
+        mask = np.ones(len(df), dtype=bool)
+        for column, values in filters.items():
+            if column in df.columns:
+                mask &= df[column].isin(values).to_numpy()
+        if product_ids is not None and 'product_id' in df.columns:
+            mask &= df['product_id'].isin(product_ids).to_numpy()
+        sliced[name] = df if mask.all() else df[mask]
+    return sliced
+
+
+def _slice_labels(filters: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    File-name stem and title label for a slice filter
+    """
+    parts, labels = [], []
+    for column, value in filters.items():
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        label = ' + '.join(str(v) for v in values)
+        parts.append(f"{column}-{label}")
+        labels.append(label)
+    name = re.sub(r'[^0-9A-Za-z+-]+', '_', '__'.join(parts)).strip('_').lower()
+    return name, ', '.join(labels)
+
+
+def _init_render_worker() -> None:
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _render_slice(name: str, kpis: Dict[str, Any], title: str, output_dir: str, formats: Sequence[str],
+                  figsize: Tuple[int, int], dpi: int) -> List[str]:
+    """
+    Render one pre-aggregated dashboard straight to disk
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    _apply_style()
+    # A bare Figure is never registered with pyplot, so nothing accumulates
+    # between renders and the figure is freed as soon as it is cleared
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    paths = []
+    try:
+        _draw_dashboard(fig, kpis, title=title)
+        for fmt in formats:
+            path = os.path.join(output_dir, f"{name}.{fmt}")
+            fig.savefig(path, format=fmt, dpi=dpi)
+            paths.append(path)
+    finally:
+        fig.clear()
+    return paths
 
+
+def render_dashboards(datasets: Dict[str, pd.DataFrame], slices: Sequence[Dict[str, Any]], output_dir: str,
+                      formats: Sequence[str] = ('png',), figsize: Tuple[int, int] = (20, 15), dpi: int = 100,
+                      executor: Optional[Union[str, Executor]] = 'process',
+                      max_workers: Optional[int] = None) -> Dict[str, List[str]]:
+    """
+    Render one dashboard per slice (e.g. per region or category) to files
+
+    KPIs for every slice are aggregated once in the calling process; workers
+    only receive those small summaries and draw them on the Agg backend.
+    Figures bypass pyplot and are cleared after saving, so memory stays flat
+    over hundreds of renders. Slices without orders are skipped.
+
+    Args:
+        datasets: Dictionary with 'orders', 'inventory' and 'forecasts'
+            (plus optional 'products' for product-attribute filters)
+        slices: Filters as accepted by slice_datasets, e.g.
+            [{'region': 'Gauteng'}, {'category': 'Computers & Laptops'}]
+        output_dir: Directory for the files, named after the slice
+            (region-gauteng.png, ...)
+        formats: Any matplotlib savefig format, e.g. ('png', 'pdf')
+        figsize: Figure size
+        dpi: Raster resolution
+        executor: None (serial), 'thread', 'process' or a
+            concurrent.futures.Executor
+        max_workers: Pool size when executor is 'thread' or 'process'
+
+    Returns:
+        Slice name -> written file paths
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    # Slices often share a dataset version (e.g. inventory across regions)
+    cache = KPICache(maxsize=len(KPI_REGISTRY) * (len(slices) + 1))
+
+    names, summaries, titles = [], [], []
+    for filters in slices:
+        name, label = _slice_labels(filters)
+        sliced = slice_datasets(datasets, filters)
+        if sliced.get('orders') is not None and sliced['orders'].empty:
+            logger.warning(f"⚠️ Skipping dashboard {name}: no orders in slice")
+            continue
+        names.append(name)
+        summaries.append(KPIStore(sliced, cache=cache).all())
+        titles.append(f"{DASHBOARD_TITLE} | {label}")
+
+    render = partial(_render_slice, output_dir=output_dir, formats=tuple(formats), figsize=figsize, dpi=dpi)
+    if executor is None:
+        results = list(map(render, names, summaries, titles))
+    elif isinstance(executor, Executor):
+        results = list(executor.map(render, names, summaries, titles))
+    elif executor in ('thread', 'process'):
+        if executor == 'thread':
+            pool = ThreadPoolExecutor(max_workers=max_workers)
+        else:
+            pool = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_render_worker)
+        with pool:
+            results = list(pool.map(render, names, summaries, titles))
+    else:
+        raise ValueError("executor must be None, 'thread', 'process' or a concurrent.futures.Executor")
+
+    logger.info(f"🖼️ Rendered {len(names)} dashboards to {output_dir} ({executor or 'serial'})")
+    return dict(zip(names, results))
+
+
+def _plotly():
+    """
+    Import plotly on first use (graph_objects, make_subplots)
+    """
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    return go, make_subplots
+
+
+def create_interactive_dashboard(datasets: Dict[str, pd.DataFrame], kpis: Optional[KPIStore] = None,
+                                 title: str = DASHBOARD_TITLE, height: int = 1100) -> 'PlotlyFigure':
+    """
+    Interactive Plotly version of the 3x3 executive dashboard
+
+    Every trace is built from KPIStore aggregates (segment and regional
+    totals, monthly rollup, top-N products, NumPy histogram bins), never
+    from order rows, so the figure size does not grow with the number of
+    orders. Save with write_interactive_dashboard.
+
+    Args:
+        datasets: Dictionary with 'orders', 'inventory' and 'forecasts'
+        kpis: Existing KPIStore over datasets (built if omitted)
+        title: Figure title
+        height: Figure height in pixels
+    """
+    go, make_subplots = _plotly()
+    kpis = kpis if kpis is not None else KPIStore(datasets)
+
+    fig = make_subplots(
+        rows=3, cols=3,
+        specs=[[{'type': 'domain'}, {}, {}], [{}, {}, {}], [{}, {}, {'type': 'table'}]],
+        subplot_titles=['Customer Segment Revenue Distribution', 'Revenue by Region', 'Monthly Revenue Trend',
+                        'Forecast Accuracy by Type', 'Inventory Stock Status', 'Average Order Value by Segment',
+                        'Top 10 Products by Revenue', 'Inventory Value Distribution', 'S&OP Key Metrics'],
+        vertical_spacing=0.09, horizontal_spacing=0.08)
+
+    segments = kpis.get('segment_summary')
+    fig.add_trace(go.Pie(labels=segments.index.astype(str), values=segments['revenue'].to_numpy(),
+                         marker=dict(colors=[AD_COLORS['primary'], AD_COLORS['secondary'], AD_COLORS['accent']]),
+                         name='Segment revenue'), row=1, col=1)
+
+    regional_revenue = kpis.get('regional_revenue')
+    fig.add_trace(go.Bar(x=regional_revenue.to_numpy(), y=regional_revenue.index.astype(str), orientation='h',
+                         marker_color=AD_COLORS['highlight'], name='Regional revenue'), row=1, col=2)
+    fig.update_xaxes(title_text='Revenue (R)', row=1, col=2)
+
+    monthly_revenue = kpis.get('monthly_revenue')
+    fig.add_trace(go.Scatter(x=monthly_revenue.index.astype(str), y=monthly_revenue.to_numpy(), mode='lines+markers',
+                             line=dict(color=AD_COLORS['primary'], width=3), name='Monthly revenue'), row=1, col=3)
+
+    accuracy = kpis.get('forecast_accuracy')
+    accuracy_by_type = accuracy['by_type']
+    fig.add_trace(go.Bar(x=accuracy_by_type.index.astype(str), y=accuracy_by_type.to_numpy(),
+                         marker_color=[AD_COLORS['secondary'], AD_COLORS['accent'], AD_COLORS['highlight']],
+                         name='Forecast accuracy'), row=2, col=1)
+    fig.update_yaxes(title_text='Accuracy (%)', row=2, col=1)
+
+    stock_status = kpis.get('stock_status_counts')
+    fig.add_trace(go.Bar(x=stock_status.index.astype(str), y=stock_status.to_numpy(),
+                         marker_color=[AD_COLORS['primary'], AD_COLORS['secondary'], AD_COLORS['accent']],
+                         name='Stock status'), row=2, col=2)
+    fig.update_yaxes(title_text='Number of Products', row=2, col=2)
+
+    fig.add_trace(go.Bar(x=segments.index.astype(str), y=segments['aov'].to_numpy(),
+                         marker_color=AD_COLORS['highlight'], name='AOV'), row=2, col=3)
+    fig.update_yaxes(title_text='AOV (R)', row=2, col=3)
+
+    product_revenue = kpis.get('top_products')
+    fig.add_trace(go.Bar(x=product_revenue.to_numpy()[::-1], y=product_revenue.index.astype(str)[::-1],
+                         orientation='h', marker_color=AD_COLORS['secondary'], name='Top products'), row=3, col=1)
+    fig.update_xaxes(title_text='Revenue (R)', row=3, col=1)
+
+    # Histogram bins come pre-computed; bars span each bin
+    histogram = kpis.get('inventory_value_histogram')
+    edges = histogram['edges']
+    fig.add_trace(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=histogram['counts'], width=np.diff(edges),
+                         marker=dict(color=AD_COLORS['accent'], line=dict(color='black', width=1)), opacity=0.7,
+                         name='Inventory value'), row=3, col=2)
+    fig.update_xaxes(title_text='Inventory Value (R)', row=3, col=2)
+    fig.update_yaxes(title_text='Frequency', row=3, col=2)
+
+    totals = kpis.get('order_totals')
+    metrics = [('💰 Total Revenue', f"R{totals['total_revenue']:,.0f}"),
+               ('📦 Total Orders', f"{totals['total_orders']:,}"),
+               ('🎯 Forecast Accuracy', f"{accuracy['overall']:.1f}%"),
+               ('📋 Inventory Value', f"R{histogram['total']:,.0f}"),
+               ('📈 AOV', f"R{totals['total_revenue'] / totals['total_orders']:,.0f}")]
+    fig.add_trace(go.Table(header=dict(values=['Metric', 'Value'], fill_color=AD_COLORS['primary'],
+                                       font=dict(color='white')),
+                           cells=dict(values=[[m for m, _ in metrics], [v for _, v in metrics]],
+                                      fill_color='rgba(255, 165, 0, 0.3)')), row=3, col=3)
+
+    fig.update_layout(title=dict(text=title, x=0.5, font=dict(size=22)), height=height, showlegend=False,
+                      template='plotly_white')
+    return fig
+
+
+def create_order_scatter(orders: pd.DataFrame, x: str = 'discount_pct', y: str = 'order_value',
+                         max_points: int = 20_000, bins: int = 100, seed: int = 0) -> 'PlotlyFigure':
+    """
+    Point-level order view that stays small for any number of orders
+
+    Up to max_points orders are drawn as a WebGL (Scattergl) trace. Beyond
+    that the full distribution is shown as a density heatmap binned with
+    np.histogram2d, overlaid with a uniform WebGL sample of max_points
+    orders for hover detail.
+
+    Args:
+        orders: Orders frame with the x and y columns
+        x, y: Numeric columns to plot
+        max_points: Most points shipped to the browser
+        bins: Heatmap bins per axis
+        seed: Sampling seed
+    """
+    go, _ = _plotly()
+    xs = orders[x].to_numpy(dtype=np.float64, na_value=np.nan)
+    ys = orders[y].to_numpy(dtype=np.float64, na_value=np.nan)
+    valid = np.flatnonzero(~(np.isnan(xs) | np.isnan(ys)))
+
+    fig = go.Figure()
+    if len(valid) > max_points:
+        counts, x_edges, y_edges = np.histogram2d(xs[valid], ys[valid], bins=bins)
+        # Empty bins stay transparent
+        density = np.where(counts > 0, counts, np.nan).T
+        fig.add_trace(go.Heatmap(x=(x_edges[:-1] + x_edges[1:]) / 2, y=(y_edges[:-1] + y_edges[1:]) / 2, z=density,
+                                 colorscale='Oranges', colorbar=dict(title='Orders'), name='Density'))
+        shown = np.sort(np.random.default_rng(seed).choice(valid, size=max_points, replace=False))
+        label = f"sample of {max_points:,} / {len(valid):,} orders"
+    else:
+        shown = valid
+        label = f"{len(valid):,} orders"
+
+    fig.add_trace(go.Scattergl(x=xs[shown], y=ys[shown], mode='markers', name=label,
+                               marker=dict(color=AD_COLORS['primary'], size=4, opacity=0.5)))
+    fig.update_layout(title=f"{y} vs {x} ({label})", xaxis_title=x, yaxis_title=y, template='plotly_white')
     return fig
+
+
+def write_interactive_dashboard(fig: 'PlotlyFigure', path: str, include_plotlyjs: Union[bool, str] = 'cdn') -> str:
+    """
+    Save a Plotly figure as standalone HTML
+
+    By default plotly.js is loaded from the CDN instead of being embedded
+    (about 3.5 MB), so the file holds little more than the aggregates.
+    """
+    fig.write_html(path, include_plotlyjs=include_plotlyjs, full_html=True)
+    logger.info(f"🌐 Wrote interactive dashboard: {path} ({os.path.getsize(path) / 1024:,.0f} KB)")
+    return path